@@ -0,0 +1,96 @@
+"""API endpoints for the local community index mirror."""
+
+from dataclasses import asdict
+
+import httpx
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.database import get_db
+from app.repositories.community_repository import CommunityRepository
+from app.repositories.module_repository import ModuleRepository
+from app.schemas.community import (
+    CommunityModuleInfo,
+    CommunityModulePage,
+    CommunitySyncResultInfo,
+    CommunitySyncStatus,
+)
+from app.services.community_sync import CommunitySync, community_sync
+
+router = APIRouter(prefix="/community")
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+def get_community_sync() -> CommunitySync:
+    """FastAPI dependency returning the process-wide sync engine."""
+    return community_sync
+
+
+@router.get("/modules", response_model=CommunityModulePage)
+async def list_community_modules(
+    after: str = Query("", description="Last sha256 already seen"),
+    limit: int | None = Query(None, ge=1, description="Maximum modules per page"),
+    vendor: str | None = Query(None, description="Only modules from this vendor"),
+    db: AsyncSession = Depends(get_db),
+) -> CommunityModulePage:
+    """
+    Page through the locally mirrored community index, in sha256 order.
+
+    Follow `next_after` while `has_more` is true. Each entry says whether the
+    local library already holds that image.
+    """
+    page_size = min(limit or settings.community_page_size, settings.community_page_size)
+    rows = await CommunityRepository(db).list_page(after, page_size + 1, vendor)
+    page = rows[:page_size]
+    in_library = await ModuleRepository(db).get_existing_sha256s({row.sha256 for row in page})
+
+    modules = []
+    for row in page:
+        info = CommunityModuleInfo.model_validate(row)
+        info.in_library = row.sha256 in in_library
+        modules.append(info)
+    return CommunityModulePage(
+        modules=modules,
+        next_after=page[-1].sha256 if page else after,
+        has_more=len(rows) > page_size,
+    )
+
+
+@router.get("/status", response_model=CommunitySyncStatus)
+async def get_community_status(
+    sync: CommunitySync = Depends(get_community_sync), db: AsyncSession = Depends(get_db)
+) -> CommunitySyncStatus:
+    """Report when the mirror was last checked and changed."""
+    status = CommunitySyncStatus(enabled=sync.configured, index_url=sync.index_url)
+    state = await CommunityRepository(db).get_state(sync.index_url) if sync.index_url else None
+    if state:
+        status.module_count = state.module_count
+        status.checked_at = state.checked_at
+        status.changed_at = state.changed_at
+        status.last_error = state.last_error
+    return status
+
+
+@router.post("/sync", response_model=CommunitySyncResultInfo)
+async def sync_community_index(
+    sync: CommunitySync = Depends(get_community_sync),
+) -> CommunitySyncResultInfo:
+    """Sync the mirror now instead of waiting for the next periodic check."""
+    if not sync.configured:
+        raise HTTPException(
+            status_code=409,
+            detail="Community import is disabled or COMMUNITY_INDEX_URL is not set",
+        )
+
+    try:
+        async with sync.client() as client:
+            result = await sync.sync(client)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Community index error: {e}") from e
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e)) from e
+
+    return CommunitySyncResultInfo(**asdict(result))
@@ -3,6 +3,8 @@
 from fastapi import APIRouter
 
 from app.config import get_settings
+from app.core.database import get_pool_stats
+from app.core.rate_limit import admission_control
 
 router = APIRouter()
 settings = get_settings()
@@ -14,6 +16,18 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy", "version": settings.version}
 
 
+@router.get("/health/database")
+async def database_health() -> dict[str, object]:
+    """Connection pool statistics for the configured database."""
+    return get_pool_stats()
+
+
+@router.get("/health/rate-limits")
+async def rate_limit_stats() -> dict[str, object]:
+    """How often write requests were admitted or rejected (429) since startup."""
+    return admission_control.stats()
+
+
 @router.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint with API information."""
@@ -0,0 +1,31 @@
+"""API endpoints for the background integrity scrubber."""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.repositories.integrity_repository import IntegrityRepository
+from app.schemas.integrity import IntegrityFindingInfo, IntegrityReport, ScrubStatus
+from app.services.integrity_scrubber import integrity_scrubber
+
+router = APIRouter(prefix="/integrity")
+
+
+@router.get("", response_model=IntegrityReport)
+async def get_integrity_report(
+    limit: int = Query(50, ge=1, le=500, description="Maximum findings to return"),
+    db: AsyncSession = Depends(get_db),
+) -> IntegrityReport:
+    """
+    Get integrity scrubber progress and the most recently seen findings.
+
+    Findings are re-hash mismatches of stored images and revisions, images that
+    could not be rebuilt, and SQLite `quick_check` errors.
+    """
+    repository = IntegrityRepository(db)
+    findings = await repository.list_recent(limit)
+    return IntegrityReport(
+        status=ScrubStatus(**integrity_scrubber.status()),
+        total_findings=await repository.count(),
+        findings=[IntegrityFindingInfo.model_validate(finding) for finding in findings],
+    )
@@ -0,0 +1,96 @@
+"""API endpoints for background jobs."""
+
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.schemas.job import JobCreate, JobInfo
+from app.services.job_manager import JobManager
+
+router = APIRouter(prefix="/jobs")
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Global job manager (initialized in main.py lifespan)
+_job_manager: JobManager | None = None
+
+
+def set_job_manager(manager: JobManager | None) -> None:
+    """Set the global job manager instance."""
+    global _job_manager
+    _job_manager = manager
+
+
+def get_job_manager() -> JobManager:
+    """Dependency to get the job manager."""
+    if _job_manager is None:
+        raise HTTPException(status_code=503, detail="Job manager not initialized")
+    return _job_manager
+
+
+@router.get("", response_model=list[JobInfo])
+async def list_jobs(
+    status: str | None = Query(None, description="Only jobs with this status"),
+    limit: int = Query(50, ge=1, le=500),
+    manager: JobManager = Depends(get_job_manager),
+) -> list[JobInfo]:
+    """List the newest jobs."""
+    return [JobInfo.model_validate(job) for job in await manager.list_jobs(limit, status)]
+
+
+@router.post("", response_model=JobInfo, status_code=202)
+async def submit_job(
+    request: JobCreate, manager: JobManager = Depends(get_job_manager)
+) -> JobInfo:
+    """Queue a background job of a registered type."""
+    try:
+        job = await manager.submit(request.type, request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return JobInfo.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=JobInfo)
+async def get_job(job_id: int, manager: JobManager = Depends(get_job_manager)) -> JobInfo:
+    """Get a job's status, progress and result."""
+    job = await manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobInfo.model_validate(job)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int, manager: JobManager = Depends(get_job_manager)
+) -> StreamingResponse:
+    """
+    Stream job progress as Server-Sent Events.
+
+    Sends a `progress` event whenever the job changes and a final `done` event
+    with the finished job, then closes the stream.
+    """
+    if await manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return StreamingResponse(
+        manager.stream(
+            job_id,
+            poll_interval=settings.jobs_poll_interval,
+            heartbeat_interval=settings.change_feed_heartbeat_interval,
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        },
+    )
+
+
+@router.post("/{job_id}/cancel", response_model=JobInfo)
+async def cancel_job(job_id: int, manager: JobManager = Depends(get_job_manager)) -> JobInfo:
+    """Cancel a queued or running job (finished jobs are returned unchanged)."""
+    job = await manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobInfo.model_validate(job)
@@ -1,32 +1,237 @@
 """API endpoints for SFP modules."""
 
 import base64
+from collections.abc import AsyncIterator, Callable
+from dataclasses import asdict
 
+import httpx
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import Receive, Scope, Send
 
-from app.core.database import get_db
-from app.schemas.module import ModuleCreate, ModuleInfo, StatusMessage
+from app.config import get_settings
+from app.core.database import get_db, get_session_factory
+from app.core.known_hashes import known_hashes
+from app.core.suggest_index import SUGGEST_FIELDS, suggest_index
+from app.repositories.module_repository import ModuleRepository
+from app.schemas.module import (
+    EEPROMBatchRequest,
+    ModuleChangePage,
+    ModuleCreate,
+    ModuleImportRequest,
+    ModuleImportResult,
+    ModuleInfo,
+    ModuleRevisionInfo,
+    ModuleSuggestion,
+    StatusMessage,
+    StorageReport,
+)
+from app.services.blob_import import BlobImportEntry, BlobImporter
+from app.services.bulk_ingest import ingest_ndjson
+from app.services.change_feed import ChangeFeedService
+from app.services.eeprom_bundle import iter_bundle
+from app.services.module_query import QueryError
 from app.services.module_service import ModuleService
+from app.services.storage_report import build_storage_report
 
 router = APIRouter()
 logger = structlog.get_logger()
+settings = get_settings()
+
+
+class _RequestStreamingResponse(StreamingResponse):
+    """
+    Streaming response for endpoints that are still reading the request body.
+
+    `StreamingResponse` listens for client disconnects by calling `receive()`,
+    which would swallow request body chunks the generator hasn't read yet.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Send the response without a concurrent disconnect listener."""
+        await self.stream_response(send)
 
 
 @router.get("/modules", response_model=list[ModuleInfo])
-async def get_all_modules(db: AsyncSession = Depends(get_db)) -> list[ModuleInfo]:
+async def get_all_modules(
+    q: str | None = Query(
+        None,
+        description="Filter by decoded fields, e.g. `wavelength:1310 reach_km>10 vendor:FS*`",
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> list[ModuleInfo]:
     """
     Get all saved SFP modules (without BLOB data).
 
-    Returns a list of all modules with their metadata.
+    Returns a list of all modules with their metadata. With `q`, only modules
+    whose decoded EEPROM fields match every filter are returned; the syntax is
+    documented in `app.services.module_query`.
     """
     service = ModuleService(db)
+    if q:
+        try:
+            modules = await service.search_modules(q)
+        except QueryError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        logger.info("modules_searched", query=q, count=len(modules))
+        return modules
+
     modules = await service.get_all_modules()
     logger.info("modules_retrieved", count=len(modules))
     return modules
 
 
+@router.get("/modules/changes", response_model=ModuleChangePage)
+async def get_module_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Last sequence number already applied"),
+    limit: int | None = Query(None, ge=1, description="Maximum changes per page"),
+    last_event_id: int | None = Header(None),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+) -> ModuleChangePage | StreamingResponse:
+    """
+    Get library changes (inserts, updates, deletes) after a sequence number.
+
+    Returns a JSON page by default. Clients sending `Accept: text/event-stream`
+    get a Server-Sent Events stream instead, which replays missed changes and then
+    pushes new ones; `Last-Event-ID` takes precedence over `since` on reconnect.
+    """
+    page_size = min(limit or settings.change_feed_page_size, settings.change_feed_page_size)
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        start = last_event_id if last_event_id is not None else since
+        logger.info("change_feed_stream_opened", since=start)
+        return StreamingResponse(
+            ChangeFeedService.stream(
+                session_factory,
+                start,
+                page_size=page_size,
+                poll_interval=settings.change_feed_poll_interval,
+                heartbeat_interval=settings.change_feed_heartbeat_interval,
+            ),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",  # Disable nginx buffering
+            },
+        )
+
+    async with session_factory() as session:
+        return await ChangeFeedService(session).get_page(since, page_size)
+
+
+@router.get("/modules/bloom")
+async def get_known_hashes_filter(
+    if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Download a Bloom filter of every sha256 in the library.
+
+    Clients test a capture's checksum locally before uploading: a negative answer
+    means the image is definitely new. The binary layout is documented in
+    `app.core.known_hashes`. Send the previous `ETag` as `If-None-Match` to get a
+    `304` while the library is unchanged.
+    """
+    if not known_hashes.ready:
+        await ModuleRepository(db).load_known_hashes(
+            settings.bloom_filter_capacity, settings.bloom_filter_error_rate
+        )
+
+    headers = {"ETag": known_hashes.etag, "Cache-Control": "no-cache"}
+    if if_none_match == known_hashes.etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=known_hashes.to_bytes(), media_type="application/octet-stream", headers=headers
+    )
+
+
+@router.get("/modules/suggest", response_model=list[ModuleSuggestion])
+async def suggest_module_values(
+    prefix: str = Query(..., min_length=1, max_length=64),
+    field: str | None = Query(None, pattern=f"^({'|'.join(SUGGEST_FIELDS)})$"),
+    limit: int = Query(10, ge=1, le=settings.suggest_max_results),
+    db: AsyncSession = Depends(get_db),
+) -> list[ModuleSuggestion]:
+    """
+    Autocomplete vendors, models and names starting with `prefix` (case-insensitive).
+
+    Values come from the library and the community mirror and are served from
+    an in-memory prefix index, so lookups never touch the database.
+    """
+    if not suggest_index.ready:
+        await ModuleRepository(db).load_suggest_index()
+
+    suggestions = suggest_index.suggest(prefix, limit, [field] if field else SUGGEST_FIELDS)
+    return [ModuleSuggestion.model_validate(suggestion) for suggestion in suggestions]
+
+
+@router.get("/modules/storage", response_model=StorageReport)
+async def get_storage_report(db: AsyncSession = Depends(get_db)) -> StorageReport:
+    """
+    Report how much space page-level dedup saves over whole-image dedup.
+
+    Images are split into 256-byte pages (A0h, A2h); a page shared by several
+    captures only needs to be stored once, at the cost of one page reference
+    per page of every image.
+    """
+    report = await build_storage_report(db)
+    logger.info("storage_report", saved_bytes=report.saved_bytes, images=report.images)
+    return report
+
+
+async def _eeprom_bundle_response(module_ids: list[int], db: AsyncSession) -> StreamingResponse:
+    if len(module_ids) > settings.eeprom_batch_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.eeprom_batch_max_ids} IDs per request",
+        )
+
+    service = ModuleService(db)
+    images = await service.get_eeprom_batch(module_ids)
+    missing = sorted(set(module_ids) - {module_id for module_id, _, _ in images})
+
+    logger.info("eeprom_batch_retrieved", requested=len(module_ids), found=len(images))
+    headers = {"X-Missing-Ids": ",".join(map(str, missing))} if missing else None
+    return StreamingResponse(
+        iter_bundle(images), media_type="application/octet-stream", headers=headers
+    )
+
+
+@router.get("/modules/eeprom")
+async def get_modules_eeprom(
+    ids: str = Query(..., description="Comma-separated module IDs"),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Get the raw EEPROM data of several modules in one binary response.
+
+    The response starts with an index of (id, sha256, offset, length) entries;
+    the layout is documented in `app.services.eeprom_bundle`. Unknown IDs are
+    left out and listed in the `X-Missing-Ids` header. Use the POST variant for
+    long ID lists.
+    """
+    try:
+        module_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers") from e
+
+    if not module_ids:
+        raise HTTPException(status_code=400, detail="No module IDs given")
+
+    return await _eeprom_bundle_response(module_ids, db)
+
+
+@router.post("/modules/eeprom")
+async def post_modules_eeprom(
+    request: EEPROMBatchRequest, db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """Get the raw EEPROM data of several modules (same response as the GET variant)."""
+    return await _eeprom_bundle_response(request.ids, db)
+
+
 @router.post("/modules", response_model=StatusMessage)
 async def create_module(
     module: ModuleCreate, db: AsyncSession = Depends(get_db)
@@ -35,7 +240,12 @@ async def create_module(
     Save a new SFP module.
 
     The EEPROM data is parsed to extract vendor, model, and serial information.
-    Duplicate detection is performed using SHA-256 checksum.
+    Duplicate detection is performed using SHA-256 checksum. A new image of a
+    module already in the library (same vendor and serial) is stored as a
+    revision of that module: the response then has `status="revision"`, the
+    module's `id` and the `revision` number. `GET /modules/{id}/eeprom` keeps
+    serving revision 1; the uploaded image is at
+    `GET /modules/{id}/revisions/{revision}/eeprom`.
     """
     try:
         eeprom_data = base64.b64decode(module.eeprom_data_base64)
@@ -44,25 +254,98 @@ async def create_module(
         raise HTTPException(status_code=400, detail="Invalid Base64 data") from e
 
     service = ModuleService(db)
-    created_module, is_duplicate = await service.add_module(
-        name=module.name, eeprom_data=eeprom_data
-    )
+    result = await service.save_module(name=module.name, eeprom_data=eeprom_data)
+    saved = result.module
 
     logger.info(
         "module_saved",
-        module_id=created_module.id,
-        is_duplicate=is_duplicate,
-        sha256=created_module.sha256[:16] + "...",
+        module_id=saved.id,
+        status=result.status,
+        revision=result.revision,
+        sha256=saved.sha256[:16] + "...",
     )
 
+    if result.status == "duplicate":
+        message = f"Module already exists (SHA256 match). Using existing ID {saved.id}."
+    elif result.status == "revision":
+        message = f"Module '{module.name}' saved as revision {result.revision} of ID {saved.id}."
+    else:
+        message = f"Module '{module.name}' saved successfully."
+
     return StatusMessage(
-        status="duplicate" if is_duplicate else "success",
-        message=(
-            f"Module already exists (SHA256 match). Using existing ID {created_module.id}."
-            if is_duplicate
-            else f"Module '{module.name}' saved successfully."
+        status=result.status, message=message, id=saved.id, revision=result.revision
+    )
+
+
+async def get_blob_client() -> AsyncIterator[httpx.AsyncClient]:
+    """FastAPI dependency yielding a pooled HTTP client for blob downloads."""
+    limits = httpx.Limits(max_connections=settings.blob_import_concurrency)
+    async with httpx.AsyncClient(
+        # Redirects are followed by the importer, which checks every target
+        timeout=settings.blob_import_timeout, limits=limits, follow_redirects=False
+    ) as client:
+        yield client
+
+
+@router.post("/modules/import", response_model=list[ModuleImportResult])
+async def import_modules(
+    request: ModuleImportRequest,
+    client: httpx.AsyncClient = Depends(get_blob_client),
+    db: AsyncSession = Depends(get_db),
+) -> list[ModuleImportResult]:
+    """
+    Import modules from blob URLs, e.g. entries of the community index.
+
+    Entries whose `expected_sha256` is already in the library are reported as
+    duplicates without downloading. Other blobs are downloaded concurrently,
+    hash-verified while streaming and capped at `blob_import_max_bytes`; all
+    successful downloads are stored in one transaction. Only public http(s)
+    hosts are fetched (see `app.services.blob_import` for the trust model), and
+    entries without `expected_sha256` come back with `verified: false`.
+    """
+    if len(request.entries) > settings.blob_import_max_entries:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.blob_import_max_entries} entries per request",
+        )
+
+    results = await BlobImporter(db).import_entries(
+        [
+            BlobImportEntry(entry.name, entry.blob_url, entry.expected_sha256)
+            for entry in request.entries
+        ],
+        client,
+        concurrency=settings.blob_import_concurrency,
+        max_bytes=settings.blob_import_max_bytes,
+        allow_private_networks=settings.blob_import_allow_private_networks,
+    )
+    return [ModuleImportResult(**asdict(result)) for result in results]
+
+
+@router.post("/modules/bulk")
+async def bulk_create_modules(
+    request: Request,
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+) -> _RequestStreamingResponse:
+    """
+    Bulk-import modules from an NDJSON stream.
+
+    Each request line is a `{"name": ..., "eeprom": <base64>}` object. The body is
+    processed incrementally in batches of `bulk_ingest_batch_size`: hashing runs in
+    a worker thread, duplicates are checked with one query per batch and each batch
+    is committed on its own. One NDJSON result line is streamed back per input line,
+    followed by a summary line. Re-coded images of a known module are stored as its
+    revisions (`status="revision"` with the `revision` number), as in `POST /modules`.
+    """
+    logger.info("bulk_ingest_started", batch_size=settings.bulk_ingest_batch_size)
+    return _RequestStreamingResponse(
+        ingest_ndjson(
+            session_factory,
+            request.stream(),
+            batch_size=settings.bulk_ingest_batch_size,
+            max_line_bytes=settings.bulk_ingest_max_line_bytes,
         ),
-        id=created_module.id,
+        media_type="application/x-ndjson",
     )
 
 
@@ -73,7 +356,9 @@ async def get_module_eeprom(
     """
     Get raw EEPROM binary data for a specific module.
 
-    This is used when writing a module to hardware.
+    This is used when writing a module to hardware. It is the module's first
+    image (revision 1); later revisions are served by
+    `GET /modules/{id}/revisions/{revision}/eeprom`.
     """
     service = ModuleService(db)
     eeprom = await service.get_module_eeprom(module_id)
@@ -86,6 +371,52 @@ async def get_module_eeprom(
     return Response(content=eeprom, media_type="application/octet-stream")
 
 
+@router.get("/modules/{module_id}/revisions", response_model=list[ModuleRevisionInfo])
+async def get_module_revisions(
+    module_id: int, db: AsyncSession = Depends(get_db)
+) -> list[ModuleRevisionInfo]:
+    """
+    List the later revisions of a module.
+
+    Revision 1 is the module's own image and is not listed. Later revisions are
+    stored as byte-level deltas against it.
+    """
+    service = ModuleService(db)
+    revisions = await service.get_module_revisions(module_id)
+
+    if revisions is None:
+        logger.warning("module_not_found", module_id=module_id)
+        raise HTTPException(status_code=404, detail="Module not found")
+
+    return [
+        ModuleRevisionInfo(
+            revision=revision.revision,
+            name=revision.name,
+            sha256=revision.sha256,
+            size=revision.size,
+            delta_size=len(revision.delta),
+            created_at=revision.created_at,
+        )
+        for revision in revisions
+    ]
+
+
+@router.get("/modules/{module_id}/revisions/{revision}/eeprom")
+async def get_module_revision_eeprom(
+    module_id: int, revision: int, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Get the raw EEPROM image of one revision of a module."""
+    service = ModuleService(db)
+    eeprom = await service.get_revision_eeprom(module_id, revision)
+
+    if eeprom is None:
+        logger.warning("revision_not_found", module_id=module_id, revision=revision)
+        raise HTTPException(status_code=404, detail="Revision not found")
+
+    logger.info("eeprom_retrieved", module_id=module_id, revision=revision, size=len(eeprom))
+    return Response(content=eeprom, media_type="application/octet-stream")
+
+
 @router.delete("/modules/{module_id}", response_model=StatusMessage)
 async def delete_module(
     module_id: int, db: AsyncSession = Depends(get_db)
@@ -2,7 +2,16 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import esphome_status, health, modules, submissions
+from app.api.v1 import (
+    community,
+    esphome_status,
+    health,
+    integrity,
+    jobs,
+    modules,
+    submissions,
+    sync,
+)
 from app.config import get_settings
 
 api_router = APIRouter()
@@ -14,6 +23,18 @@ api_router.include_router(modules.router, tags=["modules"])
 # Include submission routes
 api_router.include_router(submissions.router, tags=["submissions"])
 
+# Include library replication routes
+api_router.include_router(sync.router, tags=["sync"])
+
+# Include community index mirror routes
+api_router.include_router(community.router, tags=["community"])
+
+# Include background job routes
+api_router.include_router(jobs.router, tags=["jobs"])
+
+# Include integrity scrubber routes
+api_router.include_router(integrity.router, tags=["integrity"])
+
 # Include health routes
 api_router.include_router(health.router, tags=["health"])
 
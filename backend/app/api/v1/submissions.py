@@ -1,17 +1,23 @@
 """API endpoints for community submissions."""
 
 import base64
-import hashlib
-import json
-import os
-import uuid
-from datetime import datetime
 
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.schemas.submission import SubmissionCreate, SubmissionResponse
+from app.core.database import get_db
+from app.schemas.submission import (
+    SubmissionCreate,
+    SubmissionPage,
+    SubmissionPromoteRequest,
+    SubmissionPromoteResult,
+    SubmissionResponse,
+)
+from app.services.submission_inbox import SubmissionInbox, get_submission_inbox
+from app.services.submission_review import SubmissionReviewService
+from app.services.submission_validator import submission_validator
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -19,11 +25,19 @@ settings = get_settings()
 
 
 @router.post("/submissions", response_model=SubmissionResponse)
-async def submit_to_community(payload: SubmissionCreate) -> SubmissionResponse:
+async def submit_to_community(
+    payload: SubmissionCreate,
+    inbox: SubmissionInbox = Depends(get_submission_inbox),
+    db: AsyncSession = Depends(get_db),
+) -> SubmissionResponse:
     """
     Accept a community submission without GitHub sign-in.
 
     Submissions are stored in an inbox for maintainers to review and publish.
+    Each image is stored once; resubmitting the same image with the same
+    details returns the existing inbox id with status "duplicate". New
+    submissions are validated in the background; results appear on
+    `GET /submissions`.
     """
     try:
         eeprom = base64.b64decode(payload.eeprom_data_base64)
@@ -31,36 +45,73 @@ async def submit_to_community(payload: SubmissionCreate) -> SubmissionResponse:
         logger.warning("invalid_submission_base64", error=str(e))
         raise HTTPException(status_code=400, detail="Invalid Base64 data") from e
 
-    sha = hashlib.sha256(eeprom).hexdigest()
-    inbox_root = settings.submissions_dir
-    os.makedirs(inbox_root, exist_ok=True)
-
-    inbox_id = str(uuid.uuid4())
-    target_dir = os.path.join(inbox_root, inbox_id)
-    os.makedirs(target_dir, exist_ok=True)
-
-    # Write EEPROM binary
-    with open(os.path.join(target_dir, "eeprom.bin"), "wb") as f:
-        f.write(eeprom)
-
-    # Write metadata JSON
-    metadata = {
-        "name": payload.name,
-        "vendor": payload.vendor,
-        "model": payload.model,
-        "serial": payload.serial,
-        "sha256": sha,
-        "notes": payload.notes,
-        "created_at": datetime.utcnow().isoformat() + "Z",
-    }
-    with open(os.path.join(target_dir, "metadata.json"), "w") as f:
-        json.dump(metadata, f, indent=2)
-
-    logger.info("submission_queued", inbox_id=inbox_id, sha256=sha[:16] + "...")
+    result = await inbox.submit(
+        eeprom,
+        {
+            "name": payload.name,
+            "vendor": payload.vendor,
+            "model": payload.model,
+            "serial": payload.serial,
+            "notes": payload.notes,
+        },
+    )
+    if result.record is not None:
+        submission_ids = await SubmissionReviewService(db, inbox).index([result.record])
+        submission_validator.enqueue(submission_ids)
 
     return SubmissionResponse(
-        status="queued",
-        message="Submission stored for review.",
-        inbox_id=inbox_id,
-        sha256=sha,
+        status="duplicate" if result.duplicate else "queued",
+        message=(
+            "Submission already received." if result.duplicate else "Submission stored for review."
+        ),
+        inbox_id=result.record_id,
+        sha256=result.sha256,
+    )
+
+
+@router.get("/submissions", response_model=SubmissionPage)
+async def list_submissions(
+    after_id: int = Query(0, ge=0, description="Last submission ID already seen"),
+    limit: int | None = Query(None, ge=1, description="Maximum submissions per page"),
+    status: str | None = Query(None, description='Only "pending" or "promoted" submissions'),
+    vendor: str | None = Query(None, description="Only submissions with this vendor"),
+    sha256: str | None = Query(None, description="Only submissions of this image"),
+    inbox: SubmissionInbox = Depends(get_submission_inbox),
+    db: AsyncSession = Depends(get_db),
+) -> SubmissionPage:
+    """
+    Page through indexed submissions for review, oldest first.
+
+    Follow `next_after_id` while `has_more` is true.
+    """
+    page_size = min(limit or settings.submissions_page_size, settings.submissions_page_size)
+    return await SubmissionReviewService(db, inbox).list_page(
+        after_id, page_size, status, vendor, sha256
     )
+
+
+@router.post("/submissions/promote", response_model=list[SubmissionPromoteResult])
+async def promote_submissions(
+    request: SubmissionPromoteRequest,
+    inbox: SubmissionInbox = Depends(get_submission_inbox),
+    db: AsyncSession = Depends(get_db),
+) -> list[SubmissionPromoteResult]:
+    """
+    Add pending submissions to the module library in one transaction.
+
+    Images already in the library (by sha256) are linked rather than stored
+    again. Returns one result per requested ID.
+    """
+    if len(request.ids) > settings.submissions_promote_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.submissions_promote_max_ids} IDs per request",
+        )
+
+    results = await SubmissionReviewService(db, inbox).promote(request.ids)
+    return [
+        SubmissionPromoteResult(
+            submission_id=r.submission_id, status=r.status, module_id=r.module_id
+        )
+        for r in results
+    ]
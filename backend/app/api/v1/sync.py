@@ -0,0 +1,76 @@
+"""API endpoints for library replication between instances."""
+
+import httpx
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.database import get_db
+from app.schemas.sync import BlobRequest, BucketContents, BucketSummary, PullRequest, PullResult
+from app.services.replication import ReplicationService, is_valid_prefix
+
+router = APIRouter(prefix="/sync")
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+@router.get("/buckets", response_model=BucketSummary)
+async def get_buckets(
+    prefix_length: int | None = Query(None, ge=1, le=8),
+    db: AsyncSession = Depends(get_db),
+) -> BucketSummary:
+    """
+    Summarize the library as sha256-prefix buckets.
+
+    Two instances with equal `root` digests hold the same modules. Otherwise only
+    buckets whose digests differ need to be listed and compared.
+    """
+    service = ReplicationService(db)
+    return await service.get_summary(prefix_length or settings.sync_prefix_length)
+
+
+@router.get("/buckets/{prefix}", response_model=BucketContents)
+async def get_bucket(prefix: str, db: AsyncSession = Depends(get_db)) -> BucketContents:
+    """List every sha256 in one bucket."""
+    if not is_valid_prefix(prefix):
+        raise HTTPException(status_code=400, detail="Prefix must be 1-8 lowercase hex digits")
+    return await ReplicationService(db).get_bucket(prefix)
+
+
+@router.post("/blobs")
+async def get_blobs(request: BlobRequest, db: AsyncSession = Depends(get_db)) -> StreamingResponse:
+    """
+    Stream the requested modules as NDJSON.
+
+    Each line is `{"name", "eeprom" (base64), "sha256"}`. Unknown checksums are
+    skipped.
+    """
+    service = ReplicationService(db)
+    return StreamingResponse(
+        service.export_blobs(request.sha256s), media_type="application/x-ndjson"
+    )
+
+
+@router.post("/pull", response_model=PullResult)
+async def pull_from_remote(
+    request: PullRequest, db: AsyncSession = Depends(get_db)
+) -> PullResult:
+    """Pull every module the remote instance has and this one lacks."""
+    service = ReplicationService(db)
+    try:
+        async with httpx.AsyncClient(
+            base_url=request.remote_url, timeout=settings.sync_timeout
+        ) as remote:
+            return await service.pull(
+                remote,
+                prefix_length=settings.sync_prefix_length,
+                batch_size=settings.sync_blob_batch_size,
+            )
+    except httpx.HTTPError as e:
+        logger.warning("library_pull_failed", remote_url=request.remote_url, error=str(e))
+        raise HTTPException(status_code=502, detail=f"Remote instance error: {e}") from e
+    except ValueError as e:
+        logger.warning("library_pull_rejected", remote_url=request.remote_url, error=str(e))
+        raise HTTPException(status_code=502, detail=str(e)) from e
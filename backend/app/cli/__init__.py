@@ -0,0 +1 @@
+"""Command-line tools that operate on the module library directly."""
@@ -0,0 +1,157 @@
+"""
+Build a sharded static community index (see `app.services.community_index`).
+
+Usage:
+    python -m app.cli.build_index out/ [--source library|inbox] [--blobs]
+
+Run it again on the same output directory to update it: only shards whose
+contents changed are rewritten.
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.repositories.module_repository import ModuleRepository
+from app.services.community_index import IndexBuildStats, write_index
+from app.services.submission_inbox import SubmissionInbox
+
+Collected = tuple[list[dict[str, Any]], dict[str, bytes]]
+
+
+async def collect_library(database_url: str, batch_size: int, with_images: bool) -> Collected:
+    """Index entries for every module in the library, and their images if `with_images`."""
+    engine = create_async_engine(database_url)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    entries: list[dict[str, Any]] = []
+    blobs: dict[str, bytes] = {}
+    try:
+        after_id = 0
+        while True:
+            async with session_maker() as session:
+                repository = ModuleRepository(session)
+                rows = await repository.get_summaries_after(after_id, batch_size)
+                if not rows:
+                    break
+                if with_images:
+                    images = await repository.get_images_by_ids([row.id for row in rows])
+                    blobs.update((sha256, image) for _, sha256, image in images)
+
+            entries.extend(
+                {
+                    "sha256": row.sha256,
+                    "name": row.name,
+                    "vendor": row.vendor,
+                    "model": row.model,
+                    "serial": row.serial,
+                    "size": row.size,
+                }
+                for row in rows
+            )
+            after_id = rows[-1].id
+    finally:
+        await engine.dispose()
+
+    return entries, blobs
+
+
+async def collect_inbox(inbox_dir: Path) -> Collected:
+    """Index entries and images for the submissions inbox (one entry per image)."""
+    inbox = SubmissionInbox(inbox_dir)
+    records = await inbox.read_records(sorted(await inbox.record_ids()))
+    records.sort(key=lambda record: record.get("created_at") or "")
+
+    # The first submission of an image names it; blobs failing their sha256 are left out
+    first: dict[str, dict[str, Any]] = {}
+    for record in records:
+        first.setdefault(record["sha256"], record)
+    blobs = await inbox.read_blobs(list(first))
+
+    entries = [
+        {
+            "sha256": sha256,
+            "name": record.get("name") or sha256[:16],
+            "vendor": record.get("vendor"),
+            "model": record.get("model"),
+            "serial": record.get("serial"),
+            "size": len(blobs[sha256]),
+        }
+        for sha256, record in first.items()
+        if sha256 in blobs
+    ]
+    return entries, blobs
+
+
+async def build_index(
+    out_dir: Path,
+    source: str,
+    prefix_length: int,
+    with_blobs: bool,
+    database_url: str,
+    inbox_dir: Path,
+    batch_size: int,
+) -> IndexBuildStats:
+    """Collect entries from `source` ("library" or "inbox") and write the index."""
+    if source == "library":
+        entries, blobs = await collect_library(database_url, batch_size, with_blobs)
+    else:
+        entries, blobs = await collect_inbox(inbox_dir)
+
+    return await asyncio.to_thread(
+        write_index, out_dir, entries, prefix_length, blobs if with_blobs else None
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Build a sharded static community index")
+    parser.add_argument("out_dir", type=Path, help="Output directory (updated in place)")
+    parser.add_argument(
+        "--source", choices=["library", "inbox"], default="library", help="Where modules come from"
+    )
+    parser.add_argument(
+        "--prefix-length", type=int, default=2, help="Hex digits of sha256 per shard (default 2)"
+    )
+    parser.add_argument("--blobs", action="store_true", help="Also publish images under blobs/")
+    parser.add_argument(
+        "--database-url",
+        default=settings.database_url,
+        help="Database URL (default: DATABASE_URL setting)",
+    )
+    parser.add_argument(
+        "--inbox-dir",
+        type=Path,
+        default=Path(settings.submissions_dir),
+        help="Submissions inbox (default: SUBMISSIONS_DIR setting)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Modules read per query")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.prefix_length <= 8:
+        parser.error("--prefix-length must be between 1 and 8")
+
+    stats = asyncio.run(
+        build_index(
+            args.out_dir,
+            args.source,
+            args.prefix_length,
+            args.blobs,
+            args.database_url,
+            args.inbox_dir,
+            args.batch_size,
+        )
+    )
+    print(stats.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Offline importer for directories of EEPROM dumps.
+
+Walks a directory tree for raw `.bin` dumps and nRF Connect log exports,
+hashes and decodes them in a process pool, deduplicates against the
+`sha256` index in bulk and inserts new modules in large batches (re-coded
+dumps of a module already imported become its revisions).
+
+Usage:
+    python -m app.cli.import_dumps /path/to/dumps [--workers 4] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.models import Base
+from app.services.module_service import ModuleService, prepare_eeprom
+
+BIN_SUFFIXES = {".bin"}
+NRF_EXPORT_SUFFIXES = {".txt", ".log", ".csv"}
+
+# nRF Connect logs print characteristic values as "(0x) 03-04-07-10-00-..."
+_NRF_VALUE_PATTERN = re.compile(r"\(0x\)\s*((?:[0-9A-Fa-f]{2}-)*[0-9A-Fa-f]{2})")
+
+
+@dataclass
+class LoadedDump:
+    """A dump file after hashing and decoding (returned from pool workers)."""
+
+    path: str
+    name: str
+    eeprom_data: bytes = b""
+    sha256: str = ""
+    parsed: dict[str, str] = field(default_factory=dict)
+    error: str | None = None
+
+
+@dataclass
+class ImportStats:
+    """Counters reported at the end of an import run."""
+
+    files: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    errors: int = 0
+    bytes_read: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def summary(self) -> str:
+        """Human-readable throughput summary."""
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return (
+            f"{self.files} files in {elapsed:.2f}s "
+            f"({self.files / elapsed:.0f} files/s, "
+            f"{self.bytes_read / elapsed / 1_000_000:.2f} MB/s): "
+            f"{self.inserted} inserted, {self.duplicates} duplicates, {self.errors} errors"
+        )
+
+
+def parse_nrf_export(text: str) -> bytes:
+    """Concatenate every hex value logged in an nRF Connect export."""
+    return b"".join(
+        bytes.fromhex(match.replace("-", "")) for match in _NRF_VALUE_PATTERN.findall(text)
+    )
+
+
+def load_dump(path: str) -> LoadedDump:
+    """Read, hash and decode one dump file. Runs in a worker process."""
+    name = Path(path).stem
+    try:
+        if Path(path).suffix.lower() in BIN_SUFFIXES:
+            eeprom_data = Path(path).read_bytes()
+        else:
+            eeprom_data = parse_nrf_export(Path(path).read_text(errors="ignore"))
+    except OSError as e:
+        return LoadedDump(path=path, name=name, error=str(e))
+
+    if not eeprom_data:
+        return LoadedDump(path=path, name=name, error="No EEPROM data found")
+
+    sha256, parsed = prepare_eeprom(eeprom_data)
+    return LoadedDump(
+        path=path, name=name, eeprom_data=eeprom_data, sha256=sha256, parsed=parsed
+    )
+
+
+def find_dumps(root: Path) -> Iterator[str]:
+    """Yield paths of importable files under `root`, in a stable order."""
+    suffixes = BIN_SUFFIXES | NRF_EXPORT_SUFFIXES
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if Path(filename).suffix.lower() in suffixes:
+                yield os.path.join(dirpath, filename)
+
+
+async def import_batch(
+    session: AsyncSession, batch: Sequence[LoadedDump], stats: ImportStats
+) -> None:
+    """Deduplicate one batch against the library and insert the new images."""
+    results = await ModuleService(session).add_prepared_batch(
+        [(dump.name, dump.eeprom_data) for dump in batch],
+        [(dump.sha256, dump.parsed) for dump in batch],
+    )
+    await session.commit()
+    inserted = sum(1 for result in results if not result.is_duplicate)
+    stats.inserted += inserted
+    stats.duplicates += len(batch) - inserted
+
+
+async def run_import(
+    root: Path, database_url: str, workers: int, batch_size: int, verbose: bool = False
+) -> ImportStats:
+    """Import every dump under `root` into the database at `database_url`."""
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    stats = ImportStats()
+    batch: list[LoadedDump] = []
+    try:
+        async with session_maker() as session:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for dump in pool.map(load_dump, find_dumps(root), chunksize=32):
+                    stats.files += 1
+                    if dump.error:
+                        stats.errors += 1
+                        print(f"error: {dump.path}: {dump.error}", file=sys.stderr)
+                        continue
+
+                    stats.bytes_read += len(dump.eeprom_data)
+                    batch.append(dump)
+                    if len(batch) >= batch_size:
+                        await import_batch(session, batch, stats)
+                        batch.clear()
+                        if verbose:
+                            print(stats.summary())
+
+                if batch:
+                    await import_batch(session, batch, stats)
+    finally:
+        await engine.dispose()
+
+    return stats
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Import directories of EEPROM dumps into the SFPLiberate library"
+    )
+    parser.add_argument("root", type=Path, help="Directory to scan for dumps")
+    parser.add_argument(
+        "--database-url",
+        default=get_settings().database_url,
+        help="Database URL (default: DATABASE_URL setting)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of hashing/decoding processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Modules inserted per transaction"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print progress per batch")
+    args = parser.parse_args(argv)
+
+    if not args.root.is_dir():
+        parser.error(f"{args.root} is not a directory")
+
+    stats = asyncio.run(
+        run_import(args.root, args.database_url, args.workers, args.batch_size, args.verbose)
+    )
+    print(stats.summary())
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
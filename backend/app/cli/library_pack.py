@@ -0,0 +1,218 @@
+"""
+Export, import and verify packed library archives (see `app.services.library_pack`).
+
+Usage:
+    python -m app.cli.library_pack export library.sfpk
+    python -m app.cli.library_pack import library.sfpk
+    python -m app.cli.library_pack verify library.sfpk
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.models import Base
+from app.repositories.module_repository import ModuleRepository
+from app.services.eeprom_delta import apply_delta_cached
+from app.services.library_pack import PackReader, PackWriter
+from app.services.module_service import ModuleService
+
+
+@dataclass
+class PackImportStats:
+    """Counters reported at the end of a pack import."""
+
+    entries: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (
+            f"{self.entries} entries: {self.inserted} inserted, "
+            f"{self.duplicates} duplicates, {self.rejected} rejected"
+        )
+
+
+async def export_pack(database_url: str, path: Path, batch_size: int) -> int:
+    """
+    Write every module and module revision in the database to a pack.
+
+    Revisions are written as full images. Returns the entry count.
+    """
+    engine = create_async_engine(database_url)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    writer = PackWriter(path)
+    try:
+        after_id = 0
+        while True:
+            async with session_maker() as session:
+                repository = ModuleRepository(session)
+                modules = await repository.get_batch_after(after_id, batch_size)
+                if not modules:
+                    break
+                images = await repository.get_eeprom_many(modules)
+                revisions = await repository.revisions.list_for_modules([m.id for m in modules])
+
+            by_id = {module.id: module for module in modules}
+            for module in modules:
+                writer.add(
+                    module.sha256,
+                    images.get(module.id, b""),
+                    {
+                        "name": module.name,
+                        "vendor": module.vendor,
+                        "model": module.model,
+                        "serial": module.serial,
+                    },
+                )
+            for revision in revisions:
+                base = by_id[revision.module_id]
+                writer.add(
+                    revision.sha256,
+                    apply_delta_cached(images.get(base.id, b""), revision.delta),
+                    {
+                        "name": revision.name,
+                        "vendor": base.vendor,
+                        "model": base.model,
+                        "serial": base.serial,
+                        "revision": revision.revision,
+                        "base_sha256": base.sha256,
+                    },
+                )
+            after_id = modules[-1].id
+    except BaseException:
+        writer.discard()
+        raise
+    finally:
+        await engine.dispose()
+
+    return writer.close()
+
+
+async def import_pack(path: Path, database_url: str, batch_size: int) -> PackImportStats:
+    """
+    Import every entry of a pack whose image matches its sha256.
+
+    Revisions are stored after every base image, in revision order, so each
+    lands as a revision of its module again.
+    """
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    stats = PackImportStats()
+    try:
+        with PackReader(path) as reader:
+            async with session_maker() as session:
+                service = ModuleService(session)
+                batch: list[tuple[str, bytes]] = []
+                revisions: list[tuple[int, str, bytes]] = []
+                for sha256, data, metadata in reader:
+                    stats.entries += 1
+                    if hashlib.sha256(data).hexdigest() != sha256:
+                        stats.rejected += 1
+                        print(f"error: {sha256}: sha256 mismatch", file=sys.stderr)
+                        continue
+
+                    name = metadata.get("name") or sha256[:16]
+                    revision = metadata.get("revision")
+                    if isinstance(revision, int):
+                        revisions.append((revision, name, data))
+                        continue
+                    batch.append((name, data))
+                    if len(batch) >= batch_size:
+                        await _store(session, service, batch, stats)
+
+                if batch:
+                    await _store(session, service, batch, stats)
+
+                revisions.sort(key=lambda item: item[0])
+                for start in range(0, len(revisions), batch_size):
+                    for _, name, data in revisions[start : start + batch_size]:
+                        saved = await service.save_module(name, data)
+                        if saved.status == "duplicate":
+                            stats.duplicates += 1
+                        else:
+                            stats.inserted += 1
+                    await session.commit()
+    finally:
+        await engine.dispose()
+
+    return stats
+
+
+async def _store(
+    session: AsyncSession,
+    service: ModuleService,
+    batch: list[tuple[str, bytes]],
+    stats: PackImportStats,
+) -> None:
+    results = await service.add_modules_batch(batch)
+    await session.commit()
+    stats.inserted += sum(1 for r in results if not r.is_duplicate)
+    stats.duplicates += sum(1 for r in results if r.is_duplicate)
+    batch.clear()
+
+
+def verify_pack(path: Path) -> list[str]:
+    """Check a pack's structure and every image's sha256."""
+    with PackReader(path) as reader:
+        return reader.verify()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Work with packed SFPLiberate library archives")
+    parser.add_argument(
+        "--database-url",
+        default=get_settings().database_url,
+        help="Database URL (default: DATABASE_URL setting)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Modules read or inserted per transaction"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in [
+        ("export", "Write the library to a pack"),
+        ("import", "Add the modules in a pack to the library"),
+        ("verify", "Check a pack's index and checksums"),
+    ]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("pack", type=Path, help="Pack file")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        count = asyncio.run(export_pack(args.database_url, args.pack, args.batch_size))
+        print(f"exported {count} modules to {args.pack}")
+        return 0
+
+    try:
+        if args.command == "import":
+            stats = asyncio.run(import_pack(args.pack, args.database_url, args.batch_size))
+            print(stats.summary())
+            return 1 if stats.rejected else 0
+
+        problems = verify_pack(args.pack)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    for problem in problems:
+        print(f"error: {problem}", file=sys.stderr)
+    print(f"{args.pack}: {'corrupt' if problems else 'ok'}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Pull missing modules from another SFPLiberate instance.
+
+Usage:
+    python -m app.cli.sync_pull http://other-host:8080/api/v1
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Sequence
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.models import Base
+from app.schemas.sync import PullResult
+from app.services.replication import ReplicationService
+
+
+async def run_pull(remote_url: str, database_url: str) -> PullResult:
+    """Pull from `remote_url` into the database at `database_url`."""
+    settings = get_settings()
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with (
+            session_maker() as session,
+            httpx.AsyncClient(base_url=remote_url, timeout=settings.sync_timeout) as remote,
+        ):
+            return await ReplicationService(session).pull(
+                remote,
+                prefix_length=settings.sync_prefix_length,
+                batch_size=settings.sync_blob_batch_size,
+            )
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Pull missing modules from another instance")
+    parser.add_argument("remote_url", help="Remote API base URL, e.g. http://host/api/v1")
+    parser.add_argument(
+        "--database-url",
+        default=get_settings().database_url,
+        help="Database URL (default: DATABASE_URL setting)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result = asyncio.run(run_pull(args.remote_url, args.database_url))
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{result.status}: {result.buckets_differing}/{result.buckets_compared} buckets differed, "
+        f"{result.inserted}/{result.missing} missing modules copied "
+        f"({result.bytes_transferred} bytes)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
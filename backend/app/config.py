@@ -18,6 +18,11 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:////app/data/sfp_library.db"
     database_echo: bool = False
+    # Connection pool (ignored for SQLite; used for postgresql+asyncpg)
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30  # Seconds to wait for a free connection
+    database_pool_recycle: int = 1800  # Seconds before a connection is replaced
 
     # API
     api_v1_prefix: str = "/api/v1"
@@ -27,8 +32,61 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: list[str] = ["*"]
 
+    # Admission control for write requests (POST/PUT/PATCH/DELETE under the API prefix)
+    rate_limit_enabled: bool = True
+    rate_limit_write_rate: float = 5.0  # Requests per second per client and endpoint
+    rate_limit_write_burst: int = 20  # Requests a client may send at once before throttling
+    rate_limit_max_concurrent_writes: int = 4  # Write requests in flight across all clients
+    # Per-endpoint rates ("METHOD /path" below the API prefix); 0 exempts the endpoint
+    rate_limit_overrides: dict[str, float] = {
+        "POST /submissions": 1.0,
+        "POST /modules/eeprom": 0,  # Read-only batch fetch
+    }
+    # Proxies (addresses or CIDRs) whose client header names the real client,
+    # e.g. ["172.30.32.2"] for Home Assistant ingress; empty trusts no header
+    rate_limit_trusted_proxies: list[str] = []
+    rate_limit_client_header: str = "X-Forwarded-For"
+
     # Submissions
     submissions_dir: str = "/app/data/submissions"
+    submissions_page_size: int = 100  # Maximum submissions returned per review page
+    submissions_promote_max_ids: int = 1000  # Maximum submissions promoted per request
+    submission_validation_workers: int = 2  # Submissions validated concurrently in the background
+
+    # Bulk ingest
+    bulk_ingest_batch_size: int = 500  # Lines hashed, deduplicated and committed together
+    bulk_ingest_max_line_bytes: int = 65536  # Reject NDJSON lines longer than this
+
+    # Batch EEPROM fetch
+    eeprom_batch_max_ids: int = 1000  # Maximum module IDs per /modules/eeprom request
+
+    # Library change feed
+    change_feed_page_size: int = 500  # Maximum changes returned per page
+    change_feed_poll_interval: float = 1.0  # SSE stream poll interval (seconds)
+    change_feed_heartbeat_interval: int = 15  # SSE keep-alive comment interval (seconds)
+
+    # Known-hashes Bloom filter (client-side duplicate prechecks)
+    bloom_filter_capacity: int = 50000  # Initial sizing; grows to 2x library size on rebuild
+    bloom_filter_error_rate: float = 0.01  # Target false positive rate
+    suggest_max_results: int = 20  # Upper bound for GET /modules/suggest?limit=
+
+    # Library replication between instances
+    sync_prefix_length: int = 2  # Hex digits of sha256 per Merkle bucket (2 = 256 buckets)
+    sync_blob_batch_size: int = 200  # Blobs requested and inserted per round trip
+    sync_timeout: int = 30  # HTTP timeout when pulling from a remote instance (seconds)
+
+    # Storage
+    eeprom_page_dedup: bool = False  # Store new images as shared 256-byte pages (A0h/A2h)
+
+    # Background jobs
+    jobs_max_workers: int = 4  # Jobs running at once across all job types
+    jobs_poll_interval: float = 0.5  # Job progress SSE poll interval (seconds)
+
+    # Background integrity scrubber
+    integrity_scrub_enabled: bool = True
+    integrity_scrub_rate: int = 262144  # Max image bytes re-hashed per second
+    integrity_scrub_batch_size: int = 100  # Modules checked per short transaction
+    integrity_scrub_interval: int = 24  # Hours between full passes
 
     # Logging
     log_level: str = "INFO"
@@ -37,6 +95,14 @@ class Settings(BaseSettings):
     # Features
     enable_community_import: bool = False
     community_index_url: str = ""
+    community_sync_interval: int = 60  # Minutes between conditional index fetches
+    community_sync_timeout: int = 30  # HTTP timeout when fetching the index (seconds)
+    community_page_size: int = 200  # Maximum mirrored modules returned per page
+    blob_import_max_entries: int = 500  # Maximum entries per /modules/import request
+    blob_import_concurrency: int = 8  # Blob downloads in flight per import
+    blob_import_max_bytes: int = 65536  # Abort blob downloads larger than this
+    blob_import_timeout: int = 30  # HTTP timeout per blob download (seconds)
+    blob_import_allow_private_networks: bool = False  # Allow blob hosts on private networks
 
     # ESPHome Bluetooth Proxy
     esphome_proxy_mode: bool = False
@@ -87,6 +153,11 @@ class Settings(BaseSettings):
     database_backup_interval: int = 24  # Backup interval in hours
     database_backup_max_count: int = 7  # Maximum number of backups to keep
     database_backup_path: str = "/config/sfpliberate/backups"  # Backup directory
+    database_backup_pages_per_step: int = 256  # SQLite pages copied per online backup step
+    database_backup_step_pause: float = 0.005  # Seconds between steps, so writers get a turn
+    database_backup_mode: str = "full"  # "full" or "incremental" (library changes only)
+    database_backup_full_every: int = 7  # Incremental mode: every Nth backup is a full one
+    database_restore_drain_timeout: float = 10.0  # Seconds to wait for open sessions on restore
 
 
 @lru_cache
@@ -1,37 +1,252 @@
 """Database configuration and session management."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Connection, MetaData
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.sql.dml import Insert
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 settings = get_settings()
 
+
+def engine_options(config: Settings) -> dict[str, Any]:
+    """
+    Build dialect-specific engine keyword arguments.
+
+    SQLite uses SQLAlchemy's default pool (a single file has one writer anyway).
+    Server databases such as PostgreSQL get a sized, pre-pinged and recycled
+    connection pool so several sites can share one deployment.
+    """
+    if make_url(config.database_url).get_backend_name() == "sqlite":
+        return {}
+
+    return {
+        "pool_size": config.database_pool_size,
+        "max_overflow": config.database_max_overflow,
+        "pool_timeout": config.database_pool_timeout,
+        "pool_recycle": config.database_pool_recycle,
+        "pool_pre_ping": True,
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
     future=True,
+    **engine_options(settings),
 )
 
+
+class DatabaseGate:
+    """
+    Counts sessions in use and lets maintenance take the database exclusively.
+
+    Sessions from `async_session_maker` pass through the gate when entered
+    with `async with`. `exclusive()` stops new sessions from starting, waits
+    for the open ones to finish and holds the database until its block ends;
+    that is how a restore swaps the database file under a running app.
+    """
+
+    def __init__(self) -> None:
+        """Create an open gate."""
+        self._active = 0
+        self._paused = False
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # A Condition is bound to one event loop; tests run one loop per test
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    @property
+    def active(self) -> int:
+        """Number of sessions currently inside the gate."""
+        return self._active
+
+    async def enter(self) -> None:
+        """Wait while the database is held exclusively, then count one more user."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: not self._paused)
+            self._active += 1
+
+    async def leave(self) -> None:
+        """Count one user less."""
+        condition = self._get_condition()
+        async with condition:
+            self._active -= 1
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def exclusive(self, timeout: float) -> AsyncIterator[None]:
+        """
+        Hold the database with no session open for the duration of the block.
+
+        Raises:
+            TimeoutError: If open sessions don't finish within `timeout` seconds
+                (the gate reopens and nothing is held)
+            RuntimeError: If the database is already held
+        """
+        condition = self._get_condition()
+        async with condition:
+            if self._paused:
+                raise RuntimeError("Database is already held exclusively")
+            self._paused = True
+            try:
+                await asyncio.wait_for(condition.wait_for(lambda: self._active == 0), timeout)
+            except BaseException:
+                self._paused = False
+                condition.notify_all()
+                raise
+        try:
+            yield
+        finally:
+            async with condition:
+                self._paused = False
+                condition.notify_all()
+
+
+db_gate = DatabaseGate()
+
+
+class GatedAsyncSession(AsyncSession):
+    """`AsyncSession` that waits at `db_gate` when entered with `async with`."""
+
+    async def __aenter__(self) -> "GatedAsyncSession":
+        await db_gate.enter()
+        return self
+
+    async def __aexit__(self, type_: Any, value: Any, traceback: Any) -> None:
+        try:
+            await super().__aexit__(type_, value, traceback)
+        finally:
+            await db_gate.leave()
+
+
 # Create session maker
 async_session_maker = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=GatedAsyncSession,
     expire_on_commit=False,
 )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database sessions."""
+    """
+    Dependency for getting async database sessions.
+
+    Whatever the endpoint left uncommitted is committed once it returns
+    successfully; if it raises, the session is rolled back on close.
+    """
     async with async_session_maker() as session:
         yield session
+        await session.commit()
+
+
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """
+    Dependency for endpoints that stream for a long time.
 
+    They open a short-lived session per unit of work instead of holding one from
+    `get_db` for the whole response, so `db_gate.exclusive()` can still drain.
+    """
+    return async_session_maker
 
-async def init_db() -> None:
-    """Initialize database (create tables)."""
-    from app.models.module import Base
 
-    async with engine.begin() as conn:
+async def init_db(db_engine: AsyncEngine | None = None) -> None:
+    """
+    Initialize database (create tables).
+
+    Also brings databases created by older versions up to date; a restore
+    runs this again on the restored database.
+    """
+    from app.models import Base
+
+    async with (db_engine or engine).begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips tables that already exist, so add indexes introduced later
+        await conn.run_sync(_create_missing_indexes, Base.metadata)
+        await conn.run_sync(_add_sqlite_autoincrement, Base.metadata)
+
+
+def _create_missing_indexes(conn: Connection, metadata: MetaData) -> None:
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _add_sqlite_autoincrement(conn: Connection, metadata: MetaData) -> None:
+    """Rebuild SQLite tables created before they were declared AUTOINCREMENT."""
+    if conn.dialect.name != "sqlite":
+        return
+    for table in metadata.sorted_tables:
+        if not table.dialect_options["sqlite"]["autoincrement"]:
+            continue
+        sql = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+        ).scalar()
+        if sql is None or "AUTOINCREMENT" in sql.upper():
+            continue
+
+        old_name = f"{table.name}_before_autoincrement"
+        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+        conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"')
+        for index in table.indexes:
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index.name}"')
+        table.create(conn)
+        conn.exec_driver_sql(
+            f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old_name}"'
+        )
+        conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+
+
+def insert_ignoring_conflicts(
+    dialect_name: str, model: type, index_elements: Sequence[str]
+) -> Insert:
+    """
+    Build an INSERT that silently skips rows violating a unique index.
+
+    Both supported dialects spell this `ON CONFLICT (...) DO NOTHING`, but the
+    construct lives in dialect-specific modules.
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Unsupported database dialect: {dialect_name}")
+
+    return insert(model).on_conflict_do_nothing(index_elements=list(index_elements))
+
+
+def get_pool_stats(db_engine: AsyncEngine | None = None) -> dict[str, object]:
+    """Report connection pool usage for monitoring."""
+    pool = (db_engine or engine).pool
+    stats: dict[str, object] = {
+        "dialect": (db_engine or engine).dialect.name,
+        "pool_class": type(pool).__name__,
+    }
+
+    # Only queue-style pools expose sizing counters
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+
+    return stats
@@ -0,0 +1,179 @@
+"""
+Bloom filter of sha256 values already in the library or the community mirror.
+
+Clients download the filter to skip uploading images the server already has,
+and the server uses it to skip duplicate lookups for images it has never seen.
+
+Binary format (big-endian), served by `GET /api/v1/modules/bloom`:
+
+    magic      4 bytes   b"SFPB"
+    version    1 byte    1
+    k          1 byte    number of probes (1-8)
+    reserved   2 bytes
+    m          4 bytes   number of bits
+    count      4 bytes   number of hashes added
+    bits       ceil(m / 8) bytes, bit i is byte i >> 3, mask 1 << (i & 7)
+
+Probe i of a sha256 is `int.from_bytes(digest[4 * i : 4 * i + 4], "big") % m`,
+where `digest` is the raw 32-byte checksum. Because the keys already are
+uniformly distributed hashes, no further hashing is needed.
+"""
+
+import math
+import struct
+import uuid
+from collections.abc import Iterable
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger()
+
+MAGIC = b"SFPB"
+VERSION = 1
+_HEADER = struct.Struct(">4sBBxxII")
+_MAX_PROBES = 8  # A 32-byte digest yields eight independent 4-byte probes
+_PENDING_REMOVALS = "known_hashes_pending_removals"
+
+
+class CountingBloomFilter:
+    """Bloom filter with 8-bit counters so entries can be removed again."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Size the filter for `capacity` entries at the target false positive rate.
+
+        Args:
+            capacity: Expected number of entries
+            error_rate: Target false positive probability (e.g. 0.01)
+        """
+        capacity = max(capacity, 1)
+        self.m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = min(_MAX_PROBES, max(1, round(self.m / capacity * math.log(2))))
+        self.counters = bytearray(self.m)
+        self.count = 0
+
+    def _probes(self, sha256: str) -> list[int]:
+        digest = bytes.fromhex(sha256)
+        return [int.from_bytes(digest[4 * i : 4 * i + 4], "big") % self.m for i in range(self.k)]
+
+    def add(self, sha256: str) -> None:
+        """Add a checksum."""
+        for index in self._probes(sha256):
+            if self.counters[index] < 255:
+                self.counters[index] += 1
+        self.count += 1
+
+    def remove(self, sha256: str) -> None:
+        """Remove a checksum that was previously added."""
+        for index in self._probes(sha256):
+            # Saturated counters stay put; they may hide a later removal but never a member
+            if 0 < self.counters[index] < 255:
+                self.counters[index] -= 1
+        self.count = max(0, self.count - 1)
+
+    def might_contain(self, sha256: str) -> bool:
+        """False means definitely absent; True means probably present."""
+        return all(self.counters[index] for index in self._probes(sha256))
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a plain bit-per-slot Bloom filter (see module docstring)."""
+        bits = bytearray((self.m + 7) // 8)
+        for index, counter in enumerate(self.counters):
+            if counter:
+                bits[index >> 3] |= 1 << (index & 7)
+        return _HEADER.pack(MAGIC, VERSION, self.k, self.m, self.count) + bytes(bits)
+
+
+class KnownHashes:
+    """Process-wide, incrementally updated filter over library checksums."""
+
+    def __init__(self) -> None:
+        """Create an empty, not yet loaded filter."""
+        self._filter: CountingBloomFilter | None = None
+        self._instance = uuid.uuid4().hex[:8]
+        self._generation = 0
+        self._serialized: tuple[int, bytes] | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the filter has been loaded and can answer lookups."""
+        return self._filter is not None
+
+    @property
+    def etag(self) -> str:
+        """ETag identifying the current filter contents."""
+        return f'"{self._instance}-{self._generation}"'
+
+    def reset(self) -> None:
+        """Drop the filter (it is rebuilt on next load)."""
+        self._filter = None
+        self._serialized = None
+        self._generation += 1
+
+    def build(self, sha256s: Iterable[str], capacity: int, error_rate: float) -> None:
+        """Rebuild from a full list of checksums."""
+        sha256s = list(sha256s)
+        # Leave headroom so incremental inserts don't degrade the error rate quickly
+        bloom = CountingBloomFilter(max(capacity, 2 * len(sha256s)), error_rate)
+        for sha256 in sha256s:
+            bloom.add(sha256)
+        self._filter = bloom
+        self._serialized = None
+        self._generation += 1
+        logger.info("known_hashes_built", count=len(sha256s), bits=bloom.m, probes=bloom.k)
+
+    def add(self, sha256s: Iterable[str]) -> None:
+        """Record newly inserted checksums."""
+        if self._filter is None:
+            return
+        for sha256 in sha256s:
+            self._filter.add(sha256)
+        self._generation += 1
+
+    def remove(self, sha256s: Iterable[str]) -> None:
+        """Forget deleted checksums."""
+        if self._filter is None:
+            return
+        for sha256 in sha256s:
+            self._filter.remove(sha256)
+        self._generation += 1
+
+    def might_contain(self, sha256: str) -> bool:
+        """False only if the filter is loaded and the checksum is definitely unknown."""
+        return self._filter is None or self._filter.might_contain(sha256)
+
+    def remove_after_commit(self, session: AsyncSession, sha256s: Iterable[str]) -> None:
+        """
+        Forget checksums once the session's transaction commits.
+
+        Removing early and then rolling back would leave a stored image the
+        filter claims is absent, so deletions wait for the commit.
+        """
+        pending = session.sync_session.info.setdefault(_PENDING_REMOVALS, [])
+        pending.extend(sha256s)
+
+    def to_bytes(self) -> bytes:
+        """Serialized filter, cached until the contents change."""
+        if self._filter is None:
+            raise RuntimeError("Known hashes filter is not loaded")
+        if self._serialized is None or self._serialized[0] != self._generation:
+            self._serialized = (self._generation, self._filter.to_bytes())
+        return self._serialized[1]
+
+
+known_hashes = KnownHashes()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_removals(session: Session) -> None:
+    pending = session.info.pop(_PENDING_REMOVALS, None)
+    if pending:
+        known_hashes.remove(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_removals(session: Session, previous_transaction: object) -> None:
+    session.info.pop(_PENDING_REMOVALS, None)
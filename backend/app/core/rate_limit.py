@@ -0,0 +1,345 @@
+"""
+Admission control for write endpoints.
+
+A script hammering `POST /modules` or `POST /submissions` can keep the single
+SQLite writer (and, on the Home Assistant add-on, the SD card) busy for
+everyone else. Every write request (POST, PUT, PATCH, DELETE under the API
+prefix) therefore has to pass two checks before it reaches a route:
+
+- A token bucket per client and endpoint: `rate` requests per second with
+  bursts of up to `burst`. Endpoints are keyed by method and path with
+  numeric segments folded, so `DELETE /modules/1` and `/modules/2` share one.
+- A global cap on write requests in flight. A request holds its slot until
+  its response starts; streaming the response body doesn't count, unless
+  the request body is still being read (`POST /modules/bulk` streams
+  results while it ingests), in which case the slot is held to the end.
+
+Clients are keyed by their socket address. Behind a reverse proxy (such as
+Home Assistant ingress) every request comes from the proxy, so for peers
+listed in `rate_limit_trusted_proxies` the client is taken from
+`rate_limit_client_header` (`X-Forwarded-For` by default) instead: the
+nearest address in it that isn't itself a trusted proxy. The header is
+ignored for any other peer, since clients can send whatever they like.
+
+Rejected requests get `429 Too Many Requests` with a `Retry-After` header and
+are counted per endpoint. An override rate of 0 exempts an endpoint (e.g. the
+read-only `POST /modules/eeprom`).
+"""
+
+import ipaddress
+import json
+import math
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# Idle buckets are pruned once this many exist (an idle bucket is full anyway)
+_MAX_IDLE_BUCKETS = 10000
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@dataclass
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second."""
+
+    rate: float
+    burst: float
+    tokens: float
+    updated: float
+
+    def take(self, now: float) -> float:
+        """
+        Take one token.
+
+        Returns:
+            0 if a token was available, otherwise seconds until one will be
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket has refilled completely (and can be forgotten)."""
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+def endpoint_key(method: str, path: str, prefix: str) -> str:
+    """`METHOD /path` relative to the API prefix, with numeric IDs folded to `{id}`."""
+    if path.startswith(prefix):
+        path = path[len(prefix) :] or "/"
+    return f"{method} {_NUMERIC_SEGMENT.sub('/{id}', path.rstrip('/') or '/')}"
+
+
+class AdmissionController:
+    """Token buckets, the write concurrency cap and rejection counters."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """Initialize from settings."""
+        settings = get_settings()
+        self.clock = clock
+        self.configure(
+            enabled=settings.rate_limit_enabled,
+            rate=settings.rate_limit_write_rate,
+            burst=settings.rate_limit_write_burst,
+            max_concurrent_writes=settings.rate_limit_max_concurrent_writes,
+            overrides=settings.rate_limit_overrides,
+        )
+
+    def configure(
+        self,
+        enabled: bool,
+        rate: float,
+        burst: int,
+        max_concurrent_writes: int,
+        overrides: dict[str, float] | None = None,
+    ) -> None:
+        """
+        Set limits and forget all state.
+
+        Args:
+            enabled: Whether limits are enforced at all
+            rate: Write requests per second per client and endpoint
+            burst: Requests a client may make at once before being limited
+            max_concurrent_writes: Write requests in flight across all clients
+            overrides: Per-endpoint rates keyed like `POST /submissions`
+        """
+        self.enabled = enabled
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent_writes = max_concurrent_writes
+        self.overrides = dict(overrides or {})
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget buckets, in-flight requests and counters."""
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self.in_flight = 0
+        self.allowed = 0
+        self.rejected: Counter[str] = Counter()  # Keyed by "<reason> <endpoint>"
+
+    def limits(self, endpoint: str) -> bool:
+        """Whether requests to `endpoint` are subject to admission control."""
+        return self.enabled and self.overrides.get(endpoint, self.rate) > 0
+
+    def admit(self, client: str, endpoint: str) -> tuple[str, float] | None:
+        """
+        Decide whether a write request may proceed.
+
+        A successful call must be paired with `release()`.
+
+        Returns:
+            None if admitted, otherwise (reason, retry_after_seconds)
+        """
+        now = self.clock()
+        key = (client, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_IDLE_BUCKETS:
+                self._prune(now)
+            rate = self.overrides.get(endpoint, self.rate)
+            bucket = self._buckets[key] = TokenBucket(rate, self.burst, self.burst, now)
+
+        wait = bucket.take(now)
+        if wait:
+            self.rejected[f"rate {endpoint}"] += 1
+            return "rate", wait
+
+        if self.in_flight >= self.max_concurrent_writes:
+            # Give the token back: the client was within its rate
+            bucket.tokens += 1
+            self.rejected[f"concurrency {endpoint}"] += 1
+            return "concurrency", 1.0
+
+        self.in_flight += 1
+        self.allowed += 1
+        return None
+
+    def release(self) -> None:
+        """Mark an admitted write request as finished."""
+        self.in_flight -= 1
+
+    def stats(self) -> dict[str, object]:
+        """Counters for monitoring."""
+        by_endpoint: dict[str, dict[str, int]] = {}
+        for key, count in sorted(self.rejected.items()):
+            reason, endpoint = key.split(" ", 1)
+            by_endpoint.setdefault(endpoint, {})[reason] = count
+        return {
+            "enabled": self.enabled,
+            "allowed": self.allowed,
+            "in_flight": self.in_flight,
+            "rejected_rate": sum(
+                n for key, n in self.rejected.items() if key.startswith("rate ")
+            ),
+            "rejected_concurrency": sum(
+                n for key, n in self.rejected.items() if key.startswith("concurrency ")
+            ),
+            "rejected_by_endpoint": by_endpoint,
+        }
+
+    def _prune(self, now: float) -> None:
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if not bucket.is_full(now)
+        }
+
+
+admission_control = AdmissionController()
+
+_Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def _in_networks(address: str, networks: Iterable[_Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_key(scope: Scope, trusted_proxies: list[_Network], header: bytes) -> str:
+    """
+    Address a request is rate limited under.
+
+    Args:
+        scope: ASGI HTTP scope
+        trusted_proxies: Networks whose `header` is believed
+        header: Lowercase name of the header listing forwarded-for addresses
+    """
+    peer = scope["client"][0] if scope.get("client") else "unknown"
+    if not _in_networks(peer, trusted_proxies):
+        return peer
+
+    hops = [
+        hop.strip()
+        for name, value in scope["headers"]
+        if name == header
+        for hop in value.decode("latin-1").split(",")
+        if hop.strip()
+    ]
+    # Proxies append the address they received from, so walk back from the end
+    for hop in reversed(hops):
+        if not _in_networks(hop, trusted_proxies):
+            return hop
+    return hops[0] if hops else peer
+
+
+def _has_body(scope: Scope) -> bool:
+    """Whether an HTTP request declares a body (a length or chunked encoding)."""
+    for name, value in scope["headers"]:
+        if name == b"transfer-encoding" or (name == b"content-length" and value != b"0"):
+            return True
+    return False
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying `admission_control` to write requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: str,
+        trusted_proxies: Iterable[str] = (),
+        client_header: str = "X-Forwarded-For",
+    ):
+        """
+        Wrap an ASGI app.
+
+        Args:
+            app: Application to protect
+            prefix: Only paths under this prefix are limited
+            trusted_proxies: Proxy addresses or networks whose `client_header` is believed
+            client_header: Header a trusted proxy puts the client address in
+        """
+        self.app = app
+        self.prefix = prefix
+        self.trusted_proxies = [
+            ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies
+        ]
+        self.client_header = client_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Reject or pass through one request."""
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in WRITE_METHODS
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = endpoint_key(scope["method"], scope["path"], self.prefix)
+        if not admission_control.limits(endpoint):
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(scope, self.trusted_proxies, self.client_header)
+        rejection = admission_control.admit(client, endpoint)
+        if rejection is not None:
+            reason, retry_after = rejection
+            logger.warning("rate_limited", client=client, endpoint=endpoint, reason=reason)
+            await self._reject(send, reason, retry_after)
+            return
+
+        released = False
+        body_received = not _has_body(scope)
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                admission_control.release()
+
+        async def receive_wrapper() -> Message:
+            nonlocal body_received
+            message = await receive()
+            if message["type"] == "http.disconnect" or not message.get("more_body", False):
+                body_received = True
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            # A slow reader of the response mustn't keep other writers out,
+            # but a request still being read is still being written
+            if message["type"] == "http.response.start" and body_received:
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            release()
+
+    @staticmethod
+    async def _reject(send: Send, reason: str, retry_after: float) -> None:
+        detail = (
+            "Rate limit exceeded"
+            if reason == "rate"
+            else "Too many write requests in progress"
+        )
+        body = json.dumps({"detail": detail}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,174 @@
+"""
+In-memory prefix index for search-box autocomplete.
+
+Distinct vendor, model and name values of the library and the community
+mirror are kept in one sorted array per field, keyed case-insensitively, so
+a prefix lookup is two `bisect` calls plus a slice. Each value carries a
+reference count (how many modules use it); writers report the values they
+add and remove and the index applies them once the transaction commits, so
+a rolled-back insert never shows up as a suggestion.
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger()
+
+SUGGEST_FIELDS = ("vendor", "model", "name")
+_PENDING_CHANGES = "suggest_index_pending_changes"
+
+# Parser placeholders that aren't worth suggesting
+_IGNORED = {"", "N/A", "Unknown", "Parse Error"}
+
+
+@dataclass
+class Suggestion:
+    """One autocomplete candidate."""
+
+    field: str
+    value: str
+    count: int
+
+
+def _normalize(value: object) -> str | None:
+    text = str(value).strip("\x00 ") if value is not None else ""
+    return text if text not in _IGNORED else None
+
+
+class _SortedValues:
+    """Distinct values of one field in case-insensitive order, with reference counts."""
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.display: dict[str, str] = {}
+        self.counts: Counter[str] = Counter()
+
+    def add(self, value: str, n: int = 1) -> None:
+        key = value.casefold()
+        if key not in self.counts:
+            insort(self.keys, key)
+            self.display[key] = value
+        self.counts[key] += n
+
+    def remove(self, value: str) -> None:
+        key = value.casefold()
+        if key not in self.counts:
+            return
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            del self.counts[key], self.display[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def with_prefix(self, prefix: str, limit: int) -> list[str]:
+        start = bisect_left(self.keys, prefix)
+        # Every key with the prefix sorts before prefix + the highest code point
+        end = bisect_left(self.keys, prefix + "\U0010ffff", start)
+        return self.keys[start : min(end, start + limit)]
+
+
+class SuggestIndex:
+    """Process-wide prefix index over vendor, model and name values."""
+
+    def __init__(self) -> None:
+        """Create an empty, not yet loaded index."""
+        self._fields: dict[str, _SortedValues] | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been loaded and can answer lookups."""
+        return self._fields is not None
+
+    def reset(self) -> None:
+        """Drop the index (it is rebuilt on next load)."""
+        self._fields = None
+
+    def build(self, counts: dict[str, Iterable[tuple[object, int]]]) -> None:
+        """
+        Rebuild from full value counts.
+
+        Args:
+            counts: Field -> (value, number of modules using it) pairs
+        """
+        fields = {field: _SortedValues() for field in SUGGEST_FIELDS}
+        for field, pairs in counts.items():
+            for value, n in pairs:
+                text = _normalize(value)
+                if text is not None and n > 0:
+                    fields[field].add(text, n)
+        self._fields = fields
+        logger.info(
+            "suggest_index_built", **{field: len(values.keys) for field, values in fields.items()}
+        )
+
+    def apply(
+        self, added: Iterable[dict[str, object]], removed: Iterable[dict[str, object]]
+    ) -> None:
+        """Apply rows (dicts with some of `SUGGEST_FIELDS`) that were added and removed."""
+        if self._fields is None:
+            return
+        for row in added:
+            for field in SUGGEST_FIELDS:
+                text = _normalize(row.get(field))
+                if text is not None:
+                    self._fields[field].add(text)
+        for row in removed:
+            for field in SUGGEST_FIELDS:
+                text = _normalize(row.get(field))
+                if text is not None:
+                    self._fields[field].remove(text)
+
+    def apply_after_commit(
+        self,
+        session: AsyncSession,
+        added: Iterable[dict[str, object]] = (),
+        removed: Iterable[dict[str, object]] = (),
+    ) -> None:
+        """Apply added and removed rows once the session's transaction commits."""
+        pending = session.sync_session.info.setdefault(_PENDING_CHANGES, ([], []))
+        pending[0].extend({field: row.get(field) for field in SUGGEST_FIELDS} for row in added)
+        pending[1].extend({field: row.get(field) for field in SUGGEST_FIELDS} for row in removed)
+
+    def suggest(
+        self, prefix: str, limit: int, fields: Iterable[str] = SUGGEST_FIELDS
+    ) -> list[Suggestion]:
+        """
+        Values starting with `prefix` (case-insensitive), in alphabetical order.
+
+        Raises:
+            RuntimeError: If the index isn't loaded
+        """
+        if self._fields is None:
+            raise RuntimeError("Suggest index is not loaded")
+        key = prefix.strip().casefold()
+        if not key:
+            return []
+
+        matches = []
+        for field in fields:
+            values = self._fields[field]
+            for match in values.with_prefix(key, limit):
+                matches.append(Suggestion(field, values.display[match], values.counts[match]))
+        matches.sort(key=lambda s: (s.value.casefold(), SUGGEST_FIELDS.index(s.field)))
+        return matches[:limit]
+
+
+suggest_index = SuggestIndex()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_CHANGES, None)
+    if pending:
+        suggest_index.apply(*pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_changes(session: Session, previous_transaction: object) -> None:
+    session.info.pop(_PENDING_CHANGES, None)
@@ -8,8 +8,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.config import get_settings
-from app.core.database import init_db
+from app.core.database import async_session_maker, init_db
 from app.core.logging import setup_logging
+from app.core.rate_limit import RateLimitMiddleware
 
 settings = get_settings()
 
@@ -39,6 +40,69 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("database_initialized")
 
+    # Build the known-hashes Bloom filter used for duplicate prechecks
+    try:
+        from app.repositories.module_repository import ModuleRepository
+
+        async with async_session_maker() as session:
+            await ModuleRepository(session).load_known_hashes(
+                settings.bloom_filter_capacity, settings.bloom_filter_error_rate
+            )
+    except Exception as e:
+        logger.error("known_hashes_load_failed", error=str(e), exc_info=True)
+
+    # Build the autocomplete prefix index (kept current by writers afterwards)
+    try:
+        async with async_session_maker() as session:
+            await ModuleRepository(session).load_suggest_index()
+    except Exception as e:
+        logger.error("suggest_index_load_failed", error=str(e), exc_info=True)
+
+    # Start the submission validation workers (before jobs that may queue submissions)
+    from app.services.submission_validator import submission_validator
+
+    try:
+        await submission_validator.start()
+    except Exception as e:
+        logger.error("submission_validator_startup_failed", error=str(e), exc_info=True)
+
+    # Start the background job manager and resume unfinished jobs
+    from app.api.v1.jobs import set_job_manager
+    from app.services.job_handlers import register_builtin_jobs
+    from app.services.job_manager import JobManager
+
+    job_manager = JobManager()
+    register_builtin_jobs(job_manager)
+    try:
+        await job_manager.start()
+        set_job_manager(job_manager)
+
+        # Decode search fields for modules saved before they existed
+        async with async_session_maker() as session:
+            if await ModuleRepository(session).fields.get_unindexed_ids(0, 1):
+                await job_manager.submit("reindex")
+
+        # Index inbox submissions stored before the index existed or left unindexed
+        await job_manager.submit("index_submissions")
+    except Exception as e:
+        logger.error("job_manager_startup_failed", error=str(e), exc_info=True)
+
+    # Keep the local community index mirror in sync
+    from app.services.community_sync import community_sync
+
+    try:
+        await community_sync.start()
+    except Exception as e:
+        logger.error("community_sync_startup_failed", error=str(e), exc_info=True)
+
+    # Start the throttled background integrity scrubber
+    from app.services.integrity_scrubber import integrity_scrubber
+
+    try:
+        await integrity_scrubber.start()
+    except Exception as e:
+        logger.error("integrity_scrub_startup_failed", error=str(e), exc_info=True)
+
     # Initialize Bluetooth service based on deployment mode
     bluetooth_service = None
     backup_service = None
@@ -83,6 +147,13 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    await integrity_scrubber.stop()
+    await community_sync.stop()
+
+    set_job_manager(None)
+    await job_manager.stop()
+    await submission_validator.stop()
+
     if backup_service:
         try:
             await backup_service.stop()
@@ -114,6 +185,14 @@ app = FastAPI(
     redoc_url=f"{settings.api_v1_prefix}/redoc",
 )
 
+# Rate limit write requests (added first so CORS headers wrap its 429 responses)
+app.add_middleware(
+    RateLimitMiddleware,
+    prefix=settings.api_v1_prefix,
+    trusted_proxies=settings.rate_limit_trusted_proxies,
+    client_header=settings.rate_limit_client_header,
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
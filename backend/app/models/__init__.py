@@ -1,5 +1,28 @@
 """Database models."""
 
+from app.models.community_module import CommunityIndexState, CommunityModule
+from app.models.eeprom_page import EEPROMPage, ModulePage
+from app.models.integrity_finding import IntegrityFinding
+from app.models.job import Job
 from app.models.module import Base, SFPModule
+from app.models.module_change import ModuleChange
+from app.models.module_fields import ModuleFields
+from app.models.module_revision import ModuleRevision
+from app.models.submission import Submission
+from app.models.submission_validation import SubmissionValidation
 
-__all__ = ["Base", "SFPModule"]
+__all__ = [
+    "Base",
+    "CommunityIndexState",
+    "CommunityModule",
+    "EEPROMPage",
+    "IntegrityFinding",
+    "Job",
+    "ModuleChange",
+    "ModuleFields",
+    "ModulePage",
+    "ModuleRevision",
+    "SFPModule",
+    "Submission",
+    "SubmissionValidation",
+]
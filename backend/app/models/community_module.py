@@ -0,0 +1,55 @@
+"""SQLAlchemy models for the local mirror of the community module index."""
+
+from datetime import datetime
+
+from sqlalchemy import Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class CommunityModule(Base):
+    """One entry of the community index, as last synced."""
+
+    __tablename__ = "community_modules"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    vendor: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    model: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    serial: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    size: Mapped[int | None] = mapped_column(nullable=True)
+    blob_url: Mapped[str] = mapped_column(String(1024), nullable=False)
+    first_seen_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    __table_args__ = (Index("idx_community_vendor_model", "vendor", "model"),)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<CommunityModule(sha256={self.sha256[:16]}..., name={self.name!r})>"
+
+
+class CommunityIndexState(Base):
+    """
+    Sync bookkeeping for one community index URL.
+
+    `etag` and `last_modified` are replayed as `If-None-Match` and
+    `If-Modified-Since`; `content_sha256` skips the diff when a server without
+    validators returns an unchanged body.
+    """
+
+    __tablename__ = "community_index_state"
+
+    url: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    module_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    checked_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    changed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<CommunityIndexState(url={self.url!r}, modules={self.module_count})>"
@@ -0,0 +1,44 @@
+"""SQLAlchemy models for page-level EEPROM storage."""
+
+from sqlalchemy import ForeignKey, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class EEPROMPage(Base):
+    """
+    One 256-byte EEPROM page (e.g. A0h or A2h), stored once per distinct content.
+
+    Captures of the same part often share the A0h page and differ only in the
+    A2h diagnostics (or the other way round), so pages dedupe far better than
+    whole images.
+    """
+
+    __tablename__ = "eeprom_pages"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<EEPROMPage(sha256={self.sha256[:16]}..., size={self.size})>"
+
+
+class ModulePage(Base):
+    """Position of a stored page within a module's EEPROM image."""
+
+    __tablename__ = "module_pages"
+
+    module_id: Mapped[int] = mapped_column(
+        ForeignKey("sfp_modules.id", ondelete="CASCADE"), primary_key=True
+    )
+    page_index: Mapped[int] = mapped_column(primary_key=True)
+    page_sha256: Mapped[str] = mapped_column(
+        ForeignKey("eeprom_pages.sha256"), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ModulePage(module_id={self.module_id}, page_index={self.page_index})>"
@@ -0,0 +1,32 @@
+"""SQLAlchemy model for integrity scrubber findings."""
+
+from datetime import datetime
+
+from sqlalchemy import String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class IntegrityFinding(Base):
+    """
+    A problem found by the background integrity scrubber.
+
+    `kind` is "checksum_mismatch" (a stored image no longer hashes to its
+    sha256), "unreadable" (an image could not be rebuilt) or "quick_check"
+    (SQLite reported page-level corruption).
+    """
+
+    __tablename__ = "integrity_findings"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    module_id: Mapped[int | None] = mapped_column(nullable=True, index=True)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    detail: Mapped[str] = mapped_column(Text, nullable=False)
+    found_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    last_seen_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<IntegrityFinding(kind={self.kind!r}, module_id={self.module_id})>"
@@ -0,0 +1,40 @@
+"""SQLAlchemy model for background jobs."""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class Job(Base):
+    """
+    A long-running operation executed by the background job manager.
+
+    `status` moves from "queued" to "running" and ends as "succeeded",
+    "failed" or "cancelled". Jobs still queued or running when the process
+    stops are picked up again on the next start, with their last saved
+    `checkpoint`.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued", index=True)
+    params: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    checkpoint: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    progress_current: Mapped[int] = mapped_column(nullable=False, default=0)
+    progress_total: Mapped[int | None] = mapped_column(nullable=True)
+    message: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<Job(id={self.id}, type={self.type!r}, status={self.status!r})>"
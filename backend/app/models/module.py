@@ -26,7 +26,10 @@ class SFPModule(Base):
     sha256: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
-    __table_args__ = (Index("idx_vendor_model", "vendor", "model"),)
+    __table_args__ = (
+        Index("idx_vendor_model", "vendor", "model"),
+        Index("idx_vendor_serial", "vendor", "serial"),
+    )
 
     def __repr__(self) -> str:
         """String representation."""
@@ -0,0 +1,34 @@
+"""SQLAlchemy model for the module library change log."""
+
+from datetime import datetime
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class ModuleChange(Base):
+    """
+    One insert, update or delete in the module library.
+
+    `seq` increases monotonically and becomes visible in order (see
+    `ChangeLogRepository.record`), so clients can ask for every change after
+    the last one they applied instead of reloading the whole library. It is
+    never handed out twice: SQLite uses AUTOINCREMENT, so deleting the newest
+    rows doesn't free their numbers, and a restore continues after the
+    replaced database's numbers (see `ChangeLogRepository.continue_after_restore`).
+    """
+
+    __tablename__ = "module_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # insert/update/delete
+    module_id: Mapped[int] = mapped_column(nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ModuleChange(seq={self.seq}, op={self.op!r}, module_id={self.module_id})>"
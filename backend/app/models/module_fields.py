@@ -0,0 +1,34 @@
+"""SQLAlchemy model for decoded, searchable module fields."""
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class ModuleFields(Base):
+    """
+    SFF-8472 fields decoded from a module's EEPROM image, one row per module.
+
+    Every column is indexed so each filter of the module query language
+    (`app.services.module_query`) is an index search. Text values are
+    case-folded.
+    """
+
+    __tablename__ = "module_fields"
+
+    module_id: Mapped[int] = mapped_column(
+        ForeignKey("sfp_modules.id", ondelete="CASCADE"), primary_key=True
+    )
+    type: Mapped[str | None] = mapped_column(String(16), index=True)
+    connector: Mapped[str | None] = mapped_column(String(32), index=True)
+    vendor: Mapped[str | None] = mapped_column(String(16), index=True)
+    model: Mapped[str | None] = mapped_column(String(16), index=True)
+    serial: Mapped[str | None] = mapped_column(String(16), index=True)
+    wavelength_nm: Mapped[int | None] = mapped_column(index=True)
+    reach_km: Mapped[float | None] = mapped_column(index=True)
+    bitrate_mbps: Mapped[int | None] = mapped_column(index=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ModuleFields(module_id={self.module_id}, type={self.type!r})>"
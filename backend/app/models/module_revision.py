@@ -0,0 +1,36 @@
+"""SQLAlchemy model for delta-encoded module revisions."""
+
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, LargeBinary, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class ModuleRevision(Base):
+    """
+    A later EEPROM image of a physical module (same vendor and serial).
+
+    Revision 1 is the `SFPModule` row itself. Each later revision stores only
+    a byte-level delta against that base image.
+    """
+
+    __tablename__ = "module_revisions"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    module_id: Mapped[int] = mapped_column(
+        ForeignKey("sfp_modules.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    revision: Mapped[int] = mapped_column(nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
+    size: Mapped[int] = mapped_column(nullable=False)
+    delta: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    __table_args__ = (UniqueConstraint("module_id", "revision", name="uq_module_revision"),)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ModuleRevision(module_id={self.module_id}, revision={self.revision})>"
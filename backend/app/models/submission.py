@@ -0,0 +1,47 @@
+"""SQLAlchemy model for the community submissions index."""
+
+from datetime import datetime
+
+from sqlalchemy import Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.module import Base
+from app.models.submission_validation import SubmissionValidation
+
+
+class Submission(Base):
+    """
+    Index entry for one record in the submissions inbox.
+
+    The inbox files stay the source of truth for the image and metadata; this
+    table makes them searchable. `status` is "pending" until a maintainer
+    promotes the submission into the library, which sets `module_id`.
+    Validation results live in `submission_validations`.
+    """
+
+    __tablename__ = "submissions"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    record_id: Mapped[str] = mapped_column(String(32), unique=True, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    vendor: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    model: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    serial: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    module_id: Mapped[int | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    promoted_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    # Filled in by the background validation pipeline
+    validation: Mapped[SubmissionValidation | None] = relationship(lazy="selectin")
+
+    __table_args__ = (
+        Index("idx_submission_status_id", "status", "id"),
+        Index("idx_submission_vendor_id", "vendor", "id"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<Submission(id={self.id}, sha256={self.sha256[:16]}..., status={self.status!r})>"
@@ -0,0 +1,35 @@
+"""SQLAlchemy model for submission validation results."""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.module import Base
+
+
+class SubmissionValidation(Base):
+    """
+    Result of the background validation pipeline for one submission.
+
+    `status` is "passed", "warning" (plausibility checks flagged something) or
+    "failed" (the image is unusable, e.g. a bad checksum or missing blob).
+    `checks` holds every individual check result.
+    """
+
+    __tablename__ = "submission_validations"
+
+    submission_id: Mapped[int] = mapped_column(
+        ForeignKey("submissions.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    checks: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    library_module_id: Mapped[int | None] = mapped_column(nullable=True)
+    duplicate_submission_ids: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    validated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<SubmissionValidation(submission_id={self.submission_id}, status={self.status!r})>"
+        )
@@ -1,5 +1,19 @@
 """Data access repositories."""
 
+from app.repositories.change_repository import ChangeLogRepository
+from app.repositories.fields_repository import FieldsRepository
+from app.repositories.integrity_repository import IntegrityRepository
+from app.repositories.job_repository import JobRepository
 from app.repositories.module_repository import ModuleRepository
+from app.repositories.page_repository import PageRepository
+from app.repositories.revision_repository import RevisionRepository
 
-__all__ = ["ModuleRepository"]
+__all__ = [
+    "ChangeLogRepository",
+    "FieldsRepository",
+    "IntegrityRepository",
+    "JobRepository",
+    "ModuleRepository",
+    "PageRepository",
+    "RevisionRepository",
+]
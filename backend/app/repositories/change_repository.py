@@ -0,0 +1,144 @@
+"""Repository for the module library change log."""
+
+from collections.abc import Iterable, Mapping, Sequence
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.module import SFPModule
+from app.models.module_change import ModuleChange
+from app.models.module_revision import ModuleRevision
+
+# Postgres advisory lock key serializing change log writers (arbitrary, app-wide)
+CHANGE_LOG_LOCK_KEY = 0x5F9C_0001
+
+
+class ChangeLogRepository:
+    """Repository for recording and reading library changes."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def record(self, op: str, changes: Iterable[tuple[int, str]]) -> None:
+        """
+        Append change log entries in the caller's transaction.
+
+        Readers page by `seq`, so a sequence number must never become visible
+        after a higher one. SQLite has a single writer anyway; on Postgres the
+        writer holds a transaction-scoped advisory lock from allocating its
+        sequence numbers until it commits, so change log transactions commit in
+        `seq` order and a reader's cursor never skips a late commit.
+
+        Args:
+            op: "insert", "update" or "delete"
+            changes: (module_id, sha256) pairs affected by the operation
+        """
+        rows = [
+            {"op": op, "module_id": module_id, "sha256": sha256}
+            for module_id, sha256 in changes
+        ]
+        if not rows:
+            return
+        if self.session.get_bind().dialect.name == "postgresql":
+            await self.session.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY}
+            )
+        await self.session.execute(insert(ModuleChange), rows)
+
+    async def list_since(
+        self, since: int, limit: int
+    ) -> Sequence[tuple[ModuleChange, SFPModule | None]]:
+        """
+        Get changes with `seq > since` in sequence order.
+
+        Each change is paired with the module's current row, or None if the
+        module has since been deleted.
+        """
+        result = await self.session.execute(
+            select(ModuleChange, SFPModule)
+            .outerjoin(SFPModule, SFPModule.id == ModuleChange.module_id)
+            .where(ModuleChange.seq > since)
+            .order_by(ModuleChange.seq)
+            .limit(limit)
+        )
+        return result.tuples().all()
+
+    async def latest_seq(self) -> int:
+        """Get the newest sequence number (0 if nothing has changed yet)."""
+        result = await self.session.execute(select(func.max(ModuleChange.seq)))
+        return result.scalar_one() or 0
+
+    async def get_module_ids_between(self, after: int, until: int) -> set[int]:
+        """Get the IDs of modules changed with `after < seq <= until`."""
+        result = await self.session.execute(
+            select(ModuleChange.module_id)
+            .where(ModuleChange.seq > after, ModuleChange.seq <= until)
+            .distinct()
+        )
+        return set(result.scalars().all())
+
+    async def module_states(self) -> dict[int, str]:
+        """Map every module ID to the sha256 of its newest image (latest revision or base)."""
+        result = await self.session.execute(select(SFPModule.id, SFPModule.sha256))
+        states = dict(result.tuples().all())
+        result = await self.session.execute(
+            select(ModuleRevision.module_id, ModuleRevision.sha256).order_by(
+                ModuleRevision.module_id, ModuleRevision.revision
+            )
+        )
+        states.update(result.tuples().all())
+        return states
+
+    async def _continue_after(self, seq: int) -> None:
+        """Make the next sequence number larger than `seq`."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            await self.session.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('module_changes', 'seq'), "
+                    "GREATEST(:seq, (SELECT coalesce(max(seq), 0) FROM module_changes), 1))"
+                ),
+                {"seq": seq},
+            )
+        elif dialect == "sqlite":
+            await self.session.execute(
+                text(
+                    "UPDATE sqlite_sequence SET seq = :seq "
+                    "WHERE name = 'module_changes' AND seq < :seq"
+                ),
+                {"seq": seq},
+            )
+            await self.session.execute(
+                text(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT 'module_changes', :seq "
+                    "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'module_changes')"
+                ),
+                {"seq": seq},
+            )
+
+    async def continue_after_restore(self, seq: int, before: Mapping[int, str]) -> int:
+        """
+        Keep the feed consistent after the database was replaced by a backup.
+
+        The restored change log ends wherever the backup did, so clients that
+        already read up to `seq` would skip the next changes. Numbering resumes
+        after `seq`, and the difference between the replaced library (`before`,
+        from `module_states`) and the restored one is recorded as changes.
+
+        Returns:
+            Number of changes recorded
+        """
+        await self._continue_after(seq)
+        after = await self.module_states()
+        deleted = [(module_id, sha) for module_id, sha in before.items() if module_id not in after]
+        inserted = [(module_id, sha) for module_id, sha in after.items() if module_id not in before]
+        updated = [
+            (module_id, sha)
+            for module_id, sha in after.items()
+            if module_id in before and before[module_id] != sha
+        ]
+        await self.record("delete", deleted)
+        await self.record("insert", inserted)
+        await self.record("update", updated)
+        return len(deleted) + len(inserted) + len(updated)
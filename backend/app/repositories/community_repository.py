@@ -0,0 +1,71 @@
+"""Repository for the local community index mirror."""
+
+from collections.abc import Collection, Sequence
+from typing import Any
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.known_hashes import known_hashes
+from app.models.community_module import CommunityIndexState, CommunityModule
+
+# Columns compared when diffing the remote index against the mirror
+MIRRORED_FIELDS = ("name", "vendor", "model", "serial", "size", "blob_url")
+
+
+class CommunityRepository:
+    """Repository for community mirror database operations."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def get_snapshot(self) -> dict[str, tuple[Any, ...]]:
+        """Map every mirrored sha256 to its `MIRRORED_FIELDS` values."""
+        columns = [getattr(CommunityModule, field) for field in MIRRORED_FIELDS]
+        result = await self.session.execute(select(CommunityModule.sha256, *columns))
+        return {row[0]: tuple(row[1:]) for row in result.all()}
+
+    async def insert_many(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Add new mirror entries."""
+        if rows:
+            await self.session.execute(insert(CommunityModule), list(rows))
+            known_hashes.add(row["sha256"] for row in rows)
+
+    async def update_many(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Update mirror entries by sha256."""
+        if rows:
+            await self.session.execute(update(CommunityModule), list(rows))
+
+    async def delete_many(self, sha256s: Collection[str]) -> None:
+        """Remove mirror entries."""
+        if sha256s:
+            await self.session.execute(
+                delete(CommunityModule).where(CommunityModule.sha256.in_(sha256s))
+            )
+            known_hashes.remove_after_commit(self.session, sha256s)
+
+    async def list_page(
+        self, after_sha256: str, limit: int, vendor: str | None = None
+    ) -> Sequence[CommunityModule]:
+        """Get up to `limit` entries after `after_sha256`, in sha256 order."""
+        stmt = select(CommunityModule).where(CommunityModule.sha256 > after_sha256)
+        if vendor:
+            stmt = stmt.where(CommunityModule.vendor == vendor)
+        result = await self.session.execute(stmt.order_by(CommunityModule.sha256).limit(limit))
+        return result.scalars().all()
+
+    async def get_state(self, url: str) -> CommunityIndexState | None:
+        """Get sync bookkeeping for an index URL."""
+        return await self.session.get(CommunityIndexState, url)
+
+    async def save_state(self, url: str, **values: Any) -> CommunityIndexState:
+        """Create or update sync bookkeeping for an index URL."""
+        state = await self.get_state(url)
+        if state is None:
+            state = CommunityIndexState(url=url)
+            self.session.add(state)
+        for key, value in values.items():
+            setattr(state, key, value)
+        await self.session.flush()
+        return state
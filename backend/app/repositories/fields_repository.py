@@ -0,0 +1,65 @@
+"""Repository for decoded module fields."""
+
+from collections.abc import Mapping, Sequence
+
+from sqlalchemy import ColumnElement, Select, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.module import SFPModule
+from app.models.module_fields import ModuleFields
+
+
+class FieldsRepository:
+    """Repository for storing and searching decoded module fields."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def store(self, images: Mapping[int, bytes]) -> None:
+        """
+        Decode and store the searchable fields of module images.
+
+        Args:
+            images: Mapping of module ID to its full EEPROM image
+        """
+        # Imported here: app.services imports the repositories at package level
+        from app.services.sfp_parser import decode_module_fields
+
+        rows = [
+            {"module_id": module_id, **decode_module_fields(image)}
+            for module_id, image in images.items()
+        ]
+        if rows:
+            await self.session.execute(insert(ModuleFields), rows)
+
+    async def delete_for_module(self, module_id: int) -> None:
+        """Delete a module's decoded fields."""
+        await self.session.execute(delete(ModuleFields).where(ModuleFields.module_id == module_id))
+
+    async def get_unindexed_ids(self, after_id: int, limit: int) -> Sequence[int]:
+        """Get IDs of modules without decoded fields, in ID order (for backfills)."""
+        result = await self.session.execute(
+            select(SFPModule.id)
+            .outerjoin(ModuleFields, ModuleFields.module_id == SFPModule.id)
+            .where(SFPModule.id > after_id, ModuleFields.module_id.is_(None))
+            .order_by(SFPModule.id)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    def search_statement(clauses: Sequence[ColumnElement[bool]]) -> Select[tuple[SFPModule]]:
+        """
+        Build the search SELECT.
+
+        Filtering in an `IN (subquery)` keeps the plan an index search on
+        `module_fields` followed by primary key lookups on `sfp_modules`.
+        """
+        matching = select(ModuleFields.module_id).where(*clauses)
+        return select(SFPModule).where(SFPModule.id.in_(matching)).order_by(SFPModule.name)
+
+    async def search(self, clauses: Sequence[ColumnElement[bool]]) -> Sequence[SFPModule]:
+        """Get the modules whose decoded fields match every clause, ordered by name."""
+        result = await self.session.execute(self.search_statement(clauses))
+        return result.scalars().all()
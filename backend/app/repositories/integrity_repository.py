@@ -0,0 +1,53 @@
+"""Repository for integrity scrubber findings."""
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.integrity_finding import IntegrityFinding
+
+
+class IntegrityRepository:
+    """Repository for recording and reading integrity findings."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def record(
+        self, kind: str, detail: str, module_id: int | None = None, sha256: str | None = None
+    ) -> None:
+        """Record a finding, or refresh `last_seen_at` if the same one is already known."""
+        result = await self.session.execute(
+            select(IntegrityFinding).where(
+                IntegrityFinding.kind == kind,
+                IntegrityFinding.module_id == module_id
+                if module_id is not None
+                else IntegrityFinding.module_id.is_(None),
+                IntegrityFinding.detail == detail,
+            )
+        )
+        existing = result.scalars().first()
+        if existing:
+            existing.last_seen_at = datetime.utcnow()
+        else:
+            self.session.add(
+                IntegrityFinding(kind=kind, detail=detail, module_id=module_id, sha256=sha256)
+            )
+        await self.session.flush()
+
+    async def list_recent(self, limit: int) -> Sequence[IntegrityFinding]:
+        """Get the most recently seen findings."""
+        result = await self.session.execute(
+            select(IntegrityFinding)
+            .order_by(IntegrityFinding.last_seen_at.desc(), IntegrityFinding.id.desc())
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def count(self) -> int:
+        """Total number of findings."""
+        result = await self.session.execute(select(func.count()).select_from(IntegrityFinding))
+        return result.scalar_one()
@@ -0,0 +1,53 @@
+"""Repository for background jobs."""
+
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+
+UNFINISHED_STATUSES = ("queued", "running")
+
+
+class JobRepository:
+    """Repository for job database operations."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def create(self, job_type: str, params: dict[str, Any]) -> Job:
+        """Create a queued job."""
+        job = Job(type=job_type, params=params, status="queued")
+        self.session.add(job)
+        await self.session.flush()
+        await self.session.refresh(job)
+        return job
+
+    async def get(self, job_id: int) -> Job | None:
+        """Get job by ID."""
+        return await self.session.get(Job, job_id)
+
+    async def list_recent(self, limit: int, status: str | None = None) -> Sequence[Job]:
+        """Get the newest jobs, optionally only those with a given status."""
+        stmt = select(Job).order_by(Job.id.desc()).limit(limit)
+        if status:
+            stmt = stmt.where(Job.status == status)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def list_unfinished(self) -> Sequence[Job]:
+        """Get queued and running jobs in submission order."""
+        result = await self.session.execute(
+            select(Job).where(Job.status.in_(UNFINISHED_STATUSES)).order_by(Job.id)
+        )
+        return result.scalars().all()
+
+    async def update(self, job_id: int, **values: Any) -> None:
+        """Update job columns (and `updated_at`)."""
+        await self.session.execute(
+            update(Job).where(Job.id == job_id).values(updated_at=datetime.utcnow(), **values)
+        )
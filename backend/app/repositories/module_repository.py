@@ -1,19 +1,49 @@
 """Repository for SFP module data access."""
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Collection, Sequence
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.core.database import insert_ignoring_conflicts
+from app.core.known_hashes import known_hashes
+from app.core.suggest_index import SUGGEST_FIELDS, suggest_index
+from app.models.community_module import CommunityModule
+from app.models.eeprom_page import EEPROMPage, ModulePage
 from app.models.module import SFPModule
+from app.models.module_revision import ModuleRevision
+from app.repositories.change_repository import ChangeLogRepository
+from app.repositories.fields_repository import FieldsRepository
+from app.repositories.page_repository import PageRepository
+from app.repositories.revision_repository import RevisionRepository
+
+
+def _suggest_values(module: SFPModule) -> dict[str, object]:
+    return {field: getattr(module, field) for field in SUGGEST_FIELDS}
 
 
 class ModuleRepository:
     """Repository for SFP module database operations."""
 
-    def __init__(self, session: AsyncSession):
-        """Initialize repository with database session."""
+    def __init__(self, session: AsyncSession, page_dedup: bool | None = None):
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: Database session
+            page_dedup: Store new images as shared pages instead of inline BLOBs
+                (defaults to the `eeprom_page_dedup` setting)
+        """
         self.session = session
+        self.changes = ChangeLogRepository(session)
+        self.revisions = RevisionRepository(session)
+        self.pages = PageRepository(session)
+        self.fields = FieldsRepository(session)
+        self.page_dedup = (
+            get_settings().eeprom_page_dedup if page_dedup is None else page_dedup
+        )
 
     async def get_all(self) -> Sequence[SFPModule]:
         """Get all modules ordered by name."""
@@ -31,17 +61,269 @@ class ModuleRepository:
         )
         return result.scalar_one_or_none()
 
+    async def load_known_hashes(self, capacity: int, error_rate: float) -> None:
+        """(Re)build the process-wide known-hashes filter from the library and the mirror."""
+        community = await self.session.execute(select(CommunityModule.sha256))
+        sha256s = [
+            *await self.get_all_sha256s(),
+            *await self.revisions.get_all_sha256s(),
+            *community.scalars(),
+        ]
+        known_hashes.build(sha256s, capacity, error_rate)
+
+    async def load_suggest_index(self) -> None:
+        """(Re)build the autocomplete index from the library and the community mirror."""
+        counts: dict[str, list[tuple[object, int]]] = {}
+        for field in SUGGEST_FIELDS:
+            counts[field] = []
+            for model in (SFPModule, CommunityModule):
+                column = getattr(model, field)
+                result = await self.session.execute(
+                    select(column, func.count()).where(column.is_not(None)).group_by(column)
+                )
+                counts[field].extend(result.tuples().all())
+        suggest_index.build(counts)
+
+    async def get_existing_sha256s(self, sha256s: Collection[str]) -> dict[str, int]:
+        """
+        Map the checksums that are already stored to their module IDs.
+
+        Checksums of later revisions map to the module they belong to.
+        """
+        if not sha256s:
+            return {}
+        result = await self.session.execute(
+            select(SFPModule.sha256, SFPModule.id).where(SFPModule.sha256.in_(sha256s))
+        )
+        existing = dict(result.tuples().all())
+        remaining = set(sha256s) - existing.keys()
+        if remaining:
+            existing.update(await self.revisions.get_existing_sha256s(remaining))
+        return existing
+
+    async def get_by_identity(self, vendor: str, serial: str) -> SFPModule | None:
+        """Get the first module saved for a physical module (vendor and serial)."""
+        result = await self.session.execute(
+            select(SFPModule)
+            .where(SFPModule.vendor == vendor, SFPModule.serial == serial)
+            .order_by(SFPModule.id)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_identities(
+        self, identities: Collection[tuple[str, str]]
+    ) -> dict[tuple[str, str], SFPModule]:
+        """Map (vendor, serial) pairs to the first module saved for each."""
+        if not identities:
+            return {}
+        result = await self.session.execute(
+            select(SFPModule)
+            .where(
+                SFPModule.vendor.in_({vendor for vendor, _ in identities}),
+                SFPModule.serial.in_({serial for _, serial in identities}),
+            )
+            .order_by(SFPModule.id)
+        )
+        found: dict[tuple[str, str], SFPModule] = {}
+        for module in result.scalars():
+            identity = (module.vendor, module.serial)
+            if identity in identities:
+                found.setdefault(identity, module)
+        return found
+
+    async def lock(self, module_id: int) -> None:
+        """Lock a module row until the transaction ends (a no-op on SQLite, which has none)."""
+        await self.session.execute(
+            select(SFPModule.id).where(SFPModule.id == module_id).with_for_update()
+        )
+
+    async def get_many_by_ids(self, module_ids: Collection[int]) -> Sequence[SFPModule]:
+        """Get the modules with any of the given IDs, in ID order."""
+        if not module_ids:
+            return []
+        result = await self.session.execute(
+            select(SFPModule).where(SFPModule.id.in_(module_ids)).order_by(SFPModule.id)
+        )
+        return result.scalars().all()
+
+    async def get_batch_after(self, module_id: int, limit: int) -> Sequence[SFPModule]:
+        """Get up to `limit` modules with IDs above `module_id`, in ID order."""
+        result = await self.session.execute(
+            select(SFPModule).where(SFPModule.id > module_id).order_by(SFPModule.id).limit(limit)
+        )
+        return result.scalars().all()
+
+    async def get_summaries_after(self, module_id: int, limit: int) -> Sequence[Any]:
+        """
+        Get (id, sha256, name, vendor, model, serial, size) rows without reading images.
+
+        Returns up to `limit` rows with IDs above `module_id`, in ID order. The
+        size of a paged image is the sum of its page sizes.
+        """
+        paged_size = (
+            select(func.sum(EEPROMPage.size))
+            .join(ModulePage, ModulePage.page_sha256 == EEPROMPage.sha256)
+            .where(ModulePage.module_id == SFPModule.id)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            select(
+                SFPModule.id,
+                SFPModule.sha256,
+                SFPModule.name,
+                SFPModule.vendor,
+                SFPModule.model,
+                SFPModule.serial,
+                func.coalesce(
+                    func.nullif(func.length(SFPModule.eeprom_data), 0), paged_size, 0
+                ).label("size"),
+            )
+            .where(SFPModule.id > module_id)
+            .order_by(SFPModule.id)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_all_sha256s(self) -> Sequence[str]:
+        """Get every stored checksum in sorted order (served from the sha256 index)."""
+        result = await self.session.execute(select(SFPModule.sha256).order_by(SFPModule.sha256))
+        return result.scalars().all()
+
+    async def get_sha256s_with_prefix(self, prefix: str) -> Sequence[str]:
+        """Get sorted checksums starting with a lowercase hex prefix."""
+        # A range instead of LIKE keeps the lookup on the sha256 index
+        result = await self.session.execute(
+            select(SFPModule.sha256)
+            .where(SFPModule.sha256 >= prefix, SFPModule.sha256 < prefix + "g")
+            .order_by(SFPModule.sha256)
+        )
+        return result.scalars().all()
+
+    async def get_many_by_sha256(self, sha256s: Collection[str]) -> Sequence[SFPModule]:
+        """Get the modules matching any of the given checksums."""
+        if not sha256s:
+            return []
+        result = await self.session.execute(
+            select(SFPModule).where(SFPModule.sha256.in_(sha256s)).order_by(SFPModule.sha256)
+        )
+        return result.scalars().all()
+
+    async def get_eeprom(self, module: SFPModule) -> bytes:
+        """
+        Get a module's full EEPROM image.
+
+        Always read images through here: modules saved with page dedup keep an
+        empty `eeprom_data` and are reassembled from their pages.
+        """
+        if module.eeprom_data:
+            return module.eeprom_data
+        return (await self.pages.load([module.id])).get(module.id, b"")
+
+    async def get_eeprom_many(self, modules: Sequence[SFPModule]) -> dict[int, bytes]:
+        """Get the full EEPROM images of several modules, keyed by module ID."""
+        images = {module.id: module.eeprom_data for module in modules if module.eeprom_data}
+        paged = [module.id for module in modules if not module.eeprom_data]
+        images.update(await self.pages.load(paged))
+        return images
+
+    async def get_images_by_ids(self, module_ids: Collection[int]) -> list[tuple[int, str, bytes]]:
+        """
+        Get (id, sha256, image) for the given modules in one query, in ID order.
+
+        Only paged images (see `get_eeprom`) need a second query.
+        """
+        if not module_ids:
+            return []
+        result = await self.session.execute(
+            select(SFPModule.id, SFPModule.sha256, SFPModule.eeprom_data)
+            .where(SFPModule.id.in_(module_ids))
+            .order_by(SFPModule.id)
+        )
+        rows = result.all()
+        paged = await self.pages.load([module_id for module_id, _, data in rows if not data])
+        return [
+            (module_id, sha256, data or paged.get(module_id, b""))
+            for module_id, sha256, data in rows
+        ]
+
+    async def iter_inline_images(self, batch_size: int) -> AsyncIterator[Sequence[bytes]]:
+        """Yield batches of the images stored inline (not as pages)."""
+        result = await self.session.stream_scalars(
+            select(SFPModule.eeprom_data)
+            .where(func.length(SFPModule.eeprom_data) > 0)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
     async def create(self, module: SFPModule) -> SFPModule:
         """Create a new module."""
+        image = module.eeprom_data
+        if self.page_dedup:
+            module.eeprom_data = b""
         self.session.add(module)
         await self.session.flush()
         await self.session.refresh(module)
+        if self.page_dedup:
+            await self.pages.store({module.id: image})
+        await self.fields.store({module.id: image})
+        await self.changes.record("insert", [(module.id, module.sha256)])
+        known_hashes.add([module.sha256])
+        suggest_index.apply_after_commit(self.session, added=[_suggest_values(module)])
         return module
 
+    async def create_revision(self, revision: ModuleRevision) -> ModuleRevision:
+        """Create a new revision of an existing module."""
+        await self.revisions.create(revision)
+        await self.changes.record("update", [(revision.module_id, revision.sha256)])
+        known_hashes.add([revision.sha256])
+        return revision
+
+    async def create_many(self, rows: Sequence[dict[str, Any]]) -> dict[str, int]:
+        """
+        Insert several modules in one statement, skipping checksums already stored.
+
+        Uses a dialect-neutral `ON CONFLICT (sha256) DO NOTHING`, so concurrent
+        writers racing on the same image never fail the batch.
+
+        Returns:
+            Mapping of sha256 to new module ID for the rows actually inserted
+        """
+        if not rows:
+            return {}
+        images = {row["sha256"]: row["eeprom_data"] for row in rows}
+        if self.page_dedup:
+            rows = [{**row, "eeprom_data": b""} for row in rows]
+
+        stmt = insert_ignoring_conflicts(
+            self.session.get_bind().dialect.name, SFPModule, ["sha256"]
+        ).returning(SFPModule.sha256, SFPModule.id)
+        result = await self.session.execute(stmt, list(rows))
+        inserted = dict(result.tuples().all())
+        inserted_images = {module_id: images[sha256] for sha256, module_id in inserted.items()}
+        if self.page_dedup:
+            await self.pages.store(inserted_images)
+        await self.fields.store(inserted_images)
+        await self.changes.record(
+            "insert", [(module_id, sha256) for sha256, module_id in inserted.items()]
+        )
+        known_hashes.add(inserted)
+        suggest_index.apply_after_commit(
+            self.session, added=[row for row in rows if row["sha256"] in inserted]
+        )
+        return inserted
+
     async def delete(self, module_id: int) -> bool:
         """Delete module by ID. Returns True if deleted, False if not found."""
         module = await self.get_by_id(module_id)
         if module:
+            revision_sha256s = await self.revisions.delete_for_module(module_id)
+            await self.pages.delete_for_module(module_id)
+            await self.fields.delete_for_module(module_id)
+            await self.changes.record("delete", [(module.id, module.sha256)])
+            known_hashes.remove_after_commit(self.session, [module.sha256, *revision_sha256s])
+            suggest_index.apply_after_commit(self.session, removed=[_suggest_values(module)])
             await self.session.delete(module)
             await self.session.flush()
             return True
@@ -0,0 +1,93 @@
+"""Repository for page-level EEPROM storage."""
+
+import hashlib
+from collections.abc import AsyncIterator, Collection, Mapping
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import insert_ignoring_conflicts
+from app.models.eeprom_page import EEPROMPage, ModulePage
+
+# SFF-8472 pages: A0h (serial ID) and A2h (diagnostics) are 256 bytes each
+PAGE_SIZE = 256
+
+
+def split_pages(image: bytes) -> list[bytes]:
+    """Split an EEPROM image into PAGE_SIZE pages (the last one may be shorter)."""
+    return [image[offset : offset + PAGE_SIZE] for offset in range(0, len(image), PAGE_SIZE)]
+
+
+class PageRepository:
+    """Repository for storing images as shared, content-addressed pages."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def store(self, images: Mapping[int, bytes]) -> None:
+        """
+        Store module images as pages, writing each distinct page only once.
+
+        Args:
+            images: Mapping of module ID to its full EEPROM image
+        """
+        pages: dict[str, bytes] = {}
+        mappings = []
+        for module_id, image in images.items():
+            for index, page in enumerate(split_pages(image)):
+                sha256 = hashlib.sha256(page).hexdigest()
+                pages[sha256] = page
+                mappings.append(
+                    {"module_id": module_id, "page_index": index, "page_sha256": sha256}
+                )
+        if not mappings:
+            return
+
+        stmt = insert_ignoring_conflicts(
+            self.session.get_bind().dialect.name, EEPROMPage, ["sha256"]
+        )
+        await self.session.execute(
+            stmt,
+            [{"sha256": sha256, "size": len(page), "data": page} for sha256, page in pages.items()],
+        )
+        await self.session.execute(insert(ModulePage), mappings)
+
+    async def load(self, module_ids: Collection[int]) -> dict[int, bytes]:
+        """Reassemble the images of the given modules from their pages."""
+        if not module_ids:
+            return {}
+        result = await self.session.execute(
+            select(ModulePage.module_id, EEPROMPage.data)
+            .join(EEPROMPage, EEPROMPage.sha256 == ModulePage.page_sha256)
+            .where(ModulePage.module_id.in_(module_ids))
+            .order_by(ModulePage.module_id, ModulePage.page_index)
+        )
+        images: dict[int, bytearray] = {}
+        for module_id, data in result.all():
+            images.setdefault(module_id, bytearray()).extend(data)
+        return {module_id: bytes(image) for module_id, image in images.items()}
+
+    async def delete_for_module(self, module_id: int) -> None:
+        """Delete a module's page mappings and any pages no other module uses."""
+        result = await self.session.execute(
+            delete(ModulePage)
+            .where(ModulePage.module_id == module_id)
+            .returning(ModulePage.page_sha256)
+        )
+        sha256s = set(result.scalars().all())
+        if sha256s:
+            still_used = exists().where(ModulePage.page_sha256 == EEPROMPage.sha256)
+            await self.session.execute(
+                delete(EEPROMPage).where(EEPROMPage.sha256.in_(sha256s), ~still_used)
+            )
+
+    async def iter_page_refs(self) -> AsyncIterator[tuple[int, str, int]]:
+        """Yield (module ID, page sha256, page size) for every stored page reference."""
+        result = await self.session.stream(
+            select(ModulePage.module_id, ModulePage.page_sha256, EEPROMPage.size)
+            .join(EEPROMPage, EEPROMPage.sha256 == ModulePage.page_sha256)
+            .execution_options(yield_per=1000)
+        )
+        async for module_id, sha256, size in result:
+            yield module_id, sha256, size
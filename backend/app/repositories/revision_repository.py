@@ -0,0 +1,112 @@
+"""Repository for delta-encoded module revisions."""
+
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.module_revision import ModuleRevision
+
+
+class RevisionRepository:
+    """Repository for module revision database operations."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def list_for_module(self, module_id: int) -> Sequence[ModuleRevision]:
+        """Get all revisions of a module in revision order."""
+        result = await self.session.execute(
+            select(ModuleRevision)
+            .where(ModuleRevision.module_id == module_id)
+            .order_by(ModuleRevision.revision)
+        )
+        return result.scalars().all()
+
+    async def list_for_modules(self, module_ids: Collection[int]) -> Sequence[ModuleRevision]:
+        """Get the revisions of several modules."""
+        if not module_ids:
+            return []
+        result = await self.session.execute(
+            select(ModuleRevision)
+            .where(ModuleRevision.module_id.in_(module_ids))
+            .order_by(ModuleRevision.module_id, ModuleRevision.revision)
+        )
+        return result.scalars().all()
+
+    async def get(self, module_id: int, revision: int) -> ModuleRevision | None:
+        """Get one revision of a module."""
+        result = await self.session.execute(
+            select(ModuleRevision).where(
+                ModuleRevision.module_id == module_id, ModuleRevision.revision == revision
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_sha256(self, sha256: str) -> ModuleRevision | None:
+        """Get the revision with a given checksum."""
+        result = await self.session.execute(
+            select(ModuleRevision).where(ModuleRevision.sha256 == sha256)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_existing_sha256s(self, sha256s: Collection[str]) -> dict[str, int]:
+        """Map revision checksums that are already stored to their module IDs."""
+        if not sha256s:
+            return {}
+        result = await self.session.execute(
+            select(ModuleRevision.sha256, ModuleRevision.module_id).where(
+                ModuleRevision.sha256.in_(sha256s)
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def get_all_sha256s(self) -> Sequence[str]:
+        """Get every revision checksum in sorted order."""
+        result = await self.session.execute(
+            select(ModuleRevision.sha256).order_by(ModuleRevision.sha256)
+        )
+        return result.scalars().all()
+
+    async def get_sha256s_with_prefix(self, prefix: str) -> Sequence[str]:
+        """Get sorted revision checksums starting with a lowercase hex prefix."""
+        result = await self.session.execute(
+            select(ModuleRevision.sha256)
+            .where(ModuleRevision.sha256 >= prefix, ModuleRevision.sha256 < prefix + "g")
+            .order_by(ModuleRevision.sha256)
+        )
+        return result.scalars().all()
+
+    async def get_many_by_sha256(self, sha256s: Collection[str]) -> Sequence[ModuleRevision]:
+        """Get the revisions matching any of the given checksums, oldest first per module."""
+        if not sha256s:
+            return []
+        result = await self.session.execute(
+            select(ModuleRevision)
+            .where(ModuleRevision.sha256.in_(sha256s))
+            .order_by(ModuleRevision.module_id, ModuleRevision.revision)
+        )
+        return result.scalars().all()
+
+    async def next_revision_number(self, module_id: int) -> int:
+        """Number for the next revision (the base module itself is revision 1)."""
+        result = await self.session.execute(
+            select(func.max(ModuleRevision.revision)).where(ModuleRevision.module_id == module_id)
+        )
+        return (result.scalar_one() or 1) + 1
+
+    async def create(self, revision: ModuleRevision) -> ModuleRevision:
+        """Create a new revision."""
+        self.session.add(revision)
+        await self.session.flush()
+        return revision
+
+    async def delete_for_module(self, module_id: int) -> list[str]:
+        """Delete all revisions of a module. Returns their checksums."""
+        result = await self.session.execute(
+            delete(ModuleRevision)
+            .where(ModuleRevision.module_id == module_id)
+            .returning(ModuleRevision.sha256)
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,113 @@
+"""Repository for the community submissions index."""
+
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import insert_ignoring_conflicts
+from app.models.submission import Submission
+from app.models.submission_validation import SubmissionValidation
+
+_COLUMNS = ("record_id", "sha256", "name", "vendor", "model", "serial", "notes")
+
+
+class SubmissionRepository:
+    """Repository for submission index database operations."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def add_many(self, records: Sequence[dict[str, Any]]) -> list[int]:
+        """
+        Index inbox records, skipping any already indexed.
+
+        Returns:
+            IDs of the new index rows
+        """
+        rows = []
+        for record in records:
+            row = {column: record.get(column) for column in _COLUMNS}
+            row["name"] = row["name"] or record["sha256"][:16]
+            if record.get("created_at"):
+                row["created_at"] = datetime.fromisoformat(record["created_at"].rstrip("Z"))
+            rows.append(row)
+        if not rows:
+            return []
+
+        stmt = insert_ignoring_conflicts(
+            self.session.get_bind().dialect.name, Submission, ["record_id"]
+        ).returning(Submission.id)
+        result = await self.session.execute(stmt, rows)
+        return list(result.scalars().all())
+
+    async def get_indexed_record_ids(self) -> set[str]:
+        """Record ids already in the index."""
+        result = await self.session.execute(select(Submission.record_id))
+        return set(result.scalars().all())
+
+    async def list_page(
+        self,
+        after_id: int,
+        limit: int,
+        status: str | None = None,
+        vendor: str | None = None,
+        sha256: str | None = None,
+    ) -> Sequence[Submission]:
+        """Get up to `limit` submissions with id greater than `after_id`, oldest first."""
+        stmt = select(Submission).where(Submission.id > after_id)
+        if status:
+            stmt = stmt.where(Submission.status == status)
+        if vendor:
+            stmt = stmt.where(Submission.vendor == vendor)
+        if sha256:
+            stmt = stmt.where(Submission.sha256 == sha256)
+        result = await self.session.execute(stmt.order_by(Submission.id).limit(limit))
+        return result.scalars().all()
+
+    async def get(self, submission_id: int) -> Submission | None:
+        """Get submission by ID."""
+        return await self.session.get(Submission, submission_id)
+
+    async def get_ids_by_sha256(self, sha256: str) -> list[int]:
+        """IDs of every submission of an image."""
+        result = await self.session.execute(
+            select(Submission.id).where(Submission.sha256 == sha256).order_by(Submission.id)
+        )
+        return list(result.scalars().all())
+
+    async def get_unvalidated_ids(self) -> list[int]:
+        """IDs of submissions the validation pipeline hasn't processed yet."""
+        result = await self.session.execute(
+            select(Submission.id)
+            .outerjoin(SubmissionValidation)
+            .where(SubmissionValidation.submission_id.is_(None))
+            .order_by(Submission.id)
+        )
+        return list(result.scalars().all())
+
+    async def save_validation(self, validation: SubmissionValidation) -> None:
+        """Store (or replace) a submission's validation result."""
+        await self.session.merge(validation)
+        await self.session.flush()
+
+    async def get_many(self, submission_ids: Sequence[int]) -> Sequence[Submission]:
+        """Get submissions by ID (unknown IDs are skipped)."""
+        result = await self.session.execute(
+            select(Submission).where(Submission.id.in_(submission_ids))
+        )
+        return result.scalars().all()
+
+    async def mark_promoted(self, promoted: dict[int, int]) -> None:
+        """Mark submissions as promoted, given a submission ID to module ID mapping."""
+        if not promoted:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {"id": sid, "status": "promoted", "module_id": module_id, "promoted_at": now}
+            for sid, module_id in promoted.items()
+        ]
+        await self.session.execute(update(Submission), rows)
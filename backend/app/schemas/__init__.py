@@ -1,14 +1,29 @@
 """Pydantic schemas for API contracts."""
 
-from app.schemas.module import ModuleCreate, ModuleEEPROM, ModuleInfo, StatusMessage
+from app.schemas.module import (
+    EEPROMBatchRequest,
+    ModuleChangeInfo,
+    ModuleChangePage,
+    ModuleCreate,
+    ModuleEEPROM,
+    ModuleInfo,
+    ModuleRevisionInfo,
+    StatusMessage,
+    StorageReport,
+)
 from app.schemas.submission import SubmissionCreate, SubmissionResponse
 
 __all__ = [
     # Module schemas
+    "EEPROMBatchRequest",
+    "ModuleChangeInfo",
+    "ModuleChangePage",
     "ModuleCreate",
     "ModuleInfo",
     "ModuleEEPROM",
+    "ModuleRevisionInfo",
     "StatusMessage",
+    "StorageReport",
     # Submission schemas
     "SubmissionCreate",
     "SubmissionResponse",
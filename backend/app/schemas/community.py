@@ -0,0 +1,54 @@
+"""Pydantic schemas for the community index mirror."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CommunityModuleInfo(BaseModel):
+    """One mirrored community index entry."""
+
+    sha256: str
+    name: str
+    vendor: str | None
+    model: str | None
+    serial: str | None
+    size: int | None
+    blob_url: str
+    in_library: bool = Field(False, description="Whether the local library already has it")
+    first_seen_at: datetime
+    updated_at: datetime
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
+
+
+class CommunityModulePage(BaseModel):
+    """A page of mirrored community modules."""
+
+    modules: list[CommunityModuleInfo]
+    next_after: str = Field(..., description="Pass as `after` to fetch the following page")
+    has_more: bool
+
+
+class CommunitySyncStatus(BaseModel):
+    """State of the community mirror."""
+
+    enabled: bool
+    index_url: str
+    module_count: int = 0
+    checked_at: datetime | None = None
+    changed_at: datetime | None = Field(None, description="Last sync that changed the mirror")
+    last_error: str | None = None
+
+
+class CommunitySyncResultInfo(BaseModel):
+    """Outcome of a manual sync."""
+
+    status: str = Field(..., description='"not_modified", "unchanged" or "updated"')
+    added: int
+    changed: int
+    removed: int
+    total: int
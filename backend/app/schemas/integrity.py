@@ -0,0 +1,44 @@
+"""Pydantic schemas for the integrity scrubber."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ScrubStatus(BaseModel):
+    """Progress of the current or last scrub pass."""
+
+    running: bool
+    passes_completed: int
+    pass_started_at: datetime | None
+    last_pass_completed_at: datetime | None
+    cursor: int = Field(..., description="Last module ID checked in the current pass")
+    modules_checked: int
+    bytes_checked: int
+    tables_checked: int
+    findings: int = Field(..., description="Problems found in the current pass")
+
+
+class IntegrityFindingInfo(BaseModel):
+    """A recorded integrity problem."""
+
+    id: int
+    kind: str
+    module_id: int | None
+    sha256: str | None
+    detail: str
+    found_at: datetime
+    last_seen_at: datetime
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
+
+
+class IntegrityReport(BaseModel):
+    """Scrubber progress and recent findings."""
+
+    status: ScrubStatus
+    total_findings: int
+    findings: list[IntegrityFindingInfo]
@@ -0,0 +1,36 @@
+"""Pydantic schemas for background jobs."""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    """Request to start a background job."""
+
+    type: str = Field(..., description="Registered job type")
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobInfo(BaseModel):
+    """Schema for job state and progress."""
+
+    id: int
+    type: str
+    status: str
+    params: dict[str, Any]
+    result: dict[str, Any] | None
+    progress_current: int
+    progress_total: int | None
+    message: str | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    updated_at: datetime
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
@@ -35,9 +35,110 @@ class ModuleEEPROM(BaseModel):
     eeprom_data: bytes
 
 
+class EEPROMBatchRequest(BaseModel):
+    """Request for the EEPROM images of several modules."""
+
+    ids: list[int] = Field(..., min_length=1, description="Module IDs to fetch")
+
+
+class ModuleImportEntry(BaseModel):
+    """One module to import from a blob URL."""
+
+    name: str = Field(..., description="A friendly name for the module")
+    blob_url: str = Field(..., description="URL of the raw EEPROM image")
+    expected_sha256: str | None = Field(
+        None,
+        pattern=r"^[0-9a-fA-F]{64}$",
+        description=(
+            "Checksum the download must match; known checksums skip the download. "
+            "Without it the import is reported as unverified"
+        ),
+    )
+
+
+class ModuleImportRequest(BaseModel):
+    """Request to import several modules from blob URLs."""
+
+    entries: list[ModuleImportEntry] = Field(..., min_length=1)
+
+
+class ModuleImportResult(BaseModel):
+    """Outcome of importing one entry."""
+
+    blob_url: str
+    status: str = Field(..., description='"imported", "duplicate" or "failed"')
+    id: int | None = None
+    sha256: str | None = None
+    error: str | None = None
+    verified: bool = Field(False, description="Whether the image matched `expected_sha256`")
+
+
+class ModuleSuggestion(BaseModel):
+    """Autocomplete candidate for the library search box."""
+
+    field: str = Field(..., description='"vendor", "model" or "name"')
+    value: str
+    count: int = Field(..., description="Library and community modules using this value")
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
+
+
 class StatusMessage(BaseModel):
     """Generic status message response."""
 
     status: str
     message: str
     id: int | None = None
+    # Saving an image: the revision of module `id` it is stored as (1 = the module's own image)
+    revision: int | None = None
+
+
+class ModuleRevisionInfo(BaseModel):
+    """Schema for a stored revision of a module (without image data)."""
+
+    revision: int
+    name: str
+    sha256: str
+    size: int
+    delta_size: int = Field(..., description="Bytes stored for this revision")
+    created_at: datetime
+
+
+class StorageReport(BaseModel):
+    """Space used by whole-image dedup compared with page-level dedup."""
+
+    page_dedup_enabled: bool = Field(..., description="Whether new images are stored as pages")
+    images: int
+    image_bytes: int = Field(..., description="Bytes stored with whole-image sha256 dedup")
+    page_refs: int
+    unique_pages: int
+    page_bytes: int = Field(..., description="Bytes of distinct pages stored with page-level dedup")
+    page_overhead_bytes: int = Field(
+        ..., description="Estimated bytes of page reference rows, page keys and their indexes"
+    )
+    saved_bytes: int = Field(..., description="Net savings of page-level dedup (may be negative)")
+    saved_ratio: float
+
+
+class ModuleChangeInfo(BaseModel):
+    """One entry of the library change feed."""
+
+    seq: int
+    op: str
+    module_id: int
+    sha256: str
+    changed_at: datetime
+    module: ModuleInfo | None = Field(
+        None, description="Current module metadata (absent once the module is deleted)"
+    )
+
+
+class ModuleChangePage(BaseModel):
+    """A page of library changes."""
+
+    changes: list[ModuleChangeInfo]
+    next_since: int = Field(..., description="Pass as `since` to fetch the following page")
+    has_more: bool
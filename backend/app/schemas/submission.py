@@ -1,6 +1,8 @@
 """Pydantic schemas for community submissions."""
 
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, Field
 
 
 class SubmissionCreate(BaseModel):
@@ -21,3 +23,83 @@ class SubmissionResponse(BaseModel):
     message: str
     inbox_id: str
     sha256: str
+
+
+class SubmissionCheck(BaseModel):
+    """One validation check result."""
+
+    check: str
+    status: str = Field(..., description='"pass", "warn" or "fail"')
+    detail: str
+
+
+class SubmissionValidationInfo(BaseModel):
+    """Background validation result of a submission."""
+
+    status: str = Field(..., description='"passed", "warning" or "failed"')
+    checks: list[SubmissionCheck]
+    library_module_id: int | None = Field(
+        None, description="Library module with the same image, if any"
+    )
+    duplicate_submission_ids: list[int] = Field(
+        ..., description="Other submissions of the same image"
+    )
+    validated_at: datetime
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
+
+
+class SubmissionInfo(BaseModel):
+    """Schema for an indexed submission."""
+
+    id: int
+    record_id: str = Field(..., description="Inbox id returned when the submission was made")
+    sha256: str
+    name: str
+    vendor: str | None
+    model: str | None
+    serial: str | None
+    notes: str | None
+    status: str = Field(..., description='"pending" or "promoted"')
+    module_id: int | None = Field(None, description="Library module once promoted")
+    created_at: datetime
+    promoted_at: datetime | None
+    validation: SubmissionValidationInfo | None = Field(
+        None, description="Absent until background validation has run"
+    )
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
+
+
+class SubmissionPage(BaseModel):
+    """A page of indexed submissions."""
+
+    submissions: list[SubmissionInfo]
+    next_after_id: int = Field(..., description="Pass as `after_id` to fetch the following page")
+    has_more: bool
+
+
+class SubmissionPromoteRequest(BaseModel):
+    """Request to promote submissions into the module library."""
+
+    ids: list[int] = Field(..., min_length=1, description="Submission IDs")
+
+
+class SubmissionPromoteResult(BaseModel):
+    """Outcome of promoting one submission."""
+
+    submission_id: int
+    status: str = Field(
+        ...,
+        description=(
+            '"promoted", "duplicate" (image already in the library), "already_promoted", '
+            '"not_found" or "missing_blob"'
+        ),
+    )
+    module_id: int | None = None
@@ -0,0 +1,42 @@
+"""Pydantic schemas for library replication between instances."""
+
+from pydantic import BaseModel, Field
+
+
+class BucketSummary(BaseModel):
+    """Merkle-style summary of a library's sha256 set."""
+
+    prefix_length: int = Field(..., description="Hex digits of sha256 used as bucket key")
+    root: str = Field(..., description="Digest over all bucket digests")
+    count: int = Field(..., description="Number of images summarized, revisions included")
+    buckets: dict[str, str] = Field(..., description="Bucket prefix -> digest (non-empty only)")
+
+
+class BucketContents(BaseModel):
+    """All checksums in one bucket."""
+
+    prefix: str
+    sha256s: list[str]
+
+
+class BlobRequest(BaseModel):
+    """Request for module blobs by checksum."""
+
+    sha256s: list[str] = Field(..., max_length=5000)
+
+
+class PullRequest(BaseModel):
+    """Request to pull missing modules from another instance."""
+
+    remote_url: str = Field(..., description="Base URL of the remote API, e.g. http://host/api/v1")
+
+
+class PullResult(BaseModel):
+    """Outcome of a pull from another instance."""
+
+    status: str
+    buckets_compared: int
+    buckets_differing: int
+    missing: int
+    inserted: int
+    bytes_transferred: int
@@ -0,0 +1,193 @@
+"""
+Incremental library backups.
+
+An increment records the modules that were added, changed or removed since a
+full backup, using the library change log (`module_changes.seq`) to find them:
+
+    {"format": "sfp-library-increment", "version": 1, "base": "<full backup>",
+     "base_seq": 120, "seq": 134, "created_at": "..."}
+    {"op": "upsert", "module": {...}, "revisions": [...]}
+    {"op": "delete", "id": 17}
+
+one JSON object per line (gzip-compressed on disk), images and revision
+deltas base64-encoded. An upserted module carries its complete current state,
+so applying an increment is idempotent: each listed module is removed and
+written again.
+"""
+
+import base64
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.module import SFPModule
+from app.models.module_revision import ModuleRevision
+from app.repositories.module_repository import ModuleRepository
+
+FORMAT = "sfp-library-increment"
+VERSION = 1
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+async def latest_seq(session: AsyncSession) -> int:
+    """Newest library change sequence number."""
+    return await ModuleRepository(session).changes.latest_seq()
+
+
+async def module_count(session: AsyncSession) -> int:
+    """Number of modules in the library."""
+    result = await session.execute(select(func.count()).select_from(SFPModule))
+    return result.scalar_one()
+
+
+async def capture_increment(
+    session: AsyncSession, base_seq: int
+) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Collect the library changes after `base_seq`, read in one transaction.
+
+    Returns:
+        (newest sequence number covered, increment records)
+    """
+    repository = ModuleRepository(session)
+    seq = await repository.changes.latest_seq()
+    changed_ids = await repository.changes.get_module_ids_between(base_seq, seq)
+
+    modules = await repository.get_many_by_ids(changed_ids)
+    images = await repository.get_eeprom_many(modules)
+    revisions: dict[int, list[ModuleRevision]] = {}
+    for revision in await repository.revisions.list_for_modules([m.id for m in modules]):
+        revisions.setdefault(revision.module_id, []).append(revision)
+
+    # Deletes first, so an image removed and added again under a new ID never
+    # exists twice while the increment is applied
+    present = {module.id for module in modules}
+    records: list[dict[str, Any]] = [
+        {"op": "delete", "id": module_id} for module_id in sorted(changed_ids - present)
+    ]
+    for module in modules:
+        records.append(
+            {
+                "op": "upsert",
+                "module": {
+                    "id": module.id,
+                    "name": module.name,
+                    "vendor": module.vendor,
+                    "model": module.model,
+                    "serial": module.serial,
+                    "sha256": module.sha256,
+                    "created_at": module.created_at.isoformat(),
+                    "eeprom": _b64(images.get(module.id, b"")),
+                },
+                "revisions": [
+                    {
+                        "revision": revision.revision,
+                        "name": revision.name,
+                        "sha256": revision.sha256,
+                        "size": revision.size,
+                        "delta": _b64(revision.delta),
+                        "created_at": revision.created_at.isoformat(),
+                    }
+                    for revision in revisions.get(module.id, [])
+                ],
+            }
+        )
+    return seq, records
+
+
+def encode_increment(header: dict[str, Any], records: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """Serialize an increment as NDJSON lines."""
+    yield json.dumps({"format": FORMAT, "version": VERSION, **header}).encode() + b"\n"
+    for record in records:
+        yield json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+def decode_increment(lines: Iterable[bytes]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Parse an increment.
+
+    Raises:
+        ValueError: If the data isn't an increment this version understands
+    """
+    iterator = iter(lines)
+    try:
+        header = json.loads(next(iterator))
+    except StopIteration:
+        raise ValueError("Empty increment") from None
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("Not a library increment")
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported increment version {header.get('version')}")
+
+    records = []
+    for line in iterator:
+        if line.strip():
+            record = json.loads(line)
+            if not isinstance(record, dict) or record.get("op") not in ("upsert", "delete"):
+                raise ValueError("Malformed increment record")
+            records.append(record)
+    return header, records
+
+
+def read_increment(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read an increment file, gzip-compressed or not (blocking)."""
+    with gzip.open(path, "rb") if path.suffix == ".gz" else path.open("rb") as f:
+        return decode_increment(f)
+
+
+async def apply_increment(session: AsyncSession, records: Iterable[dict[str, Any]]) -> int:
+    """
+    Apply increment records on top of the restored full backup and commit.
+
+    Every listed module is removed before any is written again, whatever order
+    the records are in: a checksum freed by one record may be reused by another.
+
+    Returns:
+        Number of records applied
+    """
+    repository = ModuleRepository(session)
+    records = list(records)
+    for record in records:
+        module_id = record["module"]["id"] if record["op"] == "upsert" else record["id"]
+        await repository.delete(module_id)
+
+    for record in records:
+        if record["op"] != "upsert":
+            continue
+        data = record["module"]
+        module = await repository.create(
+            SFPModule(
+                id=data["id"],
+                name=data["name"],
+                vendor=data["vendor"],
+                model=data["model"],
+                serial=data["serial"],
+                sha256=data["sha256"],
+                created_at=datetime.fromisoformat(data["created_at"]),
+                eeprom_data=base64.b64decode(data["eeprom"]),
+            )
+        )
+        for revision in record["revisions"]:
+            await repository.create_revision(
+                ModuleRevision(
+                    module_id=module.id,
+                    revision=revision["revision"],
+                    name=revision["name"],
+                    sha256=revision["sha256"],
+                    size=revision["size"],
+                    delta=base64.b64decode(revision["delta"]),
+                    created_at=datetime.fromisoformat(revision["created_at"]),
+                )
+            )
+
+    await session.commit()
+    return len(records)
@@ -0,0 +1,264 @@
+"""
+Import modules from blob URLs (e.g. community index entries).
+
+Entries whose `expected_sha256` is already in the library are answered
+without downloading. The rest are fetched concurrently over one pooled HTTP
+client, at most `concurrency` at a time. Each download is hashed while it
+streams and aborted as soon as it exceeds the size cap. Everything that
+downloads and verifies is stored with one batched insert and one commit.
+
+Trust model: anyone who can call the API can make the server fetch a URL, so
+blob URLs are treated as untrusted input. Only `http` and `https` are
+fetched, and the host must resolve to public addresses only: loopback,
+link-local (cloud metadata), multicast and reserved addresses are always
+refused, private networks unless `allow_private_networks` is set (e.g. for a
+mirror on the LAN). Redirects are followed by hand, at most
+`MAX_REDIRECTS`, and every target is checked the same way. The check runs
+before connecting, so a host whose DNS answer changes in between isn't
+caught; the size cap and checksum still apply to whatever is fetched.
+Entries without `expected_sha256` are imported but reported as unverified.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import socket
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import httpx
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.known_hashes import known_hashes
+from app.repositories.module_repository import ModuleRepository
+from app.services.module_service import ModuleService
+
+logger = structlog.get_logger()
+
+MAX_REDIRECTS = 3
+
+_Address = ipaddress.IPv4Address | ipaddress.IPv6Address
+
+
+class BlobDownloadError(Exception):
+    """Raised when a blob can't be downloaded or fails verification."""
+
+
+@dataclass
+class BlobImportEntry:
+    """One blob to import."""
+
+    name: str
+    blob_url: str
+    expected_sha256: str | None = None
+
+
+@dataclass
+class BlobImportResult:
+    """Outcome of importing one entry."""
+
+    blob_url: str
+    status: str  # "imported", "duplicate" or "failed"
+    id: int | None = None
+    sha256: str | None = None
+    error: str | None = None
+    verified: bool = False  # The image matched the entry's expected_sha256
+
+
+async def resolve_host(host: str, port: int) -> list[str]:
+    """Addresses a host name resolves to."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+def _is_refused(address: _Address, allow_private: bool) -> bool:
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    if (
+        address.is_loopback
+        or address.is_link_local
+        or address.is_multicast
+        or address.is_reserved
+        or address.is_unspecified
+    ):
+        return True
+    return address.is_private and not allow_private
+
+
+async def check_blob_url(url: str | httpx.URL, allow_private: bool) -> httpx.URL:
+    """
+    Parse a blob URL and make sure it may be fetched (see the module docstring).
+
+    Raises:
+        BlobDownloadError: If the URL is malformed, not http(s) or points at a refused address
+    """
+    try:
+        parsed = httpx.URL(url)
+    except (httpx.InvalidURL, TypeError, ValueError) as e:
+        raise BlobDownloadError(f"Invalid URL: {e}") from e
+    if parsed.scheme not in ("http", "https"):
+        raise BlobDownloadError("Only http and https URLs can be imported")
+    if not parsed.host:
+        raise BlobDownloadError("Invalid URL: no host")
+
+    try:
+        addresses = [ipaddress.ip_address(parsed.host)]
+    except ValueError:
+        try:
+            resolved = await resolve_host(parsed.host, parsed.port or 443)
+        except OSError as e:
+            raise BlobDownloadError(f"Can't resolve {parsed.host}: {e}") from e
+        addresses = [ipaddress.ip_address(address.split("%")[0]) for address in resolved]
+    if not addresses or any(_is_refused(address, allow_private) for address in addresses):
+        raise BlobDownloadError(f"{parsed.host} is not a public address")
+    return parsed
+
+
+async def download_blob(
+    client: httpx.AsyncClient,
+    url: str,
+    expected_sha256: str | None,
+    max_bytes: int,
+    allow_private_networks: bool = False,
+) -> tuple[bytes, str]:
+    """
+    Stream a blob, hashing as it arrives.
+
+    Returns:
+        (data, sha256)
+
+    Raises:
+        BlobDownloadError: On refused URLs, HTTP errors, oversized bodies or a sha256 mismatch
+    """
+    hasher = hashlib.sha256()
+    chunks: list[bytes] = []
+    size = 0
+    try:
+        target = await check_blob_url(url, allow_private_networks)
+        for _ in range(MAX_REDIRECTS + 1):
+            async with client.stream("GET", target, follow_redirects=False) as response:
+                if response.is_redirect:
+                    location = target.join(response.headers["location"])
+                    target = await check_blob_url(location, allow_private_networks)
+                    continue
+                response.raise_for_status()
+                declared = response.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise BlobDownloadError(f"Blob is {declared} bytes (limit {max_bytes})")
+
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise BlobDownloadError(f"Blob exceeds {max_bytes} bytes")
+                    hasher.update(chunk)
+                    chunks.append(chunk)
+                break
+        else:
+            raise BlobDownloadError(f"More than {MAX_REDIRECTS} redirects")
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        raise BlobDownloadError(f"Download failed: {e}") from e
+
+    sha256 = hasher.hexdigest()
+    if expected_sha256 and sha256 != expected_sha256.lower():
+        raise BlobDownloadError(f"sha256 mismatch: got {sha256}")
+    if not size:
+        raise BlobDownloadError("Blob is empty")
+    return b"".join(chunks), sha256
+
+
+class BlobImporter:
+    """Download, verify and store blobs in one batched transaction."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize importer with database session."""
+        self.session = session
+        self.repository = ModuleRepository(session)
+
+    async def import_entries(
+        self,
+        entries: Sequence[BlobImportEntry],
+        client: httpx.AsyncClient,
+        concurrency: int,
+        max_bytes: int,
+        allow_private_networks: bool = False,
+    ) -> list[BlobImportResult]:
+        """
+        Import entries, skipping known checksums before downloading.
+
+        Args:
+            entries: Blobs to import
+            client: Pooled HTTP client (must not follow redirects itself)
+            concurrency: Downloads in flight at once
+            max_bytes: Size cap per blob
+            allow_private_networks: Allow blob hosts on private networks
+
+        Returns:
+            One result per entry, in input order
+        """
+        results: list[BlobImportResult | None] = [None] * len(entries)
+
+        # Checksums already in the library never need downloading
+        expected = {
+            entry.expected_sha256.lower()
+            for entry in entries
+            if entry.expected_sha256 and known_hashes.might_contain(entry.expected_sha256.lower())
+        }
+        existing = await self.repository.get_existing_sha256s(expected)
+
+        to_fetch: list[int] = []
+        for i, entry in enumerate(entries):
+            sha256 = (entry.expected_sha256 or "").lower()
+            if sha256 in existing:
+                results[i] = BlobImportResult(
+                    entry.blob_url, "duplicate", existing[sha256], sha256, verified=True
+                )
+            else:
+                to_fetch.append(i)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(i: int) -> tuple[bytes, str] | BlobDownloadError:
+            async with semaphore:
+                try:
+                    return await download_blob(
+                        client,
+                        entries[i].blob_url,
+                        entries[i].expected_sha256,
+                        max_bytes,
+                        allow_private_networks,
+                    )
+                except BlobDownloadError as e:
+                    return e
+
+        downloads = await asyncio.gather(*(fetch(i) for i in to_fetch))
+
+        stored_indexes: list[int] = []
+        items: list[tuple[str, bytes]] = []
+        for i, download in zip(to_fetch, downloads, strict=True):
+            if isinstance(download, BlobDownloadError):
+                results[i] = BlobImportResult(entries[i].blob_url, "failed", error=str(download))
+                logger.warning("blob_import_failed", url=entries[i].blob_url, error=str(download))
+                continue
+            stored_indexes.append(i)
+            items.append((entries[i].name, download[0]))
+
+        if items:
+            stored = await ModuleService(self.session).add_modules_batch(items)
+            await self.session.commit()
+            for i, item in zip(stored_indexes, stored, strict=True):
+                results[i] = BlobImportResult(
+                    entries[i].blob_url,
+                    "duplicate" if item.is_duplicate else "imported",
+                    item.module_id,
+                    item.sha256,
+                    verified=bool(entries[i].expected_sha256),
+                )
+
+        logger.info(
+            "blob_import_complete",
+            entries=len(entries),
+            downloaded=len(items),
+            skipped=len(entries) - len(to_fetch),
+        )
+        return [result for result in results if result is not None]
@@ -0,0 +1,155 @@
+"""Streaming NDJSON bulk ingest for the module library."""
+
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator, Callable
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.module_service import ModuleService
+
+logger = structlog.get_logger()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """
+    Split a byte stream into NDJSON lines without buffering the whole body.
+
+    Yields (line_number, line) tuples. Lines longer than `max_line_bytes` are
+    discarded and yielded as None so the caller can report them. Blank lines
+    are skipped but still counted.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline == -1:
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1 :]
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None
+            elif len(line) > max_line_bytes:
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+
+        if len(buffer) > max_line_bytes:
+            # Drop the partial line now; the rest is discarded up to the next newline
+            oversized = True
+            buffer = b""
+
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _decode_line(line: bytes) -> tuple[str, bytes]:
+    """Decode one `{name, eeprom}` NDJSON record. Raises ValueError on bad input."""
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e.msg}") from e
+
+    if not isinstance(record, dict):
+        raise ValueError("Line must be a JSON object")
+
+    name = record.get("name")
+    eeprom = record.get("eeprom")
+    if not isinstance(name, str) or not name:
+        raise ValueError("Missing 'name'")
+    if not isinstance(eeprom, str):
+        raise ValueError("Missing 'eeprom'")
+
+    try:
+        return name, base64.b64decode(eeprom, validate=True)
+    except binascii.Error as e:
+        raise ValueError("Invalid Base64 data") from e
+
+
+async def _store_batch(
+    session_factory: Callable[[], AsyncSession], batch: list[tuple[int, str, bytes]]
+) -> list[dict[str, object]]:
+    """Store one batch in its own session and transaction and return per-line results."""
+    items = [(name, eeprom) for _, name, eeprom in batch]
+
+    async with session_factory() as session:
+        stored = await ModuleService(session).add_modules_batch(items)
+        await session.commit()
+
+    results: list[dict[str, object]] = []
+    for (line_number, _, _), result in zip(batch, stored, strict=True):
+        entry: dict[str, object] = {
+            "line": line_number,
+            "status": "duplicate" if result.is_duplicate else "success",
+            "id": result.module_id,
+            "sha256": result.sha256,
+        }
+        if result.revision > 1:
+            entry.update(status="revision", revision=result.revision)
+        results.append(entry)
+    return results
+
+
+async def ingest_ndjson(
+    session_factory: Callable[[], AsyncSession],
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+    max_line_bytes: int,
+) -> AsyncIterator[bytes]:
+    """
+    Ingest an NDJSON stream of `{name, eeprom}` records in committed batches.
+
+    Yields one NDJSON result line per input line (in input order), followed by a
+    summary line. Memory use is bounded by `batch_size`, and each batch is
+    stored in its own session and committed separately, so a large import never
+    holds one long transaction (or keeps a restore waiting on its session).
+    """
+    totals = {"processed": 0, "inserted": 0, "duplicates": 0, "errors": 0}
+    pending: list[dict[str, object] | tuple[int, str, bytes]] = []
+
+    async def flush() -> AsyncIterator[bytes]:
+        batch = [entry for entry in pending if isinstance(entry, tuple)]
+        stored = iter(await _store_batch(session_factory, batch) if batch else [])
+        for entry in pending:
+            result = next(stored) if isinstance(entry, tuple) else entry
+            totals["processed"] += 1
+            if result["status"] in ("success", "revision"):
+                totals["inserted"] += 1
+            elif result["status"] == "duplicate":
+                totals["duplicates"] += 1
+            else:
+                totals["errors"] += 1
+            yield json.dumps(result).encode() + b"\n"
+        pending.clear()
+
+    async for line_number, line in iter_ndjson_lines(chunks, max_line_bytes):
+        if line is None:
+            pending.append({"line": line_number, "status": "error", "error": "Line too long"})
+        else:
+            try:
+                name, eeprom = _decode_line(line)
+                pending.append((line_number, name, eeprom))
+            except ValueError as e:
+                pending.append({"line": line_number, "status": "error", "error": str(e)})
+
+        if len(pending) >= batch_size:
+            async for result_line in flush():
+                yield result_line
+
+    if pending:
+        async for result_line in flush():
+            yield result_line
+
+    logger.info("bulk_ingest_complete", **totals)
+    yield json.dumps({"status": "complete", **totals}).encode() + b"\n"
@@ -0,0 +1,84 @@
+"""Library change feed: paged deltas and Server-Sent Events."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.change_repository import ChangeLogRepository
+from app.schemas.module import ModuleChangeInfo, ModuleChangePage, ModuleInfo
+
+
+class ChangeFeedService:
+    """Serve library changes after a client-supplied sequence number."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize service with database session."""
+        self.session = session
+        self.repository = ChangeLogRepository(session)
+
+    async def get_page(self, since: int, limit: int) -> ModuleChangePage:
+        """
+        Get up to `limit` changes with `seq > since`.
+
+        Args:
+            since: Last sequence number the client has applied (0 for all)
+            limit: Maximum number of changes to return
+
+        Returns:
+            The page, with `next_since` set to the last returned sequence number
+        """
+        rows = await self.repository.list_since(since, limit + 1)
+        has_more = len(rows) > limit
+        changes = [
+            ModuleChangeInfo(
+                seq=change.seq,
+                op=change.op,
+                module_id=change.module_id,
+                sha256=change.sha256,
+                changed_at=change.changed_at,
+                module=ModuleInfo.model_validate(module) if module else None,
+            )
+            for change, module in rows[:limit]
+        ]
+        return ModuleChangePage(
+            changes=changes,
+            next_since=changes[-1].seq if changes else since,
+            has_more=has_more,
+        )
+
+    @staticmethod
+    async def stream(
+        session_factory: Callable[[], AsyncSession],
+        since: int,
+        page_size: int,
+        poll_interval: float,
+        heartbeat_interval: float,
+    ) -> AsyncIterator[str]:
+        """
+        Yield SSE frames for every change after `since`, then keep polling.
+
+        Each event's `id` is its sequence number, so a reconnecting EventSource
+        resumes from `Last-Event-ID` without gaps. Every poll uses its own
+        short-lived session, so an open stream neither pins a snapshot nor keeps
+        a restore from taking the database.
+        """
+        last_sent = time.monotonic()
+        while True:
+            async with session_factory() as session:
+                page = await ChangeFeedService(session).get_page(since, page_size)
+
+            for change in page.changes:
+                yield f"id: {change.seq}\nevent: change\ndata: {change.model_dump_json()}\n\n"
+            since = page.next_since
+
+            if page.changes:
+                last_sent = time.monotonic()
+                if page.has_more:
+                    continue
+            elif time.monotonic() - last_sent >= heartbeat_interval:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,195 @@
+"""
+Sharded static community index.
+
+Instead of one `index.json` that every client re-downloads on any change, the
+index is published as small JSON shards plus a root manifest:
+
+    manifest.json                   shard hashes (the only file clients poll)
+    shards/sha256/<prefix>.json     entries whose sha256 starts with <prefix>
+    shards/vendor/<vendor>.json     entries of one vendor
+    blobs/<sha256>.bin              raw images (optional)
+
+`manifest.json` looks like:
+
+    {"version": 2, "module_count": 1234, "prefix_length": 2,
+     "shards": {"sha256": {"00": {"path": "shards/sha256/00.json",
+                                  "sha256": "...", "count": 5}, ...},
+                "vendor": {"fs": {...}, ...}}}
+
+Each shard is `{"modules": [...]}` with entries in the format read by
+`parse_index`; `blob` is relative to the shard, and `null` for images that
+aren't published under `blobs/` so mirrors don't chase dangling links. Shards are serialized
+deterministically, so a shard whose entries didn't change keeps its bytes and
+hash. Only changed shards (and the manifest, when something changed) are
+rewritten, so clients and CDNs only re-fetch what moved.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+SHARD_KINDS = ("sha256", "vendor")
+
+_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+_SHARD_KEY_PATTERN = re.compile(r"[a-z0-9-]+")
+
+
+@dataclass
+class IndexBuildStats:
+    """What a build changed on disk."""
+
+    modules: int = 0
+    shards_written: int = 0
+    shards_unchanged: int = 0
+    shards_removed: int = 0
+    blobs_written: int = 0
+    manifest_written: bool = False
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (
+            f"{self.modules} modules: {self.shards_written} shards written, "
+            f"{self.shards_unchanged} unchanged, {self.shards_removed} removed, "
+            f"{self.blobs_written} blobs written"
+        )
+
+
+def vendor_slug(vendor: str | None) -> str:
+    """File-name-safe shard key for a vendor."""
+    return _SLUG_PATTERN.sub("-", (vendor or "").lower()).strip("-") or "unknown"
+
+
+def _serialize(document: Any) -> bytes:
+    return json.dumps(document, sort_keys=True, separators=(",", ":")).encode()
+
+
+def build_shards(
+    entries: Iterable[dict[str, Any]], prefix_length: int, published: Collection[str] = ()
+) -> dict[str, dict[str, tuple[bytes, int]]]:
+    """
+    Group entries into serialized shards.
+
+    Args:
+        entries: Dicts with sha256, name, vendor, model, serial and size
+        prefix_length: Hex digits of sha256 per shard
+        published: Checksums whose image is published under `blobs/`
+
+    Returns:
+        Shard kind -> shard key -> (shard file contents, entry count)
+    """
+    groups: dict[str, dict[str, list[dict[str, Any]]]] = {
+        kind: defaultdict(list) for kind in SHARD_KINDS
+    }
+    for entry in entries:
+        # Shards live two directories below the blobs directory
+        sha256 = entry["sha256"]
+        entry = {**entry, "blob": f"../../blobs/{sha256}.bin" if sha256 in published else None}
+        groups["sha256"][entry["sha256"][:prefix_length]].append(entry)
+        groups["vendor"][vendor_slug(entry.get("vendor"))].append(entry)
+
+    return {
+        kind: {
+            key: (
+                _serialize({"modules": sorted(members, key=lambda e: e["sha256"])}),
+                len(members),
+            )
+            for key, members in shards.items()
+        }
+        for kind, shards in groups.items()
+    }
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _load_manifest(out_dir: Path) -> dict[str, Any]:
+    try:
+        manifest = json.loads((out_dir / MANIFEST_NAME).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def write_index(
+    out_dir: Path,
+    entries: list[dict[str, Any]],
+    prefix_length: int,
+    blobs: dict[str, bytes] | None = None,
+) -> IndexBuildStats:
+    """
+    Write (or update) a sharded index in `out_dir`.
+
+    Shards are compared with the hashes in the existing manifest; unchanged
+    shards aren't touched and shards that no longer have entries are deleted.
+
+    Args:
+        out_dir: Output directory
+        entries: Index entries (one per sha256)
+        prefix_length: Hex digits of sha256 per shard
+        blobs: Images to publish under `blobs/`, keyed by sha256 (only missing files are written)
+    """
+    stats = IndexBuildStats(modules=len(entries))
+    previous = _load_manifest(out_dir)
+    previous_shards = previous.get("shards", {})
+    # With different sharding, no old shard hash can be reused (old files are still removed)
+    reusable = previous_shards if previous.get("prefix_length") == prefix_length else {}
+
+    for sha256, image in (blobs or {}).items():
+        path = out_dir / "blobs" / f"{sha256}.bin"
+        if not path.exists():
+            _write_atomic(path, image)
+            stats.blobs_written += 1
+    # Images published by an earlier build count too
+    published = {
+        entry["sha256"]
+        for entry in entries
+        if (out_dir / "blobs" / f"{entry['sha256']}.bin").exists()
+    }
+
+    shards: dict[str, dict[str, dict[str, Any]]] = {}
+    for kind, contents in build_shards(entries, prefix_length, published).items():
+        shards[kind] = {}
+        old = reusable.get(kind, {})
+        for key, (data, count) in sorted(contents.items()):
+            path = f"shards/{kind}/{key}.json"
+            digest = hashlib.sha256(data).hexdigest()
+            shards[kind][key] = {"path": path, "sha256": digest, "count": count}
+
+            if old.get(key, {}).get("sha256") == digest and (out_dir / path).exists():
+                stats.shards_unchanged += 1
+            else:
+                _write_atomic(out_dir / path, data)
+                stats.shards_written += 1
+
+    for kind, old in previous_shards.items():
+        for key in old:
+            if (
+                kind in SHARD_KINDS
+                and _SHARD_KEY_PATTERN.fullmatch(key)
+                and key not in shards.get(kind, {})
+            ):
+                (out_dir / "shards" / kind / f"{key}.json").unlink(missing_ok=True)
+                stats.shards_removed += 1
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "module_count": len(entries),
+        "prefix_length": prefix_length,
+        "shards": shards,
+    }
+    if stats.shards_written or stats.shards_removed or previous != manifest:
+        _write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+        stats.manifest_written = True
+    return stats
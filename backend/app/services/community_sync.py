@@ -0,0 +1,280 @@
+"""
+Incremental sync of the community module index into a local mirror.
+
+The community index is a JSON document listing shared modules:
+
+    {"version": 1, "modules": [{"sha256", "name", "vendor", "model",
+                                "serial", "size", "blob"}, ...]}
+
+(a bare list of entries is accepted too). `blob` may be relative to the index
+URL and defaults to `blobs/<sha256>.bin`; `"blob": null` marks an image that
+isn't published, and such entries aren't mirrored.
+
+Each sync sends the last `ETag` / `Last-Modified` back as `If-None-Match` /
+`If-Modified-Since`, so an unchanged index costs one `304`. A changed index is
+diffed against the `community_modules` table and only added, changed and
+removed entries are written, in one transaction. The frontend lists the
+mirror instead of downloading the full index on every page load.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from urllib.parse import urljoin
+
+import httpx
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.core.suggest_index import suggest_index
+from app.repositories.community_repository import MIRRORED_FIELDS, CommunityRepository
+
+logger = structlog.get_logger()
+
+_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class CommunitySyncResult:
+    """Outcome of one sync."""
+
+    status: str  # "not_modified", "unchanged" or "updated"
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    total: int = 0
+
+
+def _optional_text(value: Any) -> str | None:
+    return str(value)[:255] if value not in (None, "") else None
+
+
+def parse_index(payload: Any, index_url: str) -> dict[str, dict[str, Any]]:
+    """
+    Normalize a community index into mirror rows keyed by sha256.
+
+    Entries without a valid sha256 or without a published image are skipped.
+
+    Raises:
+        ValueError: If the document isn't a list of entries or `{"modules": [...]}`
+    """
+    entries = payload.get("modules") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list):
+        raise ValueError("Community index must be a list or an object with 'modules'")
+
+    rows: dict[str, dict[str, Any]] = {}
+    skipped = 0
+    for entry in entries:
+        sha256 = str(entry.get("sha256", "")).lower() if isinstance(entry, dict) else ""
+        blob = entry.get("blob", f"blobs/{sha256}.bin") if isinstance(entry, dict) else None
+        if not _SHA256_PATTERN.match(sha256) or not blob:
+            skipped += 1
+            continue
+
+        size = entry.get("size")
+        rows[sha256] = {
+            "sha256": sha256,
+            "name": _optional_text(entry.get("name")) or sha256[:16],
+            "vendor": _optional_text(entry.get("vendor")),
+            "model": _optional_text(entry.get("model")),
+            "serial": _optional_text(entry.get("serial")),
+            "size": size if isinstance(size, int) and size >= 0 else None,
+            "blob_url": urljoin(index_url, str(blob)),
+        }
+
+    if skipped:
+        logger.warning("community_index_entries_skipped", count=skipped)
+    return rows
+
+
+def diff_index(
+    local: dict[str, tuple[Any, ...]], remote: dict[str, dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], set[str]]:
+    """
+    Compare the mirror with a parsed index.
+
+    Returns:
+        (rows to add, rows to update, sha256s to remove)
+    """
+    added, changed = [], []
+    for sha256, row in remote.items():
+        current = local.get(sha256)
+        if current is None:
+            added.append(row)
+        elif current != tuple(row[field] for field in MIRRORED_FIELDS):
+            changed.append(row)
+    return added, changed, local.keys() - remote.keys()
+
+
+class CommunitySync:
+    """Keep the community mirror up to date, on demand and periodically."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        index_url: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initialize the sync engine.
+
+        Args:
+            session_factory: Creates the session used per sync
+            index_url: Community index URL (defaults to settings)
+            transport: HTTP transport override (e.g. a local stand-in for tests)
+        """
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.index_url = index_url if index_url is not None else self.settings.community_index_url
+        self.transport = transport
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def configured(self) -> bool:
+        """Whether community import is enabled and an index URL is set."""
+        return self.settings.enable_community_import and bool(self.index_url)
+
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for fetching the index."""
+        return httpx.AsyncClient(
+            timeout=self.settings.community_sync_timeout, transport=self.transport
+        )
+
+    async def start(self) -> None:
+        """Start periodic syncing in the background."""
+        if not self.configured:
+            logger.info("community_sync_disabled")
+            return
+
+        if self._task and not self._task.done():
+            logger.warning("community_sync_already_running")
+            return
+
+        logger.info(
+            "community_sync_started",
+            index_url=self.index_url,
+            interval_minutes=self.settings.community_sync_interval,
+        )
+        self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        """Stop periodic syncing."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("community_sync_stopped")
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                async with self.client() as client:
+                    await self.sync(client)
+            except Exception as e:
+                logger.warning("community_sync_failed", error=str(e))
+
+            await asyncio.sleep(self.settings.community_sync_interval * 60)
+
+    async def sync(self, client: httpx.AsyncClient) -> CommunitySyncResult:
+        """
+        Fetch the index (conditionally) and apply any changes to the mirror.
+
+        Raises:
+            httpx.HTTPError: If the index can't be fetched
+            ValueError: If the index isn't valid JSON in the expected shape
+        """
+        async with self._lock, self.session_factory() as session:
+            repository = CommunityRepository(session)
+            state = await repository.get_state(self.index_url)
+
+            headers = {}
+            if state and state.etag:
+                headers["If-None-Match"] = state.etag
+            if state and state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+
+            try:
+                response = await client.get(self.index_url, headers=headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except httpx.HTTPError as e:
+                await repository.save_state(
+                    self.index_url, checked_at=datetime.utcnow(), last_error=str(e)
+                )
+                await session.commit()
+                raise
+
+            now = datetime.utcnow()
+            if response.status_code == 304:
+                await repository.save_state(self.index_url, checked_at=now, last_error=None)
+                await session.commit()
+                logger.info("community_index_not_modified")
+                return CommunitySyncResult(
+                    "not_modified", total=state.module_count if state else 0
+                )
+
+            validators = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+            }
+            content_sha256 = hashlib.sha256(response.content).hexdigest()
+            if state and state.content_sha256 == content_sha256:
+                await repository.save_state(
+                    self.index_url, checked_at=now, last_error=None, **validators
+                )
+                await session.commit()
+                return CommunitySyncResult("unchanged", total=state.module_count)
+
+            try:
+                remote = parse_index(json.loads(response.content), self.index_url)
+            except ValueError as e:
+                await repository.save_state(self.index_url, checked_at=now, last_error=str(e))
+                await session.commit()
+                raise
+
+            snapshot = await repository.get_snapshot()
+            added, changed, removed = diff_index(snapshot, remote)
+            await repository.insert_many(
+                [{**row, "first_seen_at": now, "updated_at": now} for row in added]
+            )
+            await repository.update_many([{**row, "updated_at": now} for row in changed])
+            await repository.delete_many(removed)
+            # Keep autocomplete current: changed entries replace their previous values
+            replaced = [*(row["sha256"] for row in changed), *removed]
+            previous = [dict(zip(MIRRORED_FIELDS, snapshot[sha], strict=True)) for sha in replaced]
+            suggest_index.apply_after_commit(session, added=[*added, *changed], removed=previous)
+            await repository.save_state(
+                self.index_url,
+                content_sha256=content_sha256,
+                module_count=len(remote),
+                checked_at=now,
+                changed_at=now if added or changed or removed else (state and state.changed_at),
+                last_error=None,
+                **validators,
+            )
+            await session.commit()
+
+        logger.info(
+            "community_index_synced",
+            added=len(added),
+            changed=len(changed),
+            removed=len(removed),
+            total=len(remote),
+        )
+        return CommunitySyncResult("updated", len(added), len(changed), len(removed), len(remote))
+
+
+community_sync = CommunitySync()
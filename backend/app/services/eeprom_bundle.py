@@ -0,0 +1,60 @@
+"""
+Binary bundle of several EEPROM images, served by `GET /api/v1/modules/eeprom`.
+
+Format (big-endian):
+
+    magic      4 bytes   b"SFPE"
+    version    1 byte    1
+    reserved   3 bytes
+    count      4 bytes   number of entries
+    index      count entries of 44 bytes:
+                   id      4 bytes
+                   sha256  32 bytes (raw digest)
+                   offset  4 bytes  (from the start of the data section)
+                   length  4 bytes
+    data       the images back to back, in index order
+
+The index comes first so a client can slice out any image without parsing
+the ones before it.
+"""
+
+import struct
+from collections.abc import Iterator, Sequence
+
+MAGIC = b"SFPE"
+VERSION = 1
+_HEADER = struct.Struct(">4sBxxxI")
+_ENTRY = struct.Struct(">I32sII")
+
+
+def iter_bundle(images: Sequence[tuple[int, str, bytes]]) -> Iterator[bytes]:
+    """
+    Yield a bundle of (id, sha256, image) entries: the header and index, then each image.
+
+    Images are yielded as-is rather than joined, so the bundle is never
+    copied into one large buffer.
+    """
+    index = bytearray(_HEADER.pack(MAGIC, VERSION, len(images)))
+    offset = 0
+    for module_id, sha256, image in images:
+        index += _ENTRY.pack(module_id, bytes.fromhex(sha256), offset, len(image))
+        offset += len(image)
+    yield bytes(index)
+
+    for _, _, image in images:
+        yield image
+
+
+def parse_bundle(data: bytes) -> list[tuple[int, str, bytes]]:
+    """Split a bundle back into (id, sha256, image) entries."""
+    magic, version, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an EEPROM bundle")
+
+    data_start = _HEADER.size + count * _ENTRY.size
+    entries = []
+    for i in range(count):
+        module_id, digest, offset, length = _ENTRY.unpack_from(data, _HEADER.size + i * _ENTRY.size)
+        start = data_start + offset
+        entries.append((module_id, digest.hex(), data[start : start + length]))
+    return entries
@@ -0,0 +1,90 @@
+"""
+Byte-level delta encoding between EEPROM images.
+
+Recoding a module usually rewrites a handful of bytes (vendor name, part
+number, checksums), so a revision is stored as the runs of bytes that differ
+from its base image:
+
+    varint target_length
+    repeated: varint gap (bytes copied from base), varint run_length, run bytes
+
+Anything after the last run is copied from the base image.
+"""
+
+from functools import lru_cache
+
+# Gaps shorter than this are cheaper to inline than to encode as a new run
+_MIN_GAP = 3
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated delta")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_delta(base: bytes, target: bytes) -> bytes:
+    """Encode `target` as the differences from `base`."""
+    runs: list[tuple[int, int]] = []  # (start, end) in target
+    pos = 0
+    while pos < len(target):
+        if pos < len(base) and base[pos] == target[pos]:
+            pos += 1
+            continue
+        start = pos
+        while pos < len(target) and (pos >= len(base) or base[pos] != target[pos]):
+            pos += 1
+        if runs and start - runs[-1][1] < _MIN_GAP:
+            runs[-1] = (runs[-1][0], pos)
+        else:
+            runs.append((start, pos))
+
+    out = bytearray()
+    _write_varint(out, len(target))
+    cursor = 0
+    for start, end in runs:
+        _write_varint(out, start - cursor)
+        _write_varint(out, end - start)
+        out += target[start:end]
+        cursor = end
+    return bytes(out)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild the target image from `base` and an `encode_delta` result."""
+    target_length, pos = _read_varint(delta, 0)
+    out = bytearray()
+    cursor = 0
+    while pos < len(delta):
+        gap, pos = _read_varint(delta, pos)
+        run_length, pos = _read_varint(delta, pos)
+        out += base[cursor : cursor + gap]
+        cursor += gap
+        out += delta[pos : pos + run_length]
+        pos += run_length
+        cursor += run_length
+
+    out += base[cursor:target_length]
+    if len(out) != target_length:
+        raise ValueError("Delta does not match base image")
+    return bytes(out)
+
+
+@lru_cache(maxsize=1024)
+def apply_delta_cached(base: bytes, delta: bytes) -> bytes:
+    """`apply_delta` with reconstructed images kept in an LRU cache."""
+    return apply_delta(base, delta)
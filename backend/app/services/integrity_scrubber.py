@@ -0,0 +1,279 @@
+"""
+Background integrity scrubber for stored EEPROM images.
+
+Silent corruption (e.g. a failing SD card) is otherwise only noticed when a
+module is written back to hardware. The scrubber walks the library in small
+ID-ordered batches, re-hashes every image and revision against its stored
+sha256 and, on SQLite, runs `PRAGMA quick_check` one table at a time. Work is
+throttled to `integrity_scrub_rate` bytes per second so it never competes with
+API requests, and each batch uses its own short transaction.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.models import Base
+from app.repositories.integrity_repository import IntegrityRepository
+from app.repositories.module_repository import ModuleRepository
+from app.services.eeprom_delta import apply_delta
+
+logger = structlog.get_logger()
+
+# Most quick_check messages stored per table (one corrupt page can yield many)
+_MAX_QUICK_CHECK_MESSAGES = 10
+
+
+@dataclass
+class ScrubProgress:
+    """Progress of the current (or last) scrub pass."""
+
+    running: bool = False
+    passes_completed: int = 0
+    pass_started_at: datetime | None = None
+    last_pass_completed_at: datetime | None = None
+    cursor: int = 0  # Last module ID checked in the current pass
+    modules_checked: int = 0
+    bytes_checked: int = 0
+    tables_checked: int = 0
+    findings: int = 0  # Problems found in the current pass
+
+
+@dataclass
+class _ImageToVerify:
+    module_id: int
+    sha256: str
+    image: bytes
+    revisions: list[tuple[int, str, bytes]]  # (revision, sha256, delta)
+
+
+def verify_images(items: list[_ImageToVerify]) -> list[tuple[str, int, str, str]]:
+    """
+    Re-hash images and rebuilt revisions (intended to be called from a worker thread).
+
+    Returns:
+        (kind, module_id, sha256, detail) for every problem found
+    """
+    problems = []
+    for item in items:
+        actual = hashlib.sha256(item.image).hexdigest()
+        if actual != item.sha256:
+            problems.append(
+                ("checksum_mismatch", item.module_id, item.sha256, f"image hashes to {actual}")
+            )
+
+        for revision, sha256, delta in item.revisions:
+            try:
+                actual = hashlib.sha256(apply_delta(item.image, delta)).hexdigest()
+            except ValueError as e:
+                problems.append(("unreadable", item.module_id, sha256, f"revision {revision}: {e}"))
+                continue
+            if actual != sha256:
+                problems.append(
+                    (
+                        "checksum_mismatch",
+                        item.module_id,
+                        sha256,
+                        f"revision {revision} hashes to {actual}",
+                    )
+                )
+    return problems
+
+
+class IntegrityScrubber:
+    """Periodically verify every stored image at a bounded rate."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        rate: int | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        Initialize the scrubber.
+
+        Args:
+            session_factory: Creates a session per batch
+            rate: Maximum bytes verified per second (defaults to settings)
+            batch_size: Modules per batch (defaults to settings)
+        """
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.rate = rate or self.settings.integrity_scrub_rate
+        self.batch_size = batch_size or self.settings.integrity_scrub_batch_size
+        self.progress = ScrubProgress()
+        self._task: asyncio.Task | None = None
+
+    def status(self) -> dict[str, object]:
+        """Current progress as a plain dict."""
+        return asdict(self.progress)
+
+    async def start(self) -> None:
+        """Start periodic scrubbing in the background."""
+        if not self.settings.integrity_scrub_enabled:
+            logger.info("integrity_scrub_disabled")
+            return
+
+        if self._task and not self._task.done():
+            logger.warning("integrity_scrub_already_running")
+            return
+
+        logger.info(
+            "integrity_scrub_started",
+            rate=self.rate,
+            batch_size=self.batch_size,
+            interval_hours=self.settings.integrity_scrub_interval,
+        )
+        self._task = asyncio.create_task(self._scrub_loop())
+
+    async def stop(self) -> None:
+        """Stop background scrubbing."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.progress.running = False
+        logger.info("integrity_scrub_stopped")
+
+    async def _scrub_loop(self) -> None:
+        """Main loop - one full pass per interval."""
+        # Leave startup (and the first requests) alone
+        await asyncio.sleep(300)
+
+        while True:
+            try:
+                await self.run_pass()
+            except Exception as e:
+                self.progress.running = False
+                logger.error("integrity_scrub_failed", error=str(e), exc_info=True)
+
+            await asyncio.sleep(self.settings.integrity_scrub_interval * 3600)
+
+    async def run_pass(self) -> ScrubProgress:
+        """Verify the whole library and database once."""
+        self.progress = ScrubProgress(
+            running=True,
+            passes_completed=self.progress.passes_completed,
+            last_pass_completed_at=self.progress.last_pass_completed_at,
+            pass_started_at=datetime.utcnow(),
+        )
+
+        while True:
+            started = time.monotonic()
+            checked_bytes = await self.scrub_batch()
+            if checked_bytes is None:
+                break
+            await self._throttle(checked_bytes, started)
+
+        for table in Base.metadata.sorted_tables:
+            started = time.monotonic()
+            await self.quick_check_table(table.name)
+            # quick_check cost isn't measurable in bytes; keep it at <= 50% duty
+            await asyncio.sleep(time.monotonic() - started)
+
+        self.progress.running = False
+        self.progress.passes_completed += 1
+        self.progress.last_pass_completed_at = datetime.utcnow()
+        logger.info(
+            "integrity_scrub_pass_complete",
+            modules_checked=self.progress.modules_checked,
+            bytes_checked=self.progress.bytes_checked,
+            findings=self.progress.findings,
+        )
+        return self.progress
+
+    async def scrub_batch(self) -> int | None:
+        """
+        Verify the next batch of modules after the cursor.
+
+        Returns:
+            Bytes verified, or None when the pass has reached the end of the library
+        """
+        async with self.session_factory() as session:
+            repository = ModuleRepository(session)
+            modules = await repository.get_batch_after(self.progress.cursor, self.batch_size)
+            if not modules:
+                return None
+
+            images = await repository.get_eeprom_many(modules)
+            revisions: dict[int, list[tuple[int, str, bytes]]] = {}
+            for revision in await repository.revisions.list_for_modules([m.id for m in modules]):
+                revisions.setdefault(revision.module_id, []).append(
+                    (revision.revision, revision.sha256, revision.delta)
+                )
+
+            items = [
+                _ImageToVerify(
+                    module_id=module.id,
+                    sha256=module.sha256,
+                    image=images.get(module.id, b""),
+                    revisions=revisions.get(module.id, []),
+                )
+                for module in modules
+            ]
+            problems = await asyncio.to_thread(verify_images, items)
+
+            findings = IntegrityRepository(session)
+            for kind, module_id, sha256, detail in problems:
+                logger.warning("integrity_problem", kind=kind, module_id=module_id, detail=detail)
+                await findings.record(kind, detail, module_id=module_id, sha256=sha256)
+            await session.commit()
+
+        checked_bytes = sum(
+            len(item.image) + sum(len(delta) for _, _, delta in item.revisions) for item in items
+        )
+        self.progress.cursor = modules[-1].id
+        self.progress.modules_checked += len(modules)
+        self.progress.bytes_checked += checked_bytes
+        self.progress.findings += len(problems)
+        return checked_bytes
+
+    async def quick_check_table(self, table: str) -> list[str]:
+        """
+        Run SQLite's `PRAGMA quick_check` on one table (no-op on other databases).
+
+        Returns:
+            The problems reported (empty when the table is fine)
+        """
+        async with self.session_factory() as session:
+            if session.get_bind().dialect.name != "sqlite":
+                return []
+
+            result = await session.execute(text(f'PRAGMA quick_check("{table}")'))
+            messages = [row[0] for row in result.all() if row[0] != "ok"]
+            await session.rollback()
+
+            findings = IntegrityRepository(session)
+            for message in messages[:_MAX_QUICK_CHECK_MESSAGES]:
+                logger.warning("integrity_problem", kind="quick_check", table=table, detail=message)
+                await findings.record("quick_check", f"{table}: {message}")
+            await session.commit()
+
+        self.progress.tables_checked += 1
+        self.progress.findings += len(messages)
+        return messages
+
+    async def _throttle(self, checked_bytes: int, started: float) -> None:
+        """Sleep long enough to keep the average below `rate` bytes per second."""
+        budget = checked_bytes / self.rate
+        elapsed = time.monotonic() - started
+        if budget > elapsed:
+            await asyncio.sleep(budget - elapsed)
+
+
+# Process-wide scrubber, started from the application lifespan
+integrity_scrubber = IntegrityScrubber()
@@ -0,0 +1,65 @@
+"""Built-in background job types."""
+
+from typing import Any
+
+from app.config import get_settings
+from app.repositories.module_repository import ModuleRepository
+from app.services.job_manager import JobContext, JobManager
+from app.services.submission_inbox import get_submission_inbox
+from app.services.submission_review import SubmissionReviewService
+from app.services.submission_validator import submission_validator
+
+# Modules decoded per transaction by the reindex job
+_REINDEX_BATCH_SIZE = 500
+
+
+async def reindex_job(ctx: JobContext) -> dict[str, Any]:
+    """
+    Decode searchable fields for modules that lack them, then rebuild the known-hashes filter.
+
+    Resumes after the last committed batch when interrupted.
+    """
+    settings = get_settings()
+    after_id = (ctx.checkpoint or {}).get("after_id", 0)
+    decoded = (ctx.checkpoint or {}).get("decoded", 0)
+
+    while True:
+        async with ctx.session_factory() as session:
+            repository = ModuleRepository(session)
+            module_ids = await repository.fields.get_unindexed_ids(after_id, _REINDEX_BATCH_SIZE)
+            if not module_ids:
+                break
+            modules = await repository.get_many_by_ids(module_ids)
+            await repository.fields.store(await repository.get_eeprom_many(modules))
+            await session.commit()
+
+        after_id = module_ids[-1]
+        decoded += len(module_ids)
+        await ctx.save_checkpoint({"after_id": after_id, "decoded": decoded})
+        await ctx.report(decoded, message="Decoding module fields")
+
+    await ctx.report(decoded, message="Rebuilding known-hashes filter")
+    async with ctx.session_factory() as session:
+        repository = ModuleRepository(session)
+        await repository.load_known_hashes(
+            settings.bloom_filter_capacity, settings.bloom_filter_error_rate
+        )
+        count = len(await repository.get_all_sha256s())
+
+    await ctx.report(decoded, decoded, "Done")
+    return {"modules": count, "decoded": decoded}
+
+
+async def index_submissions_job(ctx: JobContext) -> dict[str, Any]:
+    """Index inbox records missing from the submissions index and queue them for validation."""
+    async with ctx.session_factory() as session:
+        added = await SubmissionReviewService(session, get_submission_inbox()).sync_index()
+    submission_validator.enqueue(added)
+    await ctx.report(len(added), len(added), "Done")
+    return {"indexed": len(added)}
+
+
+def register_builtin_jobs(manager: JobManager) -> None:
+    """Register the job types shipped with the backend."""
+    manager.register("reindex", reindex_job, concurrency=1)
+    manager.register("index_submissions", index_submissions_job, concurrency=1)
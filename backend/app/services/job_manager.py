@@ -0,0 +1,243 @@
+"""
+Persistent background jobs.
+
+Jobs are rows in the `jobs` table, so their state survives restarts and can be
+read by any request. Each job runs as an asyncio task, bounded by a global
+worker limit and a per-type concurrency limit. Handlers report progress and
+save checkpoints through a `JobContext`; a job interrupted by a restart is
+queued again and its handler sees the last checkpoint.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.models.job import Job
+from app.repositories.job_repository import JobRepository
+from app.schemas.job import JobInfo
+
+logger = structlog.get_logger()
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobContext:
+    """Handle given to a running job handler."""
+
+    def __init__(self, manager: "JobManager", job: Job):
+        """Initialize context for one job run."""
+        self.job_id = job.id
+        self.params: dict[str, Any] = job.params or {}
+        self.checkpoint: dict[str, Any] | None = job.checkpoint
+        self.session_factory = manager.session_factory
+        self._manager = manager
+
+    async def report(
+        self, current: int, total: int | None = None, message: str | None = None
+    ) -> None:
+        """Persist progress (call once per batch, not per item)."""
+        values: dict[str, Any] = {"progress_current": current}
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["message"] = message[:255]
+        await self._manager.update_job(self.job_id, **values)
+
+    async def save_checkpoint(self, checkpoint: dict[str, Any]) -> None:
+        """Persist the point a restarted run should continue from."""
+        self.checkpoint = checkpoint
+        await self._manager.update_job(self.job_id, checkpoint=checkpoint)
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict[str, Any] | None]]
+
+
+class JobManager:
+    """Run registered job types in the background with concurrency limits."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        max_workers: int | None = None,
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            session_factory: Creates the short-lived sessions used for job state
+            max_workers: Jobs running at once across all types (defaults to settings)
+        """
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self._workers = asyncio.Semaphore(max_workers or self.settings.jobs_max_workers)
+        self._handlers: dict[str, JobHandler] = {}
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._cancelling: set[int] = set()
+
+    @property
+    def job_types(self) -> list[str]:
+        """Registered job types."""
+        return sorted(self._handlers)
+
+    def register(self, job_type: str, handler: JobHandler, concurrency: int = 1) -> None:
+        """
+        Register a handler for a job type.
+
+        Args:
+            job_type: Name clients use to submit the job
+            handler: Coroutine run with a `JobContext`; its return value is stored as the result
+            concurrency: Jobs of this type allowed to run at once
+        """
+        self._handlers[job_type] = handler
+        self._limits[job_type] = asyncio.Semaphore(concurrency)
+
+    async def start(self) -> None:
+        """Re-queue jobs left unfinished by a previous run."""
+        async with self.session_factory() as session:
+            repository = JobRepository(session)
+            jobs = await repository.list_unfinished()
+            for job in jobs:
+                if job.status == "running":
+                    await repository.update(job.id, status="queued")
+            await session.commit()
+
+        for job in jobs:
+            if job.type in self._handlers:
+                self._schedule(job.id, job.type)
+            else:
+                await self.update_job(
+                    job.id,
+                    status="failed",
+                    error=f"Unknown job type: {job.type}",
+                    finished_at=datetime.utcnow(),
+                )
+
+        logger.info("job_manager_started", resumed=len(jobs), job_types=self.job_types)
+
+    async def stop(self) -> None:
+        """Stop running jobs without changing their state, so they resume on next start."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("job_manager_stopped", interrupted=len(tasks))
+
+    async def submit(self, job_type: str, params: dict[str, Any] | None = None) -> Job:
+        """
+        Queue a new job.
+
+        Raises:
+            ValueError: If the job type isn't registered
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        async with self.session_factory() as session:
+            job = await JobRepository(session).create(job_type, params or {})
+            await session.commit()
+
+        logger.info("job_submitted", job_id=job.id, job_type=job_type)
+        self._schedule(job.id, job_type)
+        return job
+
+    async def cancel(self, job_id: int) -> Job | None:
+        """Cancel a queued or running job. Returns the job, or None if not found."""
+        job = await self.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+
+        task = self._tasks.get(job_id)
+        if task and not task.done():
+            self._cancelling.add(job_id)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        else:
+            await self.update_job(job_id, status="cancelled", finished_at=datetime.utcnow())
+
+        logger.info("job_cancelled", job_id=job_id)
+        return await self.get(job_id)
+
+    async def get(self, job_id: int) -> Job | None:
+        """Get a job's current state."""
+        async with self.session_factory() as session:
+            return await JobRepository(session).get(job_id)
+
+    async def list_jobs(self, limit: int, status: str | None = None) -> list[Job]:
+        """Get the newest jobs."""
+        async with self.session_factory() as session:
+            return list(await JobRepository(session).list_recent(limit, status))
+
+    async def update_job(self, job_id: int, **values: Any) -> None:
+        """Persist job columns in their own transaction."""
+        async with self.session_factory() as session:
+            await JobRepository(session).update(job_id, **values)
+            await session.commit()
+
+    async def stream(
+        self, job_id: int, poll_interval: float, heartbeat_interval: float
+    ) -> AsyncIterator[str]:
+        """Yield SSE `progress` frames while the job changes, then one `done` frame."""
+        last_update: datetime | None = None
+        last_sent = time.monotonic()
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                return
+
+            if job.status in FINISHED_STATUSES:
+                yield f"event: done\ndata: {JobInfo.model_validate(job).model_dump_json()}\n\n"
+                return
+
+            if job.updated_at != last_update:
+                last_update = job.updated_at
+                last_sent = time.monotonic()
+                yield f"event: progress\ndata: {JobInfo.model_validate(job).model_dump_json()}\n\n"
+            elif time.monotonic() - last_sent >= heartbeat_interval:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            await asyncio.sleep(poll_interval)
+
+    def _schedule(self, job_id: int, job_type: str) -> None:
+        task = asyncio.create_task(self._run(job_id, job_type))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: int, job_type: str) -> None:
+        try:
+            # Per-type slot first: a job waiting behind its own type must not
+            # hold a global worker that jobs of other types could use
+            async with self._limits[job_type], self._workers:
+                job = await self.get(job_id)
+                if job is None or job.status != "queued":
+                    return
+
+                await self.update_job(job_id, status="running", started_at=datetime.utcnow())
+                logger.info("job_started", job_id=job_id, job_type=job_type)
+                result = await self._handlers[job_type](JobContext(self, job))
+
+            await self.update_job(
+                job_id, status="succeeded", result=result, finished_at=datetime.utcnow()
+            )
+            logger.info("job_succeeded", job_id=job_id, job_type=job_type)
+        except asyncio.CancelledError:
+            if job_id not in self._cancelling:
+                # Shutdown: leave the job unfinished so the next start resumes it
+                raise
+            self._cancelling.discard(job_id)
+            await self.update_job(job_id, status="cancelled", finished_at=datetime.utcnow())
+        except Exception as e:
+            logger.error(
+                "job_failed", job_id=job_id, job_type=job_type, error=str(e), exc_info=True
+            )
+            await self.update_job(
+                job_id, status="failed", error=str(e), finished_at=datetime.utcnow()
+            )
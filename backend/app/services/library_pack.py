@@ -0,0 +1,259 @@
+"""
+Packed library archive ("SFPK") for machine-to-machine transfer and mirrors.
+
+Layout (big-endian):
+
+    header     64 bytes
+        magic          4 bytes   b"SFPK"
+        version        1 byte    1
+        reserved       3 bytes
+        count          4 bytes   number of entries
+        index_offset   8 bytes
+        meta_offset    8 bytes
+        meta_length    8 bytes
+        data_offset    8 bytes
+        data_length    8 bytes
+        reserved       12 bytes
+    index      count entries of 52 bytes, sorted by sha256:
+        sha256         32 bytes  (raw digest)
+        data_offset    8 bytes   (from data_offset)
+        data_length    4 bytes
+        meta_offset    4 bytes   (from meta_offset)
+        meta_length    4 bytes
+    metadata   one UTF-8 JSON object per entry (name, vendor, model, serial;
+               module revisions also carry `revision` and `base_sha256`)
+    data       the images back to back
+
+Readers mmap the file and binary-search the fixed-size index, so looking up an
+image needs no decompression and no parsing beyond one 52-byte entry.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"SFPK"
+VERSION = 1
+_HEADER = struct.Struct(">4sBxxxIQQQQQ12x")
+_ENTRY = struct.Struct(">32sQIII")
+
+
+class PackWriter:
+    """
+    Write a pack file. Entries may be added in any order.
+
+    Images are spooled to a temporary file, so memory use is bounded by the
+    index and metadata. The pack is written to a temporary name and renamed
+    into place on close.
+    """
+
+    def __init__(self, path: str | Path):
+        """Start a pack at `path`."""
+        self.path = Path(path)
+        self._data = tempfile.TemporaryFile()
+        self._data_length = 0
+        self._entries: list[tuple[bytes, int, int, bytes]] = []
+        self._seen: set[bytes] = set()
+
+    def add(self, sha256: str, image: bytes, metadata: dict[str, Any]) -> bool:
+        """Add an image. Returns False if the same sha256 was already added."""
+        digest = bytes.fromhex(sha256)
+        if digest in self._seen:
+            return False
+        self._seen.add(digest)
+
+        self._data.write(image)
+        meta = json.dumps(metadata, separators=(",", ":")).encode()
+        self._entries.append((digest, self._data_length, len(image), meta))
+        self._data_length += len(image)
+        return True
+
+    def close(self) -> int:
+        """Write the pack and return its entry count."""
+        self._entries.sort()
+        count = len(self._entries)
+        index_offset = _HEADER.size
+        meta_offset = index_offset + count * _ENTRY.size
+
+        index = bytearray()
+        metadata = bytearray()
+        for digest, data_offset, data_length, meta in self._entries:
+            index += _ENTRY.pack(digest, data_offset, data_length, len(metadata), len(meta))
+            metadata += meta
+        data_offset = meta_offset + len(metadata)
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as out:
+            out.write(
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    count,
+                    index_offset,
+                    meta_offset,
+                    len(metadata),
+                    data_offset,
+                    self._data_length,
+                )
+            )
+            out.write(index)
+            out.write(metadata)
+            self._data.seek(0)
+            shutil.copyfileobj(self._data, out)
+        self._data.close()
+        os.replace(tmp_path, self.path)
+        return count
+
+    def discard(self) -> None:
+        """Abandon the pack without writing it."""
+        self._data.close()
+
+    def __enter__(self) -> "PackWriter":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Write the pack unless the block raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class PackReader:
+    """Memory-mapped, read-only access to a pack file."""
+
+    def __init__(self, path: str | Path):
+        """
+        Open and map a pack.
+
+        Raises:
+            ValueError: If the file is not a valid pack
+        """
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Empty file
+            self._file.close()
+            raise ValueError("Not an SFPK pack") from e
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError("Not an SFPK pack")
+
+        (
+            magic,
+            version,
+            self.count,
+            self._index_offset,
+            self._meta_offset,
+            self._meta_length,
+            self._data_offset,
+            self._data_length,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Not an SFPK pack")
+        if (
+            self._index_offset + self.count * _ENTRY.size > len(self._map)
+            or self._meta_offset + self._meta_length > len(self._map)
+            or self._data_offset + self._data_length > len(self._map)
+        ):
+            self.close()
+            raise ValueError("Pack is truncated")
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PackReader":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close on exit."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of entries."""
+        return self.count
+
+    def _entry(self, i: int) -> tuple[bytes, int, int, int, int]:
+        return _ENTRY.unpack_from(self._map, self._index_offset + i * _ENTRY.size)
+
+    def _digest(self, i: int) -> bytes:
+        start = self._index_offset + i * _ENTRY.size
+        return self._map[start : start + 32]
+
+    def find(self, sha256: str) -> int | None:
+        """Binary-search the index. Returns the entry number or None."""
+        digest = bytes.fromhex(sha256)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._digest(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._digest(lo) == digest:
+            return lo
+        return None
+
+    def image(self, i: int) -> memoryview:
+        """Image of entry `i`, as a zero-copy view into the mapping."""
+        _, offset, length, _, _ = self._entry(i)
+        start = self._data_offset + offset
+        return memoryview(self._map)[start : start + length]
+
+    def metadata(self, i: int) -> dict[str, Any]:
+        """Metadata of entry `i`."""
+        _, _, _, offset, length = self._entry(i)
+        start = self._meta_offset + offset
+        return json.loads(self._map[start : start + length])
+
+    def get(self, sha256: str) -> memoryview | None:
+        """Image with the given sha256, or None."""
+        i = self.find(sha256)
+        return None if i is None else self.image(i)
+
+    def __iter__(self) -> Iterator[tuple[str, bytes, dict[str, Any]]]:
+        """
+        Yield (sha256, image, metadata) in index order.
+
+        Images are copied out, so nothing yielded keeps the mapping open.
+        """
+        for i in range(self.count):
+            yield self._digest(i).hex(), bytes(self.image(i)), self.metadata(i)
+
+    def verify(self) -> list[str]:
+        """
+        Check index order, section bounds and every image's sha256.
+
+        Returns:
+            Problems found (empty if the pack is intact)
+        """
+        problems = []
+        previous = b""
+        for i in range(self.count):
+            digest, data_offset, data_length, meta_offset, meta_length = self._entry(i)
+            if digest <= previous:
+                problems.append(f"entry {i}: index not sorted or duplicate sha256")
+            previous = digest
+
+            if data_offset + data_length > self._data_length:
+                problems.append(f"entry {i}: image out of bounds")
+                continue
+            if meta_offset + meta_length > self._meta_length:
+                problems.append(f"entry {i}: metadata out of bounds")
+
+            if hashlib.sha256(self.image(i)).digest() != digest:
+                problems.append(f"entry {i}: sha256 mismatch for {digest.hex()}")
+        return problems
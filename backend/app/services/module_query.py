@@ -0,0 +1,135 @@
+"""
+Module search query language.
+
+A query is a whitespace-separated list of filters, all of which must match:
+
+    wavelength:1310 reach_km>10 type:SFP+ vendor:FS*
+
+- `field:value` matches exactly (case-insensitive for text fields)
+- `field:prefix*` matches text fields starting with `prefix`
+- `field>n`, `field>=n`, `field<n`, `field<=n` compare numeric fields
+- Values containing spaces can be quoted: `model:"SFP 10G"`
+
+Queries compile to parameterized SQLAlchemy clauses on the indexed
+`module_fields` columns. Prefixes become ranges rather than LIKE patterns so
+they are index searches too. Parsing and compiling is cached per query string.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import ColumnElement
+
+from app.models.module_fields import ModuleFields
+
+
+class QueryError(ValueError):
+    """Raised for queries that can't be parsed or use unsupported filters."""
+
+
+_TEXT_FIELDS = {
+    "type": ModuleFields.type,
+    "connector": ModuleFields.connector,
+    "vendor": ModuleFields.vendor,
+    "model": ModuleFields.model,
+    "serial": ModuleFields.serial,
+}
+
+_NUMERIC_FIELDS = {
+    "wavelength": ModuleFields.wavelength_nm,
+    "reach_km": ModuleFields.reach_km,
+    "bitrate": ModuleFields.bitrate_mbps,
+}
+
+_ALIASES = {
+    "pn": "model",
+    "sn": "serial",
+    "wavelength_nm": "wavelength",
+    "reach": "reach_km",
+    "bitrate_mbps": "bitrate",
+}
+
+_TERM = re.compile(r'\s*(\w+)(:|>=|<=|>|<)("[^"]*"|\S+)\s*')
+
+
+@dataclass(frozen=True)
+class Filter:
+    """One parsed `field op value` filter."""
+
+    field: str
+    op: str
+    value: str
+
+
+def parse_query(query: str) -> tuple[Filter, ...]:
+    """
+    Split a query into filters.
+
+    Raises:
+        QueryError: If the query is malformed or names an unknown field
+    """
+    filters = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        match = _TERM.match(query, pos)
+        if not match:
+            raise QueryError(f"Expected field:value at {query[pos:pos + 20]!r}")
+
+        field, op, value = match.groups()
+        field = _ALIASES.get(field.lower(), field.lower())
+        if field not in _TEXT_FIELDS and field not in _NUMERIC_FIELDS:
+            raise QueryError(f"Unknown field: {field}")
+
+        filters.append(Filter(field, op, value.strip('"')))
+        pos = match.end()
+    return tuple(filters)
+
+
+def _compile_filter(term: Filter) -> ColumnElement[bool]:
+    if term.field in _TEXT_FIELDS:
+        column = _TEXT_FIELDS[term.field]
+        if term.op != ":":
+            raise QueryError(f"{term.field} only supports ':'")
+
+        value = term.value.lower()
+        if not value.endswith("*"):
+            return column == value
+
+        prefix = value.rstrip("*")
+        if not prefix:
+            return column.is_not(None)
+        # Every string starting with `prefix` sorts in [prefix, prefix with last char + 1)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return (column >= prefix) & (column < upper)
+
+    column = _NUMERIC_FIELDS[term.field]
+    try:
+        number = float(term.value)
+    except ValueError as e:
+        raise QueryError(f"{term.field} needs a number, got {term.value!r}") from e
+
+    if term.op == ":":
+        return column == number
+    if term.op == ">":
+        return column > number
+    if term.op == ">=":
+        return column >= number
+    if term.op == "<":
+        return column < number
+    return column <= number
+
+
+@lru_cache(maxsize=256)
+def compile_query(query: str) -> tuple[ColumnElement[bool], ...]:
+    """
+    Compile a query into SQLAlchemy clauses over `ModuleFields`.
+
+    Raises:
+        QueryError: If the query is invalid
+    """
+    filters = parse_query(query)
+    if not filters:
+        raise QueryError("Empty query")
+    return tuple(_compile_filter(term) for term in filters)
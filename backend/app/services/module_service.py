@@ -1,13 +1,61 @@
 """Business logic for SFP module operations."""
 
+import asyncio
 import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.known_hashes import known_hashes
 from app.models.module import SFPModule
+from app.models.module_revision import ModuleRevision
 from app.repositories.module_repository import ModuleRepository
+from app.services.eeprom_delta import apply_delta_cached, encode_delta
+from app.services.module_query import compile_query
 from app.services.sfp_parser import parse_sfp_data
 
+# Parser placeholders that don't identify a physical module
+_UNIDENTIFIED = {"", "N/A", "Unknown", "Parse Error"}
+
+# Tries at a free revision number before giving up on a busy module
+_REVISION_ATTEMPTS = 5
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of storing one image as part of a batch."""
+
+    module_id: int
+    sha256: str
+    is_duplicate: bool
+    revision: int = 1  # Above 1 when stored as a revision of `module_id`
+
+
+@dataclass
+class SaveResult:
+    """Outcome of saving a single image."""
+
+    module: SFPModule
+    status: str  # "success", "duplicate" or "revision"
+    revision: int = 1
+
+
+def _identifies_module(parsed: dict[str, str]) -> bool:
+    """Whether parsed vendor and serial are real values (blank fields may be NUL-padded)."""
+    return all(parsed[field].strip("\x00 ") not in _UNIDENTIFIED for field in ("vendor", "serial"))
+
+
+def prepare_eeprom(eeprom_data: bytes) -> tuple[str, dict[str, str]]:
+    """Compute the SHA-256 checksum and parsed identity fields of an EEPROM image."""
+    return hashlib.sha256(eeprom_data).hexdigest(), parse_sfp_data(eeprom_data)
+
+
+def prepare_eeprom_batch(images: Sequence[bytes]) -> list[tuple[str, dict[str, str]]]:
+    """Run `prepare_eeprom` over a batch (intended to be called from a worker thread)."""
+    return [prepare_eeprom(image) for image in images]
+
 
 class ModuleService:
     """Service for SFP module business logic."""
@@ -27,17 +75,71 @@ class ModuleService:
         Returns:
             Tuple of (module, is_duplicate)
         """
+        result = await self.save_module(name, eeprom_data)
+        return result.module, result.status == "duplicate"
+
+    async def save_module(self, name: str, eeprom_data: bytes) -> SaveResult:
+        """
+        Save an image as a new module, a duplicate or a revision of a known module.
+
+        An image whose vendor and serial match an existing module but whose bytes
+        differ (e.g. the same module after recoding) is stored as a delta against
+        that module's image instead of as a new full row.
+
+        Args:
+            name: Friendly name for the module
+            eeprom_data: Raw EEPROM data
+
+        Returns:
+            The module the image was stored under and how it was stored
+        """
         # Compute SHA-256 checksum
         sha256 = hashlib.sha256(eeprom_data).hexdigest()
 
-        # Check for existing module with same checksum
-        existing = await self.repository.get_by_sha256(sha256)
-        if existing:
-            return existing, True
+        # The known-hashes filter only knows what this process loaded and wrote,
+        # so it just decides whether to look first; rows stored by another
+        # writer (CLI import, other worker, restore) are caught on insert below
+        if known_hashes.might_contain(sha256):
+            duplicate = await self._find_stored(sha256)
+            if duplicate:
+                return duplicate
 
         # Parse EEPROM data
         parsed = parse_sfp_data(eeprom_data)
 
+        try:
+            async with self.repository.session.begin_nested():
+                return await self._store(name, eeprom_data, sha256, parsed)
+        except IntegrityError:
+            # Unique sha256 violated: the image was stored behind the filter's back
+            duplicate = await self._find_stored(sha256)
+            if duplicate is None:
+                raise
+            known_hashes.add([sha256])
+            return duplicate
+
+    async def _find_stored(self, sha256: str) -> SaveResult | None:
+        """Look up an image among stored modules and revisions by checksum."""
+        existing = await self.repository.get_by_sha256(sha256)
+        if existing:
+            return SaveResult(existing, "duplicate")
+        revision = await self.repository.revisions.get_by_sha256(sha256)
+        if revision:
+            base = await self.repository.get_by_id(revision.module_id)
+            if base:
+                return SaveResult(base, "duplicate", revision.revision)
+        return None
+
+    async def _store(
+        self, name: str, eeprom_data: bytes, sha256: str, parsed: dict[str, str]
+    ) -> SaveResult:
+        """Store a new image as a revision of a known module or as a new module."""
+        if _identifies_module(parsed):
+            base = await self.repository.get_by_identity(parsed["vendor"], parsed["serial"])
+            if base:
+                number = await self.add_revision(base, name, eeprom_data, sha256)
+                return SaveResult(base, "revision", number)
+
         # Create new module
         module = SFPModule(
             name=name,
@@ -49,12 +151,172 @@ class ModuleService:
         )
 
         created = await self.repository.create(module)
-        return created, False
+        return SaveResult(created, "success")
+
+    async def add_revision(
+        self, base: SFPModule, name: str, eeprom_data: bytes, sha256: str
+    ) -> int:
+        """
+        Store `eeprom_data` as the next revision of `base`. Returns its number.
+
+        Numbers are taken under a lock on the base row. SQLite has no row locks,
+        so a number a concurrent writer took first is retried with the next one.
+
+        Raises:
+            IntegrityError: If the image itself was stored by another writer
+        """
+        await self.repository.lock(base.id)
+        base_image = await self.repository.get_eeprom(base)
+        delta = await asyncio.to_thread(encode_delta, base_image, eeprom_data)
+        for _ in range(_REVISION_ATTEMPTS - 1):
+            try:
+                return await self._create_revision(base, name, sha256, len(eeprom_data), delta)
+            except IntegrityError:
+                if await self.repository.revisions.get_by_sha256(sha256):
+                    raise
+        return await self._create_revision(base, name, sha256, len(eeprom_data), delta)
+
+    async def _create_revision(
+        self, base: SFPModule, name: str, sha256: str, size: int, delta: bytes
+    ) -> int:
+        """Insert a revision under the next free number, in a savepoint."""
+        number = await self.repository.revisions.next_revision_number(base.id)
+        async with self.repository.session.begin_nested():
+            await self.repository.create_revision(
+                ModuleRevision(
+                    module_id=base.id,
+                    revision=number,
+                    name=name,
+                    sha256=sha256,
+                    size=size,
+                    delta=delta,
+                )
+            )
+        return number
+
+    async def add_modules_batch(
+        self, items: Sequence[tuple[str, bytes]]
+    ) -> list[BatchItemResult]:
+        """
+        Add many modules with one duplicate lookup and one insert statement.
+
+        Hashing and parsing run in a worker thread so large batches don't stall
+        the event loop. See `add_prepared_batch` for how images are stored.
+
+        Args:
+            items: Sequence of (name, eeprom_data) tuples
+
+        Returns:
+            One result per input item, in input order
+        """
+        prepared = await asyncio.to_thread(prepare_eeprom_batch, [data for _, data in items])
+        return await self.add_prepared_batch(items, prepared)
+
+    async def add_prepared_batch(
+        self,
+        items: Sequence[tuple[str, bytes]],
+        prepared: Sequence[tuple[str, dict[str, str]]],
+    ) -> list[BatchItemResult]:
+        """
+        Add many already hashed and parsed images (see `prepare_eeprom_batch`).
+
+        Images repeated within the batch are stored once. As in `save_module`,
+        re-coded images of a known module (or of one earlier in the batch) are
+        stored as its revisions; the rest are inserted in one statement.
+
+        Args:
+            items: Sequence of (name, eeprom_data) tuples
+            prepared: (sha256, parsed fields) for each item, in the same order
+
+        Returns:
+            One result per input item, in input order
+        """
+        candidates = {sha256 for sha256, _ in prepared if known_hashes.might_contain(sha256)}
+        known = await self.repository.get_existing_sha256s(candidates)
+
+        # The filter only saves lookups for images it knows. Images stored only as
+        # revisions aren't covered by the insert's ON CONFLICT (sha256), so the
+        # ones it doesn't know (written by another process) are checked here
+        unknown = {sha256 for sha256, _ in prepared} - candidates
+        known.update(await self.repository.revisions.get_existing_sha256s(unknown))
+
+        new_rows: dict[str, dict[str, object]] = {}
+        identities: dict[str, tuple[str, str]] = {}
+        images: dict[str, tuple[str, bytes]] = {}
+        for (name, eeprom_data), (sha256, parsed) in zip(items, prepared, strict=True):
+            if sha256 in known or sha256 in new_rows:
+                continue
+            new_rows[sha256] = {
+                "name": name,
+                "vendor": parsed["vendor"],
+                "model": parsed["model"],
+                "serial": parsed["serial"],
+                "eeprom_data": eeprom_data,
+                "sha256": sha256,
+            }
+            if _identifies_module(parsed):
+                identities[sha256] = (parsed["vendor"], parsed["serial"])
+                images[sha256] = (name, eeprom_data)
+
+        # The first image of each physical module is a new row unless the
+        # library has it already; the others become revisions after the insert
+        bases = await self.repository.get_by_identities(set(identities.values()))
+        claimed: set[tuple[str, str]] = set()
+        revision_shas = []
+        for sha256, identity in identities.items():
+            if identity in bases or identity in claimed:
+                del new_rows[sha256]
+                revision_shas.append(sha256)
+            else:
+                claimed.add(identity)
+
+        inserted = await self.repository.create_many(list(new_rows.values()))
+        raced = new_rows.keys() - inserted.keys()
+        if raced:
+            # Another writer stored these between our lookup and the insert
+            known.update(await self.repository.get_existing_sha256s(raced))
+
+        claimed_bases = {identities[sha256] for sha256 in revision_shas} - bases.keys()
+        bases.update(await self.repository.get_by_identities(claimed_bases))
+        revisions: dict[str, int] = {}
+        for sha256 in revision_shas:
+            base = bases[identities[sha256]]
+            name, eeprom_data = images[sha256]
+            try:
+                number = await self.add_revision(base, name, eeprom_data, sha256)
+            except IntegrityError:
+                # Another writer stored this image since the lookup
+                known.update(await self.repository.revisions.get_existing_sha256s({sha256}))
+                continue
+            inserted[sha256] = base.id
+            revisions[sha256] = number
+
+        results = []
+        reported: set[str] = set()
+        for sha256, _ in prepared:
+            if sha256 in inserted and sha256 not in reported:
+                reported.add(sha256)
+                results.append(
+                    BatchItemResult(inserted[sha256], sha256, False, revisions.get(sha256, 1))
+                )
+            else:
+                module_id = inserted.get(sha256) or known[sha256]
+                results.append(BatchItemResult(module_id, sha256, True))
+        return results
 
     async def get_all_modules(self) -> list[SFPModule]:
         """Get all modules."""
         return list(await self.repository.get_all())
 
+    async def search_modules(self, query: str) -> list[SFPModule]:
+        """
+        Get modules matching a query such as `type:sfp+ wavelength:1310`.
+
+        Raises:
+            QueryError: If the query is invalid
+        """
+        return list(await self.repository.fields.search(compile_query(query)))
+
     async def get_module_by_id(self, module_id: int) -> SFPModule | None:
         """Get module by ID."""
         return await self.repository.get_by_id(module_id)
@@ -62,7 +324,36 @@ class ModuleService:
     async def get_module_eeprom(self, module_id: int) -> bytes | None:
         """Get raw EEPROM data for a module."""
         module = await self.repository.get_by_id(module_id)
-        return module.eeprom_data if module else None
+        return await self.repository.get_eeprom(module) if module else None
+
+    async def get_eeprom_batch(self, module_ids: Sequence[int]) -> list[tuple[int, str, bytes]]:
+        """Get (id, sha256, image) for several modules, in request order, skipping unknown IDs."""
+        found = {
+            module_id: (module_id, sha256, image)
+            for module_id, sha256, image in await self.repository.get_images_by_ids(
+                set(module_ids)
+            )
+        }
+        return [found[module_id] for module_id in dict.fromkeys(module_ids) if module_id in found]
+
+    async def get_module_revisions(self, module_id: int) -> list[ModuleRevision] | None:
+        """Get the stored revisions of a module, or None if the module doesn't exist."""
+        if not await self.repository.get_by_id(module_id):
+            return None
+        return list(await self.repository.revisions.list_for_module(module_id))
+
+    async def get_revision_eeprom(self, module_id: int, revision: int) -> bytes | None:
+        """Rebuild the EEPROM image of one revision (revision 1 is the base image)."""
+        module = await self.repository.get_by_id(module_id)
+        if not module:
+            return None
+        if revision == 1:
+            return await self.repository.get_eeprom(module)
+
+        stored = await self.repository.revisions.get(module_id, revision)
+        if not stored:
+            return None
+        return apply_delta_cached(await self.repository.get_eeprom(module), stored.delta)
 
     async def delete_module(self, module_id: int) -> bool:
         """Delete a module. Returns True if deleted, False if not found."""
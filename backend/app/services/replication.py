@@ -0,0 +1,260 @@
+"""
+Bandwidth-efficient library replication between instances.
+
+Each instance summarizes its sha256 set as Merkle-style buckets keyed by the
+first hex digits of the checksum. A puller compares bucket digests, lists only
+the buckets that differ and then downloads only the blobs it is missing.
+
+Revision images are part of the set too, so two instances that differ only in
+a module's revisions still converge. They are sent with their revision number
+and stored after every base image of the pull, through the same path as an
+upload, so each lands as a revision of its module again.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import re
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import Any
+
+import httpx
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.module_repository import ModuleRepository
+from app.schemas.sync import BucketContents, BucketSummary, PullResult
+from app.services.eeprom_delta import apply_delta_cached
+from app.services.module_service import ModuleService
+
+logger = structlog.get_logger()
+
+_PREFIX_PATTERN = re.compile(r"^[0-9a-f]{1,8}$")
+
+
+def is_valid_prefix(prefix: str) -> bool:
+    """Whether `prefix` is a usable lowercase hex bucket key."""
+    return bool(_PREFIX_PATTERN.match(prefix))
+
+
+def bucket_digests(sorted_sha256s: Iterable[str], prefix_length: int) -> dict[str, str]:
+    """
+    Digest each non-empty bucket of a sorted checksum list.
+
+    A bucket's digest is the SHA-256 of its checksums concatenated in order, so
+    two instances agree on a bucket exactly when they hold the same set.
+    """
+    digests: dict[str, str] = {}
+    current_prefix: str | None = None
+    hasher = hashlib.sha256()
+
+    for sha256 in sorted_sha256s:
+        prefix = sha256[:prefix_length]
+        if prefix != current_prefix:
+            if current_prefix is not None:
+                digests[current_prefix] = hasher.hexdigest()
+            current_prefix = prefix
+            hasher = hashlib.sha256()
+        hasher.update(sha256.encode())
+
+    if current_prefix is not None:
+        digests[current_prefix] = hasher.hexdigest()
+    return digests
+
+
+def parse_blob_line(line: bytes) -> tuple[str, bytes, int | None]:
+    """
+    Parse one line of a `/sync/blobs` response.
+
+    Returns:
+        (name, EEPROM image, revision number or None for a base image)
+
+    Raises:
+        ValueError: If the line isn't a well-formed blob record
+    """
+    record: Any = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Blob record is not an object")
+    name, eeprom, revision = record.get("name"), record.get("eeprom"), record.get("revision")
+    if not isinstance(name, str) or not isinstance(eeprom, str):
+        raise ValueError("Blob record needs string 'name' and 'eeprom' fields")
+    if revision is not None and (not isinstance(revision, int) or revision < 2):
+        raise ValueError(f"Invalid revision number {revision!r}")
+    try:
+        return name, base64.b64decode(eeprom, validate=True), revision
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 image: {e}") from None
+
+
+def root_digest(buckets: dict[str, str]) -> str:
+    """Digest over all bucket digests in prefix order."""
+    hasher = hashlib.sha256()
+    for prefix in sorted(buckets):
+        hasher.update(f"{prefix}:{buckets[prefix]}".encode())
+    return hasher.hexdigest()
+
+
+class ReplicationService:
+    """Serve and consume bucket summaries and blobs for library sync."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize service with database session."""
+        self.session = session
+        self.repository = ModuleRepository(session)
+
+    async def _sha256s(self, prefix: str | None = None) -> list[str]:
+        """Sorted checksums of base images and revisions, optionally of one bucket."""
+        if prefix is None:
+            modules = await self.repository.get_all_sha256s()
+            revisions = await self.repository.revisions.get_all_sha256s()
+        else:
+            modules = await self.repository.get_sha256s_with_prefix(prefix)
+            revisions = await self.repository.revisions.get_sha256s_with_prefix(prefix)
+        return sorted({*modules, *revisions})
+
+    async def get_summary(self, prefix_length: int) -> BucketSummary:
+        """Summarize the local library as bucket digests."""
+        sha256s = await self._sha256s()
+        buckets = bucket_digests(sha256s, prefix_length)
+        return BucketSummary(
+            prefix_length=prefix_length,
+            root=root_digest(buckets),
+            count=len(sha256s),
+            buckets=buckets,
+        )
+
+    async def get_bucket(self, prefix: str) -> BucketContents:
+        """List the checksums in one bucket."""
+        return BucketContents(prefix=prefix, sha256s=await self._sha256s(prefix))
+
+    async def export_blobs(self, sha256s: Sequence[str]) -> AsyncIterator[bytes]:
+        """
+        Yield the requested modules as NDJSON lines.
+
+        Lines use the bulk ingest `{name, eeprom}` format plus `sha256`, so the
+        same stream can also be posted to `/modules/bulk`. Revision images
+        follow the base images and also carry their `revision` number.
+        """
+        requested = set(sha256s)
+        modules = await self.repository.get_many_by_sha256(requested)
+        images = await self.repository.get_eeprom_many(modules)
+        for module in modules:
+            record = {
+                "name": module.name,
+                "eeprom": base64.b64encode(images.get(module.id, b"")).decode(),
+                "sha256": module.sha256,
+            }
+            yield json.dumps(record).encode() + b"\n"
+
+        revisions = await self.repository.revisions.get_many_by_sha256(requested)
+        bases = await self.repository.get_many_by_ids({r.module_id for r in revisions})
+        base_images = await self.repository.get_eeprom_many(bases)
+        for revision in revisions:
+            if revision.module_id not in base_images:
+                continue
+            image = apply_delta_cached(base_images[revision.module_id], revision.delta)
+            record = {
+                "name": revision.name,
+                "eeprom": base64.b64encode(image).decode(),
+                "sha256": revision.sha256,
+                "revision": revision.revision,
+            }
+            yield json.dumps(record).encode() + b"\n"
+
+    async def pull(
+        self, remote: httpx.AsyncClient, prefix_length: int, batch_size: int
+    ) -> PullResult:
+        """
+        Copy every module the remote instance has and this one lacks.
+
+        Args:
+            remote: Client whose base URL is the remote API root (…/api/v1)
+            prefix_length: Bucket key length to compare with
+            batch_size: Blobs fetched and committed per round trip
+
+        Returns:
+            Transfer statistics
+        """
+        response = await remote.get("/sync/buckets", params={"prefix_length": prefix_length})
+        response.raise_for_status()
+        remote_summary = BucketSummary.model_validate(response.json())
+        local_summary = await self.get_summary(prefix_length)
+
+        if remote_summary.root == local_summary.root:
+            return PullResult(
+                status="in_sync",
+                buckets_compared=len(remote_summary.buckets),
+                buckets_differing=0,
+                missing=0,
+                inserted=0,
+                bytes_transferred=0,
+            )
+
+        differing = [
+            prefix
+            for prefix, digest in remote_summary.buckets.items()
+            if local_summary.buckets.get(prefix) != digest
+        ]
+
+        missing: list[str] = []
+        for prefix in sorted(differing):
+            response = await remote.get(f"/sync/buckets/{prefix}")
+            response.raise_for_status()
+            remote_bucket = BucketContents.model_validate(response.json())
+            local_bucket = set(await self._sha256s(prefix))
+            missing.extend(sha for sha in remote_bucket.sha256s if sha not in local_bucket)
+
+        inserted = 0
+        bytes_transferred = 0
+        service = ModuleService(self.session)
+        # Revisions are stored once their base modules are, in revision order
+        revisions: list[tuple[int, str, bytes]] = []
+        for start in range(0, len(missing), batch_size):
+            requested = set(missing[start : start + batch_size])
+            response = await remote.post("/sync/blobs", json={"sha256s": sorted(requested)})
+            response.raise_for_status()
+            bytes_transferred += len(response.content)
+
+            items = []
+            for line in response.content.splitlines():
+                name, eeprom, revision = parse_blob_line(line)
+                if revision is None:
+                    items.append((name, eeprom))
+                elif hashlib.sha256(eeprom).hexdigest() in requested:
+                    revisions.append((revision, name, eeprom))
+                else:
+                    raise ValueError("Remote sent a revision that fails verification")
+
+            results = await service.add_modules_batch(items)
+            unexpected = [r.sha256 for r in results if r.sha256 not in requested]
+            if unexpected:
+                await self.session.rollback()
+                raise ValueError(f"Remote sent blobs that fail verification: {unexpected[:3]}")
+
+            await self.session.commit()
+            inserted += sum(1 for r in results if not r.is_duplicate)
+
+        revisions.sort(key=lambda item: item[0])
+        for start in range(0, len(revisions), batch_size):
+            for _, name, eeprom in revisions[start : start + batch_size]:
+                saved = await service.save_module(name, eeprom)
+                if saved.status != "duplicate":
+                    inserted += 1
+            await self.session.commit()
+
+        logger.info(
+            "library_pull_complete",
+            buckets_differing=len(differing),
+            missing=len(missing),
+            inserted=inserted,
+            bytes_transferred=bytes_transferred,
+        )
+        return PullResult(
+            status="synced",
+            buckets_compared=len(remote_summary.buckets),
+            buckets_differing=len(differing),
+            missing=len(missing),
+            inserted=inserted,
+            bytes_transferred=bytes_transferred,
+        )
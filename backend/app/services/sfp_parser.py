@@ -39,3 +39,169 @@ def parse_sfp_data(eeprom_data: bytes) -> dict[str, str]:
             "model": "Parse Error",
             "serial": "Parse Error",
         }
+
+
+DECODED_FIELDS = (
+    "type",
+    "connector",
+    "vendor",
+    "model",
+    "serial",
+    "wavelength_nm",
+    "reach_km",
+    "bitrate_mbps",
+)
+
+# SFF-8024 identifier values (A0h byte 0)
+_IDENTIFIERS = {0x03: "SFP", 0x0C: "QSFP", 0x0D: "QSFP+", 0x11: "QSFP28"}
+
+# SFF-8024 connector values (A0h byte 2)
+_CONNECTORS = {
+    0x01: "SC",
+    0x07: "LC",
+    0x0B: "Optical Pigtail",
+    0x0C: "MPO",
+    0x21: "Copper Pigtail",
+    0x22: "RJ45",
+    0x23: "No Separable Connector",
+}
+
+
+def _text(field: bytes) -> str | None:
+    value = field.decode("ascii", errors="ignore").strip("\x00 ").lower()
+    return value or None
+
+
+def decode_module_fields(eeprom_data: bytes) -> dict[str, object]:
+    """
+    Decode the searchable SFF-8472 serial ID fields (Address A0h).
+
+    - Byte 0: Identifier (SFP, QSFP, ...); byte 12: nominal bit rate (100 MBd units)
+    - Byte 2: Connector
+    - Bytes 14-19: Link length (SMF km / 100 m, OM2, OM1, OM4/copper, OM3)
+    - Bytes 60-61: Laser wavelength in nm
+
+    Text fields are case-folded so searches are case-insensitive. Fields that
+    are absent or zero are None.
+
+    Args:
+        eeprom_data: Raw EEPROM data (minimum 96 bytes)
+
+    Returns:
+        Dictionary keyed by DECODED_FIELDS
+    """
+    if len(eeprom_data) < 96:
+        return dict.fromkeys(DECODED_FIELDS)
+
+    bitrate = eeprom_data[12] * 100 or None
+    module_type = _IDENTIFIERS.get(eeprom_data[0])
+    if module_type == "SFP" and bitrate:
+        # 0xFF means "above 25.4 Gb/s" (SFP28 and faster)
+        if eeprom_data[12] == 0xFF:
+            module_type = "SFP28"
+        elif bitrate >= 10000:
+            module_type = "SFP+"
+
+    if eeprom_data[14]:
+        reach_km = float(eeprom_data[14])
+    elif eeprom_data[15]:
+        reach_km = eeprom_data[15] / 10
+    else:
+        multimode_m = max(
+            eeprom_data[16] * 10, eeprom_data[17] * 10, eeprom_data[18], eeprom_data[19] * 10
+        )
+        reach_km = multimode_m / 1000 if multimode_m else None
+
+    wavelength = int.from_bytes(eeprom_data[60:62], "big") or None
+    connector = _CONNECTORS.get(eeprom_data[2])
+
+    return {
+        "type": module_type.lower() if module_type else None,
+        "connector": connector.lower() if connector else None,
+        "vendor": _text(eeprom_data[20:36]),
+        "model": _text(eeprom_data[40:56]),
+        "serial": _text(eeprom_data[68:84]),
+        "wavelength_nm": wavelength,
+        "reach_km": reach_km,
+        "bitrate_mbps": bitrate,
+    }
+
+
+# A0h ASCII fields checked for plausibility: (name, start, end)
+_ASCII_FIELDS = (
+    ("vendor", 20, 36),
+    ("part_number", 40, 56),
+    ("revision", 56, 60),
+    ("serial", 68, 84),
+)
+
+
+def validate_eeprom(eeprom_data: bytes) -> list[dict[str, str]]:
+    """
+    Run SFF-8472 sanity checks on an EEPROM image (A0h, optionally followed by A2h).
+
+    - Size: at least the 96-byte serial ID block
+    - Identifier (byte 0) is a known transceiver type
+    - CC_BASE (byte 63) and CC_EXT (byte 95) checksums
+    - Vendor, part number, revision and serial are printable ASCII and not blank
+    - Date code (bytes 84-89) is YYMMDD
+
+    Returns:
+        One `{check, status, detail}` dict per check, where status is "pass",
+        "warn" or "fail"
+    """
+    if len(eeprom_data) < 96:
+        return [
+            {
+                "check": "size",
+                "status": "fail",
+                "detail": f"{len(eeprom_data)} bytes (need at least 96)",
+            }
+        ]
+
+    results = [{"check": "size", "status": "pass", "detail": f"{len(eeprom_data)} bytes"}]
+
+    identifier = eeprom_data[0]
+    results.append(
+        {
+            "check": "identifier",
+            "status": "pass" if identifier in _IDENTIFIERS else "warn",
+            "detail": _IDENTIFIERS.get(identifier, f"unknown identifier 0x{identifier:02x}"),
+        }
+    )
+
+    for name, start, end in (("cc_base", 0, 63), ("cc_ext", 64, 95)):
+        expected = sum(eeprom_data[start:end]) & 0xFF
+        actual = eeprom_data[end]
+        results.append(
+            {
+                "check": name,
+                "status": "pass" if expected == actual else "fail",
+                "detail": f"stored 0x{actual:02x}, computed 0x{expected:02x}",
+            }
+        )
+
+    for name, start, end in _ASCII_FIELDS:
+        field = eeprom_data[start:end]
+        if any(b < 0x20 or b > 0x7E for b in field.rstrip(b"\x00")):
+            status, detail = "warn", "contains non-printable bytes"
+        elif not field.strip(b"\x00 "):
+            status, detail = ("warn" if name in ("vendor", "serial") else "pass"), "blank"
+        else:
+            status, detail = "pass", field.decode("ascii").strip("\x00 ")
+        results.append({"check": f"ascii_{name}", "status": status, "detail": detail})
+
+    date_code = eeprom_data[84:90].decode("ascii", errors="replace")
+    plausible = (
+        date_code.isdigit()
+        and 1 <= int(date_code[2:4]) <= 12
+        and 1 <= int(date_code[4:6]) <= 31
+    )
+    results.append(
+        {
+            "check": "date_code",
+            "status": "pass" if plausible else "warn",
+            "detail": date_code.strip("\x00 ") or "blank",
+        }
+    )
+    return results
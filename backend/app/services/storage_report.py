@@ -0,0 +1,75 @@
+"""Report on the space page-level EEPROM dedup saves."""
+
+import asyncio
+import hashlib
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.module_repository import ModuleRepository
+from app.repositories.page_repository import split_pages
+from app.schemas.module import StorageReport
+
+_BATCH_SIZE = 500
+
+# Estimated bookkeeping bytes of the page store. A `module_pages` row holds two
+# integers and a hex sha256 and is indexed twice: its (module_id, page_index)
+# primary key and page_sha256. Each distinct page also keys `eeprom_pages` by
+# its hex sha256, in the row and in the primary key index.
+_INT_BYTES = 8
+_SHA256_BYTES = 64
+_PAGE_REF_ROW_BYTES = 2 * _INT_BYTES + _SHA256_BYTES
+PAGE_REF_BYTES = _PAGE_REF_ROW_BYTES + 2 * _INT_BYTES + (_SHA256_BYTES + 2 * _INT_BYTES)
+PAGE_KEY_BYTES = 2 * _SHA256_BYTES
+
+
+def _hash_pages(images: Sequence[bytes]) -> list[tuple[str, int]]:
+    """(sha256, size) of every page of every image (run in a worker thread)."""
+    return [
+        (hashlib.sha256(page).hexdigest(), len(page))
+        for image in images
+        for page in split_pages(image)
+    ]
+
+
+async def build_storage_report(session: AsyncSession) -> StorageReport:
+    """
+    Compare whole-image `sha256` dedup with page-level dedup over the library.
+
+    Covers images stored either way, so the report also shows what enabling
+    `eeprom_page_dedup` would save on an existing library. Savings are net of
+    the page references and page keys the page store has to keep.
+    """
+    repository = ModuleRepository(session)
+    unique_pages: dict[str, int] = {}
+    images = image_bytes = page_refs = 0
+
+    async for batch in repository.iter_inline_images(_BATCH_SIZE):
+        images += len(batch)
+        image_bytes += sum(len(image) for image in batch)
+        for sha256, size in await asyncio.to_thread(_hash_pages, batch):
+            page_refs += 1
+            unique_pages[sha256] = size
+
+    paged_modules: set[int] = set()
+    async for module_id, sha256, size in repository.pages.iter_page_refs():
+        paged_modules.add(module_id)
+        image_bytes += size
+        page_refs += 1
+        unique_pages[sha256] = size
+    images += len(paged_modules)
+
+    page_bytes = sum(unique_pages.values())
+    overhead = page_refs * PAGE_REF_BYTES + len(unique_pages) * PAGE_KEY_BYTES
+    saved = image_bytes - page_bytes - overhead
+    return StorageReport(
+        page_dedup_enabled=repository.page_dedup,
+        images=images,
+        image_bytes=image_bytes,
+        page_refs=page_refs,
+        unique_pages=len(unique_pages),
+        page_bytes=page_bytes,
+        page_overhead_bytes=overhead,
+        saved_bytes=saved,
+        saved_ratio=round(saved / image_bytes, 4) if image_bytes else 0.0,
+    )
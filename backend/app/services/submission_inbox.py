@@ -0,0 +1,251 @@
+"""
+Content-addressed inbox for community submissions.
+
+Layout under `submissions_dir`:
+
+    blobs/<sha256>.bin        each distinct EEPROM image, stored once
+    records/<record_id>.json  one metadata record per distinct submission
+    legacy/<uuid>/            submissions from before this layout, once migrated
+
+A record's id is derived from the image hash and the submitted metadata, so
+resubmitting the same module with the same details maps to the same record.
+The inbox keeps the set of blobs and records it has seen in memory, so such
+duplicates are acknowledged without touching the disk. All file I/O runs in
+a worker thread, and every file is written to a temporary name and renamed
+into place so readers never see a partial file.
+
+Older versions stored each submission as `<uuid>/eeprom.bin` plus
+`<uuid>/metadata.json`. When the inbox is first loaded, such directories are
+migrated: the image and a record (carrying `legacy_inbox_id`) are written in
+the layout above and the directory is moved under `legacy/`, so nothing is
+migrated twice and the originals are kept.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+# Submitted fields that distinguish one record of an image from another
+_RECORD_FIELDS = ("name", "vendor", "model", "serial", "notes")
+
+LEGACY_DIR = "legacy"
+
+
+@dataclass
+class InboxResult:
+    """Outcome of storing one submission."""
+
+    record_id: str
+    sha256: str
+    duplicate: bool
+    record: dict[str, Any] | None = None  # Stored metadata (new submissions only)
+
+
+def record_id_for(sha256: str, metadata: dict[str, Any]) -> str:
+    """Stable id for a submission of image `sha256` with the given metadata."""
+    fields = {field: metadata.get(field) for field in _RECORD_FIELDS}
+    canonical = json.dumps([sha256, fields], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a temporary file in the same directory."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _scan(directory: Path, suffix: str) -> set[str]:
+    """Names (without `suffix`) of the finished files in `directory`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return {
+        entry.name.removesuffix(suffix)
+        for entry in os.scandir(directory)
+        if entry.name.endswith(suffix) and not entry.name.startswith(".")
+    }
+
+
+class SubmissionInbox:
+    """Store community submissions on disk, deduplicated by content."""
+
+    def __init__(self, root: str | Path | None = None):
+        """
+        Initialize the inbox.
+
+        Args:
+            root: Inbox directory (defaults to the `submissions_dir` setting)
+        """
+        self.root = Path(root or get_settings().submissions_dir)
+        self.blob_dir = self.root / "blobs"
+        self.record_dir = self.root / "records"
+        self._blobs: set[str] | None = None
+        self._records: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def _ensure_loaded(self) -> set[str]:
+        """Scan the inbox once (caller holds the lock). Returns the blob set."""
+        if self._blobs is None:
+            self._blobs, self._records = await asyncio.to_thread(self._load)
+        return self._blobs
+
+    def _load(self) -> tuple[set[str], set[str]]:
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        migrated = self._migrate_legacy()
+        if migrated:
+            logger.info("submission_legacy_migrated", count=migrated)
+        return _scan(self.blob_dir, ".bin"), _scan(self.record_dir, ".json")
+
+    def _migrate_legacy(self) -> int:
+        """Move `<uuid>/eeprom.bin` + `metadata.json` submissions into this layout."""
+        migrated = 0
+        reserved = {self.blob_dir.name, self.record_dir.name, LEGACY_DIR}
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or entry.name in reserved or entry.name.startswith("."):
+                continue
+            directory = Path(entry.path)
+            try:
+                eeprom = (directory / "eeprom.bin").read_bytes()
+                metadata = json.loads((directory / "metadata.json").read_bytes())
+                if not isinstance(metadata, dict):
+                    raise ValueError("metadata.json is not an object")
+            except (OSError, ValueError) as e:
+                logger.warning("submission_legacy_unreadable", inbox_id=entry.name, error=str(e))
+                continue
+
+            # The stored checksum isn't trusted; the image is what gets indexed
+            sha256 = hashlib.sha256(eeprom).hexdigest()
+            record_id = record_id_for(sha256, metadata)
+            record: dict[str, Any] = {"record_id": record_id, "sha256": sha256}
+            record.update((field, metadata.get(field)) for field in _RECORD_FIELDS)
+            record["created_at"] = (
+                metadata.get("created_at") or datetime.utcnow().isoformat() + "Z"
+            )
+            record["legacy_inbox_id"] = entry.name
+
+            blob_path = self.blob_dir / f"{sha256}.bin"
+            if not blob_path.exists():
+                _write_atomic(blob_path, eeprom)
+            record_path = self.record_dir / f"{record_id}.json"
+            if not record_path.exists():
+                _write_atomic(record_path, json.dumps(record, indent=2).encode())
+
+            (self.root / LEGACY_DIR).mkdir(exist_ok=True)
+            os.replace(directory, self.root / LEGACY_DIR / entry.name)
+            migrated += 1
+        return migrated
+
+    def _write(
+        self, sha256: str, eeprom: bytes | None, record_id: str, record: dict[str, Any]
+    ) -> None:
+        if eeprom is not None:
+            _write_atomic(self.blob_dir / f"{sha256}.bin", eeprom)
+        _write_atomic(
+            self.record_dir / f"{record_id}.json", json.dumps(record, indent=2).encode()
+        )
+
+    async def submit(self, eeprom: bytes, metadata: dict[str, Any]) -> InboxResult:
+        """
+        Store a submission unless an identical one is already in the inbox.
+
+        Args:
+            eeprom: Raw EEPROM image
+            metadata: Submitted fields (name, vendor, model, serial, notes)
+
+        Returns:
+            The record id, image hash and whether the submission was a duplicate
+        """
+        sha256 = hashlib.sha256(eeprom).hexdigest()
+        record_id = record_id_for(sha256, metadata)
+
+        async with self._lock:
+            blobs = await self._ensure_loaded()
+
+            if record_id in self._records:
+                logger.info("submission_duplicate", record_id=record_id, sha256=sha256[:16])
+                return InboxResult(record_id, sha256, duplicate=True)
+
+            new_blob = sha256 not in blobs
+            record: dict[str, Any] = {"record_id": record_id, "sha256": sha256}
+            record.update((field, metadata.get(field)) for field in _RECORD_FIELDS)
+            record["created_at"] = datetime.utcnow().isoformat() + "Z"
+            await asyncio.to_thread(
+                self._write, sha256, eeprom if new_blob else None, record_id, record
+            )
+            blobs.add(sha256)
+            self._records.add(record_id)
+
+        logger.info(
+            "submission_queued", record_id=record_id, sha256=sha256[:16], new_blob=new_blob
+        )
+        return InboxResult(record_id, sha256, duplicate=False, record=record)
+
+    async def record_ids(self) -> set[str]:
+        """Ids of every record in the inbox."""
+        async with self._lock:
+            await self._ensure_loaded()
+            return set(self._records)
+
+    def _read_records(self, record_ids: list[str]) -> list[dict[str, Any]]:
+        records = []
+        for record_id in record_ids:
+            try:
+                record = json.loads((self.record_dir / f"{record_id}.json").read_bytes())
+            except (OSError, ValueError) as e:
+                logger.warning("submission_record_unreadable", record_id=record_id, error=str(e))
+                continue
+            record["record_id"] = record_id
+            records.append(record)
+        return records
+
+    async def read_records(self, record_ids: list[str]) -> list[dict[str, Any]]:
+        """Load stored records, skipping any that are missing or unreadable."""
+        return await asyncio.to_thread(self._read_records, record_ids)
+
+    def _read_blobs(self, sha256s: list[str]) -> dict[str, bytes]:
+        blobs = {}
+        for sha256 in sha256s:
+            try:
+                data = (self.blob_dir / f"{sha256}.bin").read_bytes()
+            except OSError as e:
+                logger.warning("submission_blob_unreadable", sha256=sha256[:16], error=str(e))
+                continue
+            if hashlib.sha256(data).hexdigest() != sha256:
+                logger.warning("submission_blob_corrupt", sha256=sha256[:16])
+                continue
+            blobs[sha256] = data
+        return blobs
+
+    async def read_blobs(self, sha256s: list[str]) -> dict[str, bytes]:
+        """Load images by sha256, skipping any that are missing or fail their checksum."""
+        return await asyncio.to_thread(self._read_blobs, sha256s)
+
+
+_inbox: SubmissionInbox | None = None
+
+
+def get_submission_inbox() -> SubmissionInbox:
+    """FastAPI dependency returning the process-wide inbox."""
+    global _inbox
+    if _inbox is None:
+        _inbox = SubmissionInbox()
+    return _inbox
@@ -0,0 +1,133 @@
+"""Review and promotion of indexed community submissions."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.submission_repository import SubmissionRepository
+from app.schemas.submission import SubmissionInfo, SubmissionPage
+from app.services.module_service import ModuleService
+from app.services.submission_inbox import SubmissionInbox
+
+logger = structlog.get_logger()
+
+# Inbox records read and indexed per transaction when rebuilding the index
+_INDEX_BATCH_SIZE = 500
+
+
+@dataclass
+class PromoteResult:
+    """Outcome of promoting one submission."""
+
+    submission_id: int
+    status: str  # "promoted", "duplicate", "already_promoted", "not_found" or "missing_blob"
+    module_id: int | None = None
+
+
+class SubmissionReviewService:
+    """Keep the submissions index in step with the inbox and promote submissions."""
+
+    def __init__(self, session: AsyncSession, inbox: SubmissionInbox):
+        """Initialize service with database session and inbox."""
+        self.session = session
+        self.inbox = inbox
+        self.repository = SubmissionRepository(session)
+
+    async def index(self, records: Sequence[dict[str, Any]]) -> list[int]:
+        """Index inbox records and commit. Returns the IDs of new index rows."""
+        added = await self.repository.add_many(records)
+        await self.session.commit()
+        return added
+
+    async def sync_index(self) -> list[int]:
+        """
+        Index inbox records the index doesn't know about yet.
+
+        Covers records written before the index existed and records whose
+        indexing failed after the files were stored. Returns the new IDs.
+        """
+        missing = sorted(
+            await self.inbox.record_ids() - await self.repository.get_indexed_record_ids()
+        )
+        added: list[int] = []
+        for start in range(0, len(missing), _INDEX_BATCH_SIZE):
+            records = await self.inbox.read_records(missing[start : start + _INDEX_BATCH_SIZE])
+            added += await self.index(records)
+
+        logger.info("submission_index_synced", added=len(added))
+        return added
+
+    async def list_page(
+        self,
+        after_id: int,
+        limit: int,
+        status: str | None = None,
+        vendor: str | None = None,
+        sha256: str | None = None,
+    ) -> SubmissionPage:
+        """Get one page of submissions in index order."""
+        # Fetch one extra row to learn whether another page follows
+        rows = await self.repository.list_page(after_id, limit + 1, status, vendor, sha256)
+        page = rows[:limit]
+        return SubmissionPage(
+            submissions=[SubmissionInfo.model_validate(row) for row in page],
+            next_after_id=page[-1].id if page else after_id,
+            has_more=len(rows) > limit,
+        )
+
+    async def promote(self, submission_ids: Sequence[int]) -> list[PromoteResult]:
+        """
+        Add submissions to the module library in one transaction.
+
+        Images already in the library are not stored again; their submissions
+        are linked to the existing module and reported as "duplicate".
+
+        Returns:
+            One result per requested ID, in request order
+        """
+        submissions = {s.id: s for s in await self.repository.get_many(submission_ids)}
+        pending = [
+            submissions[sid]
+            for sid in dict.fromkeys(submission_ids)
+            if sid in submissions and submissions[sid].status == "pending"
+        ]
+        blobs = await self.inbox.read_blobs(list({s.sha256 for s in pending}))
+        promotable = [s for s in pending if s.sha256 in blobs]
+
+        stored = await ModuleService(self.session).add_modules_batch(
+            [(s.name, blobs[s.sha256]) for s in promotable]
+        )
+        await self.repository.mark_promoted(
+            {s.id: item.module_id for s, item in zip(promotable, stored, strict=True)}
+        )
+        await self.session.commit()
+
+        outcomes = {
+            s.id: PromoteResult(
+                s.id, "duplicate" if item.is_duplicate else "promoted", item.module_id
+            )
+            for s, item in zip(promotable, stored, strict=True)
+        }
+        results = []
+        for sid in submission_ids:
+            if sid in outcomes:
+                results.append(outcomes[sid])
+            elif sid not in submissions:
+                results.append(PromoteResult(sid, "not_found"))
+            elif submissions[sid].status != "pending":
+                results.append(
+                    PromoteResult(sid, "already_promoted", submissions[sid].module_id)
+                )
+            else:
+                results.append(PromoteResult(sid, "missing_blob"))
+
+        logger.info(
+            "submissions_promoted",
+            requested=len(submission_ids),
+            promoted=sum(1 for r in results if r.status == "promoted"),
+            duplicates=sum(1 for r in results if r.status == "duplicate"),
+        )
+        return results
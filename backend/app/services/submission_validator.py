@@ -0,0 +1,179 @@
+"""
+Background validation pipeline for community submissions.
+
+Submitting only stores and indexes the record; everything else happens here,
+after the response has been sent. Each submission is decoded and checked
+(see `validate_eeprom`), then compared against the library and the rest of
+the inbox, and the outcome is stored in `submission_validations`.
+
+Work is queued in memory and handled by a fixed pool of workers. The queue
+itself isn't persistent: on start, every submission without a stored result
+is queued again.
+"""
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.models.submission_validation import SubmissionValidation
+from app.repositories.module_repository import ModuleRepository
+from app.repositories.submission_repository import SubmissionRepository
+from app.services.sfp_parser import validate_eeprom
+from app.services.submission_inbox import SubmissionInbox, get_submission_inbox
+
+logger = structlog.get_logger()
+
+
+def overall_status(checks: list[dict[str, str]]) -> str:
+    """Summarize check results as "passed", "warning" or "failed"."""
+    statuses = {check["status"] for check in checks}
+    if "fail" in statuses:
+        return "failed"
+    if "warn" in statuses:
+        return "warning"
+    return "passed"
+
+
+class SubmissionValidator:
+    """Validate submissions in the background with a bounded worker pool."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        inbox: SubmissionInbox | None = None,
+        workers: int | None = None,
+    ):
+        """
+        Initialize the validator.
+
+        Args:
+            session_factory: Creates a session per validated submission
+            inbox: Inbox to read images from (defaults to the process-wide inbox)
+            workers: Submissions validated at once (defaults to settings)
+        """
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self._inbox = inbox
+        self.workers = workers or self.settings.submission_validation_workers
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def inbox(self) -> SubmissionInbox:
+        """Inbox the images are read from."""
+        return self._inbox or get_submission_inbox()
+
+    @property
+    def running(self) -> bool:
+        """Whether the workers are started."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start the workers and queue submissions that were never validated."""
+        if self.running:
+            logger.warning("submission_validator_already_running")
+            return
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        async with self.session_factory() as session:
+            pending = await SubmissionRepository(session).get_unvalidated_ids()
+        self.enqueue(pending)
+        logger.info("submission_validator_started", workers=self.workers, queued=len(pending))
+
+    async def stop(self) -> None:
+        """Stop the workers. Unfinished submissions are picked up on next start."""
+        if not self.running:
+            return
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = asyncio.Queue()
+        logger.info("submission_validator_stopped")
+
+    def enqueue(self, submission_ids: list[int]) -> None:
+        """Queue submissions for validation (ignored while stopped)."""
+        if not self.running:
+            return
+        for submission_id in submission_ids:
+            self._queue.put_nowait(submission_id)
+
+    async def drain(self) -> None:
+        """Wait until every queued submission has been validated."""
+        await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            submission_id = await self._queue.get()
+            try:
+                await self.validate(submission_id)
+            except Exception as e:
+                logger.error(
+                    "submission_validation_failed",
+                    submission_id=submission_id,
+                    error=str(e),
+                    exc_info=True,
+                )
+            finally:
+                self._queue.task_done()
+
+    async def validate(self, submission_id: int) -> SubmissionValidation | None:
+        """
+        Validate one submission and store the result.
+
+        Returns:
+            The stored result, or None if the submission no longer exists
+        """
+        async with self.session_factory() as session:
+            repository = SubmissionRepository(session)
+            submission = await repository.get(submission_id)
+            if submission is None:
+                return None
+
+            image = (await self.inbox.read_blobs([submission.sha256])).get(submission.sha256)
+            if image is None:
+                checks = [
+                    {
+                        "check": "blob",
+                        "status": "fail",
+                        "detail": "image missing from inbox or fails its sha256",
+                    }
+                ]
+            else:
+                checks = await asyncio.to_thread(validate_eeprom, image)
+
+            library = await ModuleRepository(session).get_existing_sha256s([submission.sha256])
+            duplicates = [
+                other
+                for other in await repository.get_ids_by_sha256(submission.sha256)
+                if other != submission_id
+            ]
+
+            validation = SubmissionValidation(
+                submission_id=submission_id,
+                status=overall_status(checks),
+                checks=checks,
+                library_module_id=library.get(submission.sha256),
+                duplicate_submission_ids=duplicates,
+                validated_at=datetime.utcnow(),
+            )
+            await repository.save_validation(validation)
+            await session.commit()
+
+        logger.info(
+            "submission_validated",
+            submission_id=submission_id,
+            status=validation.status,
+            in_library=validation.library_module_id is not None,
+            inbox_duplicates=len(duplicates),
+        )
+        return validation
+
+
+submission_validator = SubmissionValidator()
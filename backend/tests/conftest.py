@@ -1,14 +1,22 @@
 """Pytest configuration and fixtures."""
 
+import os
+from contextlib import nullcontext
+
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.database import get_db
+from app.core.database import get_db, get_session_factory
+from app.core.known_hashes import known_hashes
+from app.core.rate_limit import admission_control
+from app.core.suggest_index import suggest_index
 from app.main import app
-from app.models.module import Base
+from app.models import Base
 
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Point at a disposable local server (e.g. postgresql+asyncpg://...) to run the
+# suite against PostgreSQL; tables are dropped after every test.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 
 
 @pytest_asyncio.fixture
@@ -21,6 +29,8 @@ async def async_engine():
 
     yield engine
 
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
@@ -41,8 +51,16 @@ async def client(async_session):
 
     async def override_get_db():
         yield async_session
+        await async_session.commit()
+
+    def override_get_session_factory():
+        return lambda: nullcontext(async_session)
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
+    known_hashes.reset()
+    suggest_index.reset()
+    admission_control.reset()
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
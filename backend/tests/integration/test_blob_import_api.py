@@ -0,0 +1,135 @@
+"""Integration tests for importing modules from blob URLs."""
+
+import base64
+import hashlib
+
+import httpx
+import pytest
+
+from app.api.v1.modules import get_blob_client
+from app.main import app
+
+
+def make_eeprom(vendor: bytes) -> bytes:
+    """Build a fake EEPROM image with the given vendor name."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    return bytes(eeprom)
+
+
+@pytest.fixture
+def blob_host(monkeypatch):
+    """Local stand-in for a blob host, recording requested paths."""
+    blobs = {
+        "/a.bin": make_eeprom(b"Vendor A"),
+        "/b.bin": make_eeprom(b"Vendor B"),
+        "/known.bin": make_eeprom(b"Known"),
+        "/huge.bin": bytes(100_000),
+    }
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path.startswith("/redirect"):
+            return httpx.Response(302, headers={"Location": request.url.params["to"]})
+        if request.url.path not in blobs:
+            return httpx.Response(404)
+        data = blobs[request.url.path]
+
+        async def chunks():
+            for i in range(0, len(data), 4096):
+                yield data[i : i + 4096]
+
+        # Stream without Content-Length so the size cap applies while reading
+        return httpx.Response(200, content=chunks())
+
+    async def override():
+        async with httpx.AsyncClient(
+            base_url="http://blobs.test", transport=httpx.MockTransport(handler)
+        ) as client:
+            yield client
+
+    async def resolve(host, port):
+        return {"blobs.test": ["93.184.216.34"], "intranet.test": ["10.0.0.5"]}[host]
+
+    app.dependency_overrides[get_blob_client] = override
+    monkeypatch.setattr("app.services.blob_import.resolve_host", resolve)
+    return blobs, requested
+
+
+@pytest.mark.asyncio
+async def test_import_skips_known_and_verifies_downloads(client, blob_host):
+    """Test known checksums skip the download and bad blobs are rejected."""
+    blobs, requested = blob_host
+    known = blobs["/known.bin"]
+    await client.post(
+        "/api/v1/modules",
+        json={"name": "Known", "eeprom_data_base64": base64.b64encode(known).decode()},
+    )
+
+    def sha(path: str) -> str:
+        return hashlib.sha256(blobs[path]).hexdigest()
+
+    entries = [
+        {"name": "A", "blob_url": "http://blobs.test/a.bin", "expected_sha256": sha("/a.bin")},
+        {"name": "B", "blob_url": "http://blobs.test/b.bin"},
+        {
+            "name": "K",
+            "blob_url": "http://blobs.test/known.bin",
+            "expected_sha256": sha("/known.bin"),
+        },
+        {"name": "Bad", "blob_url": "http://blobs.test/a.bin", "expected_sha256": "0" * 64},
+        {"name": "Huge", "blob_url": "http://blobs.test/huge.bin"},
+        {"name": "Gone", "blob_url": "http://blobs.test/missing.bin"},
+    ]
+    response = await client.post("/api/v1/modules/import", json={"entries": entries})
+    assert response.status_code == 200
+    results = response.json()
+
+    assert [r["status"] for r in results] == [
+        "imported",
+        "imported",
+        "duplicate",
+        "failed",
+        "failed",
+        "failed",
+    ]
+    assert results[0]["sha256"] == sha("/a.bin")
+    assert [r["verified"] for r in results[:3]] == [True, False, True]
+    assert "sha256 mismatch" in results[3]["error"]
+    assert "exceeds" in results[4]["error"]
+    assert "404" in results[5]["error"]
+    assert "/known.bin" not in requested
+
+    modules = (await client.get("/api/v1/modules")).json()
+    assert sorted(m["name"] for m in modules) == ["A", "B", "Known"]
+
+
+@pytest.mark.asyncio
+async def test_import_refuses_unsafe_urls(client, blob_host):
+    """Malformed URLs, other schemes and internal addresses fail per entry."""
+    blobs, requested = blob_host
+    urls = [
+        "http://[::1",
+        "http://\x00",
+        "file:///etc/passwd",
+        "http://127.0.0.1/a.bin",
+        "http://169.254.169.254/latest/meta-data",
+        "http://intranet.test/a.bin",
+        "http://blobs.test/redirect?to=http://127.0.0.1/a.bin",
+        "http://blobs.test/redirect?to=/b.bin",
+    ]
+    response = await client.post(
+        "/api/v1/modules/import",
+        json={"entries": [{"name": str(i), "blob_url": url} for i, url in enumerate(urls)]},
+    )
+    assert response.status_code == 200
+    results = response.json()
+
+    assert [r["status"] for r in results] == ["failed"] * 7 + ["imported"]
+    assert "Invalid URL" in results[0]["error"]
+    assert "http and https" in results[2]["error"]
+    assert "not a public address" in results[5]["error"]
+    assert "not a public address" in results[6]["error"]
+    assert requested == ["/redirect", "/redirect", "/b.bin"]
+    assert results[7]["sha256"] == hashlib.sha256(blobs["/b.bin"]).hexdigest()
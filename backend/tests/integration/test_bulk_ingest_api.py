@@ -0,0 +1,92 @@
+"""Integration tests for the NDJSON bulk ingest endpoint."""
+
+import base64
+import json
+
+import pytest
+
+from app.services.bulk_ingest import iter_ndjson_lines
+
+
+def make_line(name: str, vendor: bytes) -> bytes:
+    """Build one NDJSON ingest line with a fake EEPROM image."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    record = {"name": name, "eeprom": base64.b64encode(bytes(eeprom)).decode()}
+    return json.dumps(record).encode() + b"\n"
+
+
+def parse_results(response) -> list[dict]:
+    """Decode an NDJSON response body."""
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_inserts_and_deduplicates(client):
+    """Test that lines are stored and duplicates reported in input order."""
+    body = (
+        make_line("First", b"Vendor A")
+        + make_line("Second", b"Vendor B")
+        + make_line("Repeat", b"Vendor A")
+    )
+
+    response = await client.post("/api/v1/modules/bulk", content=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    results = parse_results(response)
+    assert [r["status"] for r in results[:3]] == ["success", "success", "duplicate"]
+    assert results[2]["id"] == results[0]["id"]
+    assert results[3] == {
+        "status": "complete",
+        "processed": 3,
+        "inserted": 2,
+        "duplicates": 1,
+        "errors": 0,
+    }
+
+    modules = (await client.get("/api/v1/modules")).json()
+    assert len(modules) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_detects_existing_modules(client):
+    """Test that images already in the library are reported as duplicates."""
+    line = make_line("Existing", b"Vendor C")
+    payload = json.loads(line)
+    await client.post(
+        "/api/v1/modules",
+        json={"name": "Existing", "eeprom_data_base64": payload["eeprom"]},
+    )
+
+    response = await client.post("/api/v1/modules/bulk", content=line)
+    results = parse_results(response)
+    assert results[0]["status"] == "duplicate"
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_reports_bad_lines(client):
+    """Test that malformed lines are reported without aborting the import."""
+    body = b'not json\n{"name": "x"}\n' + make_line("Good", b"Vendor D")
+
+    response = await client.post("/api/v1/modules/bulk", content=body)
+    results = parse_results(response)
+
+    assert results[0]["status"] == "error"
+    assert results[1] == {"line": 2, "status": "error", "error": "Missing 'eeprom'"}
+    assert results[2]["status"] == "success"
+    assert results[-1]["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_handles_split_and_oversized_lines():
+    """Test line splitting across chunk boundaries and the line length cap."""
+
+    async def chunks():
+        yield b'{"a": 1}\n{"b"'
+        yield b": 2}\n" + b"x" * 20
+        yield b"x" * 20 + b"\n"
+        yield b'{"c": 3}'
+
+    lines = [item async for item in iter_ndjson_lines(chunks(), max_line_bytes=16)]
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (3, None), (4, b'{"c": 3}')]
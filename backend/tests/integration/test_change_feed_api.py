@@ -0,0 +1,94 @@
+"""Integration tests for the library change feed."""
+
+import base64
+from contextlib import nullcontext
+
+import pytest
+from sqlalchemy import delete
+
+from app.models.module_change import ModuleChange
+from app.services.change_feed import ChangeFeedService
+
+
+async def create_module(client, vendor: bytes) -> int:
+    """Save a module with a fake EEPROM image and return its ID."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    payload = {"name": vendor.decode(), "eeprom_data_base64": base64.b64encode(eeprom).decode()}
+    response = await client.post("/api/v1/modules", json=payload)
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_changes_record_inserts_and_deletes(client):
+    """Test that inserts and deletes appear in sequence order."""
+    first = await create_module(client, b"Vendor A")
+    second = await create_module(client, b"Vendor B")
+    await client.delete(f"/api/v1/modules/{first}")
+
+    response = await client.get("/api/v1/modules/changes")
+    assert response.status_code == 200
+    page = response.json()
+
+    assert [(c["op"], c["module_id"]) for c in page["changes"]] == [
+        ("insert", first),
+        ("insert", second),
+        ("delete", first),
+    ]
+    seqs = [c["seq"] for c in page["changes"]]
+    assert seqs == sorted(seqs)
+    assert page["changes"][0]["module"] is None  # deleted since
+    assert page["changes"][1]["module"]["vendor"] == "Vendor B"
+    assert page["next_since"] == seqs[-1]
+    assert page["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_changes_are_paged(client):
+    """Test paging with `since` and `limit`."""
+    for vendor in (b"V1", b"V2", b"V3"):
+        await create_module(client, vendor)
+
+    page = (await client.get("/api/v1/modules/changes?limit=2")).json()
+    assert len(page["changes"]) == 2
+    assert page["has_more"] is True
+
+    rest = (await client.get(f"/api/v1/modules/changes?since={page['next_since']}")).json()
+    assert len(rest["changes"]) == 1
+    assert rest["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_sequence_numbers_are_not_reused(client, async_session):
+    """Test that a cursor past deleted newest rows still sees later changes."""
+    await create_module(client, b"V1")
+    await create_module(client, b"V2")
+    cursor = (await client.get("/api/v1/modules/changes")).json()["next_since"]
+
+    # Drop the newest change rows, as a rewound table would have them
+    await async_session.execute(delete(ModuleChange).where(ModuleChange.seq > cursor - 1))
+    await async_session.commit()
+
+    third = await create_module(client, b"V3")
+    page = (await client.get(f"/api/v1/modules/changes?since={cursor}")).json()
+    assert [(c["op"], c["module_id"]) for c in page["changes"]] == [("insert", third)]
+
+
+@pytest.mark.asyncio
+async def test_change_stream_replays_missed_changes(client, async_session):
+    """Test that the SSE stream emits events keyed by sequence number."""
+    module_id = await create_module(client, b"Streamed")
+    await async_session.commit()
+
+    stream = ChangeFeedService.stream(
+        lambda: nullcontext(async_session),
+        0,
+        page_size=10,
+        poll_interval=0.01,
+        heartbeat_interval=60,
+    )
+    frame = await anext(stream)
+    await stream.aclose()
+
+    assert frame.startswith("id: 1\nevent: change\n")
+    assert f'"module_id":{module_id}' in frame
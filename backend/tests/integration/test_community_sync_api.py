@@ -0,0 +1,152 @@
+"""Integration tests for the community index mirror."""
+
+import base64
+import hashlib
+import json
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.v1.community import get_community_sync
+from app.core.known_hashes import known_hashes
+from app.main import app
+from app.services.community_sync import CommunitySync, diff_index, parse_index
+
+INDEX_URL = "https://community.example/index.json"
+
+
+def make_entry(i: int, **fields) -> dict:
+    """Build one community index entry."""
+    return {"sha256": f"{i:064x}", "name": f"Module {i}", "vendor": "FS", **fields}
+
+
+class IndexServer:
+    """Local stand-in for the community index host, honoring If-None-Match."""
+
+    def __init__(self):
+        self.index: dict = {"version": 1, "modules": []}
+        self.requests: list[httpx.Request] = []
+
+    @property
+    def etag(self) -> str:
+        body = json.dumps(self.index, sort_keys=True).encode()
+        return f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(200, json=self.index, headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def server():
+    """A fresh index stand-in."""
+    return IndexServer()
+
+
+@pytest.fixture
+def sync(async_engine, server, monkeypatch):
+    """A sync engine wired to the stand-in and the test database."""
+    engine = CommunitySync(
+        async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False),
+        index_url=INDEX_URL,
+        transport=httpx.MockTransport(server.handler),
+    )
+    monkeypatch.setattr(engine.settings, "enable_community_import", True)
+    app.dependency_overrides[get_community_sync] = lambda: engine
+    return engine
+
+
+def test_parse_and_diff_index():
+    """Entries are normalized, invalid ones skipped and diffs computed per field."""
+    remote = parse_index(
+        {"modules": [make_entry(1), make_entry(2, blob="/b/2.bin"), {"sha256": "nope"}]},
+        INDEX_URL,
+    )
+    assert remote[f"{1:064x}"]["blob_url"] == f"https://community.example/blobs/{1:064x}.bin"
+    assert remote[f"{2:064x}"]["blob_url"] == "https://community.example/b/2.bin"
+
+    local = {
+        f"{1:064x}": ("Module 1", "FS", None, None, None, remote[f"{1:064x}"]["blob_url"]),
+        f"{3:064x}": ("Module 3", "FS", None, None, None, "x"),
+    }
+    added, changed, removed = diff_index(local, remote)
+    assert [row["sha256"] for row in added] == [f"{2:064x}"]
+    assert changed == []
+    assert removed == {f"{3:064x}"}
+
+    with pytest.raises(ValueError, match="must be a list or an object with 'modules'"):
+        parse_index({"version": 1}, INDEX_URL)
+
+
+@pytest.mark.asyncio
+async def test_sync_applies_only_changes(client, sync, server):
+    """Test conditional fetches and incremental updates of the mirror."""
+    server.index["modules"] = [make_entry(1), make_entry(2), make_entry(3)]
+    first = (await client.post("/api/v1/community/sync")).json()
+    assert first == {"status": "updated", "added": 3, "changed": 0, "removed": 0, "total": 3}
+
+    # Unchanged index: the stored ETag turns the fetch into a 304
+    second = (await client.post("/api/v1/community/sync")).json()
+    assert second["status"] == "not_modified"
+    assert server.requests[-1].headers["if-none-match"] == server.etag
+
+    # Loads the autocomplete index, which later syncs update in place
+    suggest = await client.get("/api/v1/modules/suggest", params={"prefix": "module"})
+    assert [s["value"] for s in suggest.json()] == ["Module 1", "Module 2", "Module 3"]
+    # Mirrored checksums are part of the known-hashes filter too
+    await client.get("/api/v1/modules/bloom")
+    assert known_hashes.might_contain(f"{3:064x}")
+
+    server.index["modules"] = [make_entry(1, model="SFP-10G-LR"), make_entry(2), make_entry(4)]
+    third = (await client.post("/api/v1/community/sync")).json()
+    assert third == {"status": "updated", "added": 1, "changed": 1, "removed": 1, "total": 3}
+
+    suggest = await client.get("/api/v1/modules/suggest", params={"prefix": "module"})
+    assert [s["value"] for s in suggest.json()] == ["Module 1", "Module 2", "Module 4"]
+    suggest = await client.get("/api/v1/modules/suggest", params={"prefix": "sfp"})
+    assert [s["value"] for s in suggest.json()] == ["SFP-10G-LR"]
+    assert known_hashes.might_contain(f"{4:064x}")
+
+    page = (await client.get("/api/v1/community/modules", params={"limit": 2})).json()
+    assert [m["sha256"] for m in page["modules"]] == [f"{1:064x}", f"{2:064x}"]
+    assert page["modules"][0]["model"] == "SFP-10G-LR"
+    assert page["has_more"]
+    rest = (
+        await client.get("/api/v1/community/modules", params={"after": page["next_after"]})
+    ).json()
+    assert [m["sha256"] for m in rest["modules"]] == [f"{4:064x}"]
+
+    status = (await client.get("/api/v1/community/status")).json()
+    assert status["enabled"]
+    assert status["module_count"] == 3
+    assert status["last_error"] is None
+
+
+@pytest.mark.asyncio
+async def test_mirror_marks_modules_in_library(client, sync, server):
+    """Test that mirrored entries already in the local library are flagged."""
+    eeprom = bytes(256)
+    await client.post(
+        "/api/v1/modules",
+        json={"name": "Local", "eeprom_data_base64": base64.b64encode(eeprom).decode()},
+    )
+    server.index["modules"] = [{"sha256": hashlib.sha256(eeprom).hexdigest(), "name": "Blank"}]
+    await client.post("/api/v1/community/sync")
+
+    modules = (await client.get("/api/v1/community/modules")).json()["modules"]
+    assert [m["in_library"] for m in modules] == [True]
+
+
+@pytest.mark.asyncio
+async def test_sync_reports_errors(client, sync, server, monkeypatch):
+    """Test that a failing or disabled index is reported, not crashed on."""
+    sync.transport = httpx.MockTransport(lambda request: httpx.Response(500))
+    response = await client.post("/api/v1/community/sync")
+    assert response.status_code == 502
+    assert (await client.get("/api/v1/community/status")).json()["last_error"]
+
+    monkeypatch.setattr(sync.settings, "enable_community_import", False)
+    assert (await client.post("/api/v1/community/sync")).status_code == 409
@@ -0,0 +1,167 @@
+"""Integration tests for the background job system."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.jobs import get_job_manager
+from app.main import app
+from app.models import Base
+from app.models.job import Job
+from app.services.job_handlers import register_builtin_jobs
+from app.services.job_manager import JobManager
+
+
+async def _wait_for(client, job_id: int, status: str) -> dict:
+    for _ in range(200):
+        job = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {job}")
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """
+    Session factory on a file database.
+
+    Jobs run concurrently with requests, which needs a connection per session
+    (the in-memory test database shares a single connection).
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def manager(client, session_factory):
+    """A job manager with a controllable `wait` job type."""
+    manager = JobManager(session_factory, max_workers=4)
+    register_builtin_jobs(manager)
+    manager.release = asyncio.Event()
+    manager.seen_checkpoints = []
+
+    async def wait_job(ctx):
+        manager.seen_checkpoints.append(ctx.checkpoint)
+        await ctx.report(1, 2, "waiting")
+        await ctx.save_checkpoint({"step": 1})
+        await manager.release.wait()
+        await ctx.report(2, 2, "done")
+        return {"echo": ctx.params.get("value")}
+
+    async def failing_job(ctx):
+        raise RuntimeError("boom")
+
+    manager.register("wait", wait_job, concurrency=1)
+    manager.register("fail", failing_job)
+    app.dependency_overrides[get_job_manager] = lambda: manager
+
+    yield manager
+
+    manager.release.set()
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_job_runs_to_completion(client, manager):
+    """A submitted job reports progress and stores its result."""
+    response = await client.post("/api/v1/jobs", json={"type": "wait", "params": {"value": 7}})
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    running = await _wait_for(client, job_id, "running")
+    assert running["message"] in ("waiting", None)
+
+    manager.release.set()
+    done = await _wait_for(client, job_id, "succeeded")
+    assert done["result"] == {"echo": 7}
+    assert done["progress_current"] == done["progress_total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_type(client, manager):
+    """A second job of a single-concurrency type waits for the first."""
+    first = (await client.post("/api/v1/jobs", json={"type": "wait"})).json()["id"]
+    second = (await client.post("/api/v1/jobs", json={"type": "wait"})).json()["id"]
+
+    await _wait_for(client, first, "running")
+    await asyncio.sleep(0.05)
+    assert (await client.get(f"/api/v1/jobs/{second}")).json()["status"] == "queued"
+
+    manager.release.set()
+    await _wait_for(client, second, "succeeded")
+
+
+
+@pytest.mark.asyncio
+async def test_queued_jobs_do_not_hold_workers(client, manager):
+    """Jobs queued behind their type's limit leave the shared workers to other types."""
+    ids = []
+    for _ in range(5):
+        ids.append((await client.post("/api/v1/jobs", json={"type": "wait"})).json()["id"])
+    await _wait_for(client, ids[0], "running")
+
+    # All four workers would be taken if queued "wait" jobs held one each
+    job_id = (await client.post("/api/v1/jobs", json={"type": "fail"})).json()["id"]
+    await _wait_for(client, job_id, "failed")
+    assert (await client.get(f"/api/v1/jobs/{ids[0]}")).json()["status"] == "running"
+
+    manager.release.set()
+    await _wait_for(client, ids[-1], "succeeded")
+
+@pytest.mark.asyncio
+async def test_cancel_running_and_queued_jobs(client, manager):
+    """Cancelling stops a running job and prevents a queued one from starting."""
+    first = (await client.post("/api/v1/jobs", json={"type": "wait"})).json()["id"]
+    second = (await client.post("/api/v1/jobs", json={"type": "wait"})).json()["id"]
+    await _wait_for(client, first, "running")
+
+    response = await client.post(f"/api/v1/jobs/{second}/cancel")
+    assert response.json()["status"] == "cancelled"
+    response = await client.post(f"/api/v1/jobs/{first}/cancel")
+    assert response.json()["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_failed_and_unknown_jobs(client, manager):
+    """Handler errors are recorded; unknown types are rejected."""
+    job_id = (await client.post("/api/v1/jobs", json={"type": "fail"})).json()["id"]
+    failed = await _wait_for(client, job_id, "failed")
+    assert failed["error"] == "boom"
+
+    response = await client.post("/api/v1/jobs", json={"type": "nope"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_resumes_with_checkpoint(client, manager, session_factory):
+    """Jobs left running by a previous process are re-queued on start."""
+    async with session_factory() as session:
+        session.add(Job(type="wait", status="running", params={}, checkpoint={"step": 1}))
+        await session.commit()
+
+    manager.release.set()
+    await manager.start()
+
+    jobs = (await client.get("/api/v1/jobs")).json()
+    await _wait_for(client, jobs[0]["id"], "succeeded")
+    assert manager.seen_checkpoints == [{"step": 1}]
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_ends_with_done(client, manager):
+    """The SSE stream closes with a `done` event once the job finishes."""
+    job_id = (await client.post("/api/v1/jobs", json={"type": "reindex"})).json()["id"]
+    await _wait_for(client, job_id, "succeeded")
+
+    response = await client.get(f"/api/v1/jobs/{job_id}/events")
+    assert response.status_code == 200
+    assert "event: done" in response.text
+    assert '"status":"succeeded"' in response.text
@@ -1,8 +1,16 @@
 """Integration tests for modules API."""
 
 import base64
+import hashlib
 
 import pytest
+from sqlalchemy import insert
+
+from app.core.known_hashes import known_hashes
+from app.models.module import SFPModule
+from app.models.module_revision import ModuleRevision
+from app.services.eeprom_delta import encode_delta
+from app.services.module_service import ModuleService
 
 
 @pytest.mark.asyncio
@@ -167,3 +175,204 @@ async def test_delete_module_not_found(client):
     """Test deleting a non-existent module."""
     response = await client.delete("/api/v1/modules/99999")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_known_hashes_filter_download(client):
+    """Test the Bloom filter download, its ETag and incremental updates."""
+    fake_eeprom = bytearray(256)
+    fake_eeprom[20:36] = b"Bloom Vendor    "
+    payload = {
+        "name": "Bloom Test",
+        "eeprom_data_base64": base64.b64encode(bytes(fake_eeprom)).decode(),
+    }
+
+    first = await client.get("/api/v1/modules/bloom")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/octet-stream"
+    assert first.content[:4] == b"SFPB"
+    etag = first.headers["etag"]
+
+    unchanged = await client.get("/api/v1/modules/bloom", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    await client.post("/api/v1/modules", json=payload)
+    changed = await client.get("/api/v1/modules/bloom", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    # Duplicates are still detected once the filter is loaded
+    duplicate = await client.post("/api/v1/modules", json=payload)
+    assert duplicate.json()["status"] == "duplicate"
+
+
+@pytest.mark.asyncio
+async def test_duplicate_stored_behind_filter(client, async_session):
+    """An image another writer stored without updating the filter is still a duplicate."""
+    await client.get("/api/v1/modules/bloom")
+    image = bytes(range(256))
+    sha256 = hashlib.sha256(image).hexdigest()
+    await async_session.execute(
+        insert(SFPModule).values(
+            name="CLI Import", vendor="", model="", serial="", eeprom_data=image, sha256=sha256
+        )
+    )
+    await async_session.commit()
+    assert not known_hashes.might_contain(sha256)
+
+    response = await client.post(
+        "/api/v1/modules",
+        json={"name": "Upload", "eeprom_data_base64": base64.b64encode(image).decode()},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "duplicate"
+    assert known_hashes.might_contain(sha256)
+
+
+@pytest.mark.asyncio
+async def test_bulk_duplicate_of_revision_behind_filter(client, async_session):
+    """A batch image stored only as another writer's revision isn't inserted again."""
+    base = bytearray(256)
+    base[20:36] = b"Rev Vendor      "
+    base[68:84] = b"REV1            "
+    recoded = bytearray(base)
+    recoded[200] = 1
+    response = await client.post(
+        "/api/v1/modules",
+        json={"name": "Base", "eeprom_data_base64": base64.b64encode(bytes(base)).decode()},
+    )
+    module_id = response.json()["id"]
+    sha256 = hashlib.sha256(bytes(recoded)).hexdigest()
+    await async_session.execute(
+        insert(ModuleRevision).values(
+            module_id=module_id,
+            revision=2,
+            name="Recoded",
+            sha256=sha256,
+            size=256,
+            delta=encode_delta(bytes(base), bytes(recoded)),
+        )
+    )
+    await async_session.commit()
+    known_hashes.build([], capacity=1000, error_rate=0.001)
+
+    results = await ModuleService(async_session).add_modules_batch([("Again", bytes(recoded))])
+    assert [(r.module_id, r.is_duplicate) for r in results] == [(module_id, True)]
+    assert len((await client.get("/api/v1/modules")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_eeprom_fetch(client):
+    """Several images come back in one bundle, in request order."""
+    from app.services.eeprom_bundle import parse_bundle
+
+    images = []
+    for i in range(3):
+        image = bytearray(256)
+        image[20:36] = b"Batch Vendor    "
+        image[68:84] = f"BATCH{i}".ljust(16).encode()
+        images.append(bytes(image))
+
+    ids = []
+    for i, image in enumerate(images):
+        response = await client.post(
+            "/api/v1/modules",
+            json={"name": f"Batch {i}", "eeprom_data_base64": base64.b64encode(image).decode()},
+        )
+        ids.append(response.json()["id"])
+
+    response = await client.get(f"/api/v1/modules/eeprom?ids={ids[2]},{ids[0]},999")
+    assert response.status_code == 200
+    assert response.headers["x-missing-ids"] == "999"
+
+    entries = parse_bundle(response.content)
+    assert [entry[0] for entry in entries] == [ids[2], ids[0]]
+    assert entries[0][2] == images[2]
+    assert entries[1][2] == images[0]
+
+    response = await client.post("/api/v1/modules/eeprom", json={"ids": ids})
+    assert response.status_code == 200
+    assert [entry[2] for entry in parse_bundle(response.content)] == images
+
+    response = await client.get("/api/v1/modules/eeprom?ids=1,abc")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_query_modules_by_decoded_fields(client):
+    """`GET /modules?q=` filters on decoded SFF-8472 fields."""
+
+    def image(vendor: bytes, serial: bytes, wavelength: int, reach_km: int) -> bytes:
+        eeprom = bytearray(256)
+        eeprom[0] = 0x03
+        eeprom[12] = 103  # 10.3 Gb/s
+        eeprom[14] = reach_km
+        eeprom[20:36] = vendor.ljust(16)
+        eeprom[68:84] = serial.ljust(16)
+        eeprom[60:62] = wavelength.to_bytes(2, "big")
+        return bytes(eeprom)
+
+    for name, data in [
+        ("LR", image(b"FS", b"Q1", 1310, 10)),
+        ("ER", image(b"FS", b"Q2", 1550, 40)),
+        ("Other", image(b"Acme", b"Q3", 1310, 20)),
+    ]:
+        await client.post(
+            "/api/v1/modules",
+            json={"name": name, "eeprom_data_base64": base64.b64encode(data).decode()},
+        )
+
+    response = await client.get("/api/v1/modules", params={"q": "wavelength:1310 vendor:fs*"})
+    assert response.status_code == 200
+    assert [m["name"] for m in response.json()] == ["LR"]
+
+    response = await client.get("/api/v1/modules", params={"q": "type:SFP+ reach_km>10"})
+    assert [m["name"] for m in response.json()] == ["ER", "Other"]
+
+    response = await client.get("/api/v1/modules", params={"q": "colour:blue"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_suggest_tracks_library_changes(client):
+    """Suggestions are prefix matches that follow inserts and deletes."""
+
+    async def create(name: str, vendor: bytes, model: bytes, serial: bytes) -> int:
+        eeprom = bytearray(256)
+        eeprom[20:36] = vendor.ljust(16)
+        eeprom[40:56] = model.ljust(16)
+        eeprom[68:84] = serial.ljust(16)
+        response = await client.post(
+            "/api/v1/modules",
+            json={"name": name, "eeprom_data_base64": base64.b64encode(bytes(eeprom)).decode()},
+        )
+        return response.json()["id"]
+
+    await create("Uplink", b"FS", b"SFP-10G-LR", b"S1")
+    fs_id = await create("Spare", b"FS", b"SFP-10G-SR", b"S2")
+    await create("Core", b"Finisar", b"FTLX8571D3BCL", b"S3")
+
+    response = await client.get("/api/v1/modules/suggest?prefix=f")
+    assert response.status_code == 200
+    assert [(s["field"], s["value"], s["count"]) for s in response.json()] == [
+        ("vendor", "Finisar", 1),
+        ("vendor", "FS", 2),
+        ("model", "FTLX8571D3BCL", 1),
+    ]
+
+    response = await client.get("/api/v1/modules/suggest?prefix=sfp-10g&field=model&limit=1")
+    assert [s["value"] for s in response.json()] == ["SFP-10G-LR"]
+
+    # The index is updated incrementally once the delete commits
+    await client.delete(f"/api/v1/modules/{fs_id}")
+    await create("Edge", b"Flexoptix", b"P.1396.10", b"S4")
+    response = await client.get("/api/v1/modules/suggest?prefix=f&field=vendor")
+    assert [(s["value"], s["count"]) for s in response.json()] == [
+        ("Finisar", 1),
+        ("Flexoptix", 1),
+        ("FS", 1),
+    ]
+    response = await client.get("/api/v1/modules/suggest?prefix=sfp-10g-s")
+    assert response.json() == []
+
+    assert (await client.get("/api/v1/modules/suggest?prefix=")).status_code == 422
@@ -0,0 +1,89 @@
+"""Integration tests for page-level EEPROM storage."""
+
+import base64
+
+import pytest
+
+from app.config import get_settings
+from app.services.storage_report import PAGE_KEY_BYTES, PAGE_REF_BYTES
+
+
+def _image(serial: bytes) -> bytes:
+    """A 512-byte capture: unique A0h page, A2h page shared by every module."""
+    image = bytearray(512)
+    image[20:36] = b"Paged Vendor    "
+    image[68:84] = serial.ljust(16)
+    image[256:512] = bytes(range(256))
+    return bytes(image)
+
+
+async def _save(client, name: str, image: bytes) -> int:
+    response = await client.post(
+        "/api/v1/modules",
+        json={"name": name, "eeprom_data_base64": base64.b64encode(image).decode()},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+    return response.json()["id"]
+
+
+@pytest.fixture
+def page_dedup(monkeypatch):
+    """Store new images as pages for the duration of a test."""
+    monkeypatch.setattr(get_settings(), "eeprom_page_dedup", True)
+
+
+@pytest.mark.asyncio
+async def test_paged_images_round_trip(client, page_dedup):
+    """Images stored as pages read back byte for byte."""
+    images = {serial: _image(serial) for serial in (b"P1", b"P2", b"P3")}
+    ids = {serial: await _save(client, serial.decode(), image) for serial, image in images.items()}
+
+    for serial, module_id in ids.items():
+        response = await client.get(f"/api/v1/modules/{module_id}/eeprom")
+        assert response.status_code == 200
+        assert response.content == images[serial]
+
+    report = (await client.get("/api/v1/modules/storage")).json()
+    assert report["page_dedup_enabled"] is True
+    assert report["images"] == 3
+    assert report["image_bytes"] == 3 * 512
+    assert report["page_refs"] == 6
+    assert report["unique_pages"] == 4
+    # Three captures sharing one page don't pay for the page references yet
+    overhead = 6 * PAGE_REF_BYTES + 4 * PAGE_KEY_BYTES
+    assert report["page_overhead_bytes"] == overhead
+    assert report["saved_bytes"] == 2 * 256 - overhead
+    assert report["saved_bytes"] < 0
+
+
+@pytest.mark.asyncio
+async def test_deleting_module_keeps_shared_pages(client, page_dedup):
+    """Pages still referenced by other modules survive a delete."""
+    first = await _save(client, "First", _image(b"D1"))
+    second = await _save(client, "Second", _image(b"D2"))
+
+    response = await client.delete(f"/api/v1/modules/{first}")
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/modules/{second}/eeprom")
+    assert response.content == _image(b"D2")
+
+    report = (await client.get("/api/v1/modules/storage")).json()
+    assert report["images"] == 1
+    assert report["unique_pages"] == 2
+
+
+@pytest.mark.asyncio
+async def test_report_estimates_savings_for_inline_images(client):
+    """With page dedup off, the report shows what it would save."""
+    await _save(client, "First", _image(b"I1"))
+    await _save(client, "Second", _image(b"I2"))
+
+    report = (await client.get("/api/v1/modules/storage")).json()
+    assert report["page_dedup_enabled"] is False
+    assert report["image_bytes"] == 2 * 512
+    assert report["page_bytes"] == 3 * 256
+    overhead = 4 * PAGE_REF_BYTES + 3 * PAGE_KEY_BYTES
+    assert report["saved_bytes"] == 256 - overhead
+    assert report["saved_ratio"] == round((256 - overhead) / 1024, 4)
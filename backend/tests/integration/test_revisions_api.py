@@ -0,0 +1,152 @@
+"""Integration tests for module revisions."""
+
+import base64
+import json
+
+import pytest
+
+from app.repositories.revision_repository import RevisionRepository
+
+
+def _image(model: bytes, serial: bytes = b"SER0001") -> bytes:
+    image = bytearray(256)
+    image[20:36] = b"Revision Vendor "
+    image[40:56] = model.ljust(16)
+    image[68:84] = serial.ljust(16)
+    return bytes(image)
+
+
+async def _save(client, name: str, image: bytes) -> dict:
+    response = await client.post(
+        "/api/v1/modules",
+        json={"name": name, "eeprom_data_base64": base64.b64encode(image).decode()},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_recoded_module_is_stored_as_revision(client):
+    """A new image with the same vendor and serial becomes revision 2."""
+    original = _image(b"Model A")
+    recoded = _image(b"Model B")
+
+    first = await _save(client, "Original", original)
+    second = await _save(client, "Recoded", recoded)
+
+    assert first["status"] == "success"
+    assert second["status"] == "revision"
+    assert second["id"] == first["id"]
+    assert second["revision"] == 2
+
+    # The library still lists one physical module
+    modules = (await client.get("/api/v1/modules")).json()
+    assert len(modules) == 1
+
+    response = await client.get(f"/api/v1/modules/{first['id']}/revisions")
+    assert response.status_code == 200
+    revisions = response.json()
+    assert [r["revision"] for r in revisions] == [2]
+    assert revisions[0]["size"] == 256
+    assert revisions[0]["delta_size"] < 32
+
+    response = await client.get(f"/api/v1/modules/{first['id']}/revisions/2/eeprom")
+    assert response.status_code == 200
+    assert response.content == recoded
+
+    response = await client.get(f"/api/v1/modules/{first['id']}/revisions/1/eeprom")
+    assert response.content == original
+
+
+@pytest.mark.asyncio
+async def test_resaving_revision_is_duplicate(client):
+    """Saving a revision's image again is reported as a duplicate."""
+    first = await _save(client, "Original", _image(b"Model A"))
+    await _save(client, "Recoded", _image(b"Model B"))
+
+    again = await _save(client, "Recoded again", _image(b"Model B"))
+    assert again["status"] == "duplicate"
+    assert again["id"] == first["id"]
+    assert again["revision"] == 2
+
+
+@pytest.mark.asyncio
+async def test_revisions_deleted_with_module(client):
+    """Deleting a module removes its revisions."""
+    first = await _save(client, "Original", _image(b"Model A"))
+    await _save(client, "Recoded", _image(b"Model B"))
+
+    response = await client.delete(f"/api/v1/modules/{first['id']}")
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/modules/{first['id']}/revisions")
+    assert response.status_code == 404
+
+    # The recoded image is new again once its base module is gone
+    again = await _save(client, "Recoded", _image(b"Model B"))
+    assert again["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_unknown_revision_returns_404(client):
+    """Missing revisions are reported as not found."""
+    first = await _save(client, "Original", _image(b"Model A"))
+    response = await client.get(f"/api/v1/modules/{first['id']}/revisions/5/eeprom")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_revision_number_taken_concurrently(client, monkeypatch):
+    """A revision number another writer took first is retried with the next one."""
+    first = await _save(client, "Original", _image(b"Model A"))
+    await _save(client, "Recoded", _image(b"Model B"))
+
+    # Simulate a concurrent writer: the first lookup still sees only revision 1
+    numbers = iter([2])
+    real = RevisionRepository.next_revision_number
+
+    async def next_revision_number(self, module_id: int) -> int:
+        return next(numbers, None) or await real(self, module_id)
+
+    monkeypatch.setattr(RevisionRepository, "next_revision_number", next_revision_number)
+
+    third = await _save(client, "Recoded again", _image(b"Model C"))
+    assert third["status"] == "revision"
+    assert third["id"] == first["id"]
+    assert third["revision"] == 3
+
+    response = await client.get(f"/api/v1/modules/{first['id']}/revisions/3/eeprom")
+    assert response.content == _image(b"Model C")
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_stores_recoded_images_as_revisions(client):
+    """Bulk uploads group re-coded images like single uploads do."""
+    first = await _save(client, "Original", _image(b"Model A"))
+    images = [
+        ("Recoded", _image(b"Model B")),
+        ("Other", _image(b"Model X", b"SER0002")),
+        ("Other recoded", _image(b"Model Y", b"SER0002")),
+        ("Recoded again", _image(b"Model B")),
+    ]
+    body = b"".join(
+        json.dumps({"name": name, "eeprom": base64.b64encode(image).decode()}).encode() + b"\n"
+        for name, image in images
+    )
+
+    response = await client.post("/api/v1/modules/bulk", content=body)
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["status"], r.get("revision")) for r in results[:4]] == [
+        ("revision", 2),
+        ("success", None),
+        ("revision", 2),
+        ("duplicate", None),
+    ]
+    assert results[0]["id"] == results[3]["id"] == first["id"]
+    assert results[2]["id"] == results[1]["id"]
+    assert results[4]["inserted"] == 3
+
+    # Two physical modules, each with one later revision
+    assert len((await client.get("/api/v1/modules")).json()) == 2
+    response = await client.get(f"/api/v1/modules/{results[1]['id']}/revisions/2/eeprom")
+    assert response.content == _image(b"Model Y", b"SER0002")
@@ -0,0 +1,206 @@
+"""Integration tests for the community submissions inbox."""
+
+import base64
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.rate_limit import admission_control
+from app.main import app
+from app.models import Base
+from app.services.submission_inbox import SubmissionInbox, get_submission_inbox
+from app.services.submission_review import SubmissionReviewService
+from app.services.submission_validator import SubmissionValidator
+
+
+def make_payload(name: str, vendor: bytes) -> dict:
+    """Build a submission with a fake EEPROM image."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    return {"name": name, "eeprom_data_base64": base64.b64encode(bytes(eeprom)).decode()}
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_content_addressed(client, tmp_path):
+    """Test that images are stored once and repeat submissions are acknowledged."""
+    inbox = SubmissionInbox(tmp_path)
+    app.dependency_overrides[get_submission_inbox] = lambda: inbox
+
+    first = await client.post("/api/v1/submissions", json=make_payload("First", b"Vendor A"))
+    assert first.status_code == 200
+    assert first.json()["status"] == "queued"
+
+    # Same image, different details: a second record pointing at the same blob
+    renamed = await client.post("/api/v1/submissions", json=make_payload("Renamed", b"Vendor A"))
+    assert renamed.json()["status"] == "queued"
+    assert renamed.json()["sha256"] == first.json()["sha256"]
+    assert renamed.json()["inbox_id"] != first.json()["inbox_id"]
+
+    blobs = list((tmp_path / "blobs").iterdir())
+    records = list((tmp_path / "records").iterdir())
+    assert [blob.name for blob in blobs] == [f"{first.json()['sha256']}.bin"]
+    assert len(records) == 2
+    assert json.loads(records[0].read_text())["sha256"] == first.json()["sha256"]
+
+    # Exact repeat: no new files
+    repeat = await client.post("/api/v1/submissions", json=make_payload("First", b"Vendor A"))
+    assert repeat.json()["status"] == "duplicate"
+    assert repeat.json()["inbox_id"] == first.json()["inbox_id"]
+    assert len(list((tmp_path / "records").iterdir())) == 2
+
+    # A fresh inbox over the same directory still recognizes the repeat
+    reopened = SubmissionInbox(tmp_path)
+    result = await reopened.submit(
+        base64.b64decode(make_payload("First", b"Vendor A")["eeprom_data_base64"]),
+        {"name": "First"},
+    )
+    assert result.duplicate
+    assert result.record_id == first.json()["inbox_id"]
+
+
+@pytest.mark.asyncio
+async def test_review_and_promote_submissions(client, async_session, tmp_path):
+    """Test paging through indexed submissions and promoting them in one batch."""
+    inbox = SubmissionInbox(tmp_path)
+    app.dependency_overrides[get_submission_inbox] = lambda: inbox
+
+    for name, vendor in [("A", b"Vendor A"), ("A again", b"Vendor A"), ("B", b"Vendor B")]:
+        await client.post("/api/v1/submissions", json=make_payload(name, vendor))
+    existing = make_payload("Library copy", b"Vendor C")
+    await client.post(
+        "/api/v1/modules", json={"name": "C", "eeprom_data_base64": existing["eeprom_data_base64"]}
+    )
+    await client.post("/api/v1/submissions", json=existing)
+
+    first = (await client.get("/api/v1/submissions", params={"limit": 3})).json()
+    assert [s["name"] for s in first["submissions"]] == ["A", "A again", "B"]
+    assert first["has_more"]
+    rest = (
+        await client.get("/api/v1/submissions", params={"after_id": first["next_after_id"]})
+    ).json()
+    assert [s["name"] for s in rest["submissions"]] == ["Library copy"]
+    assert not rest["has_more"]
+
+    ids = [s["id"] for s in first["submissions"] + rest["submissions"]]
+    response = await client.post("/api/v1/submissions/promote", json={"ids": [*ids, 999]})
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [
+        "promoted",
+        "duplicate",
+        "promoted",
+        "duplicate",
+        "not_found",
+    ]
+    assert results[0]["module_id"] == results[1]["module_id"]
+
+    modules = (await client.get("/api/v1/modules")).json()
+    assert len(modules) == 3
+
+    again = await client.post("/api/v1/submissions/promote", json={"ids": ids[:1]})
+    assert again.json()[0]["status"] == "already_promoted"
+
+    pending = await client.get("/api/v1/submissions", params={"status": "pending"})
+    assert pending.json()["submissions"] == []
+
+
+@pytest.mark.asyncio
+async def test_sync_index_picks_up_unindexed_records(async_session, tmp_path):
+    """Test that records stored without an index row are indexed later."""
+    inbox = SubmissionInbox(tmp_path)
+    await inbox.submit(b"\x03" * 256, {"name": "Offline"})
+
+    service = SubmissionReviewService(async_session, inbox)
+    assert len(await service.sync_index()) == 1
+    assert await service.sync_index() == []
+    page = await service.list_page(0, 10)
+    assert [s.name for s in page.submissions] == ["Offline"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_submissions_are_migrated(async_session, tmp_path):
+    """Test that `<uuid>/eeprom.bin` submissions from older versions are indexed."""
+    legacy = tmp_path / "0b1c9a52-legacy"
+    legacy.mkdir()
+    (legacy / "eeprom.bin").write_bytes(b"\x04" * 256)
+    (legacy / "metadata.json").write_text(
+        json.dumps({"name": "Old", "vendor": "V", "created_at": "2024-01-02T03:04:05Z"})
+    )
+    (tmp_path / "broken").mkdir()
+
+    service = SubmissionReviewService(async_session, SubmissionInbox(tmp_path))
+    assert len(await service.sync_index()) == 1
+    page = await service.list_page(0, 10)
+    assert [s.name for s in page.submissions] == ["Old"]
+
+    assert not legacy.exists()
+    assert (tmp_path / "legacy" / legacy.name / "eeprom.bin").exists()
+    (record_path,) = (tmp_path / "records").iterdir()
+    assert json.loads(record_path.read_text())["legacy_inbox_id"] == legacy.name
+
+    # Reopening doesn't migrate anything twice
+    reopened = SubmissionInbox(tmp_path)
+    assert len(await reopened.record_ids()) == 1
+    assert (tmp_path / "broken").exists()
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_validated_in_background(tmp_path):
+    """Test that queued submissions get validation results stored on them."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'validation.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    inbox = SubmissionInbox(tmp_path / "inbox")
+    validator = SubmissionValidator(session_factory, inbox, workers=2)
+    async with session_factory() as session:
+        service = SubmissionReviewService(session, inbox)
+        for name in ("First", "Second"):
+            result = await inbox.submit(b"\x03" + bytes(255), {"name": name})
+            await service.index([result.record])
+
+    # Unvalidated submissions are picked up on start
+    await validator.start()
+    await validator.drain()
+    await validator.stop()
+
+    async with session_factory() as session:
+        page = await SubmissionReviewService(session, inbox).list_page(0, 10)
+    first, second = page.submissions
+    assert first.validation.status == "failed"
+    assert first.validation.duplicate_submission_ids == [second.id]
+    assert first.validation.library_module_id is None
+    checks = {check.check: check.status for check in first.validation.checks}
+    assert checks["identifier"] == "pass"
+    assert checks["cc_base"] == "fail"  # Byte 63 left at zero
+    assert checks["ascii_vendor"] == "warn"
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_submission_rate_limit(client, tmp_path, monkeypatch):
+    """Test that bursts beyond the per-client limit get 429 with Retry-After."""
+    inbox = SubmissionInbox(tmp_path)
+    app.dependency_overrides[get_submission_inbox] = lambda: inbox
+    monkeypatch.setattr(admission_control, "rate", 0.5)
+    monkeypatch.setattr(admission_control, "burst", 2)
+    monkeypatch.setattr(admission_control, "overrides", {})
+
+    statuses = []
+    for i in range(3):
+        response = await client.post(
+            "/api/v1/submissions", json=make_payload(f"Module {i}", b"Vendor A")
+        )
+        statuses.append(response.status_code)
+    assert statuses == [200, 200, 429]
+    assert response.headers["retry-after"] == "2"
+
+    # Reads are never limited
+    assert (await client.get("/api/v1/submissions")).status_code == 200
+
+    stats = (await client.get("/api/v1/health/rate-limits")).json()
+    assert stats["rejected_rate"] == 1
+    assert stats["rejected_by_endpoint"] == {"POST /submissions": {"rate": 1}}
@@ -0,0 +1,139 @@
+"""Integration tests for library replication between two instances."""
+
+import base64
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.router import api_router
+from app.core.database import get_db
+from app.models import Base
+from app.services.replication import ReplicationService, bucket_digests, parse_blob_line
+
+
+def make_eeprom(vendor: bytes, serial: bytes = b"", fill: int = 0) -> str:
+    """Build a base64 fake EEPROM image with the given vendor name and serial."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    eeprom[68:84] = serial.ljust(16)
+    eeprom[128] = fill
+    return base64.b64encode(bytes(eeprom)).decode()
+
+
+@pytest_asyncio.fixture
+async def remote():
+    """A second app instance with its own database, reachable over ASGI."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    remote_app = FastAPI()
+    remote_app.include_router(api_router, prefix="/api/v1")
+
+    async with session_maker() as session:
+
+        async def override_get_db():
+            yield session
+
+        remote_app.dependency_overrides[get_db] = override_get_db
+        transport = ASGITransport(app=remote_app)
+        async with AsyncClient(transport=transport, base_url="http://remote/api/v1") as ac:
+            yield ac
+
+    await engine.dispose()
+
+
+def test_bucket_digests_group_by_prefix():
+    """Test that buckets only contain checksums with their prefix."""
+    digests = bucket_digests(sorted(["aa01", "aa02", "ab03"]), prefix_length=2)
+    assert set(digests) == {"aa", "ab"}
+    assert digests == bucket_digests(["aa01", "aa02", "ab03"], prefix_length=2)
+    assert digests["aa"] != bucket_digests(["aa01"], prefix_length=2)["aa"]
+
+
+@pytest.mark.asyncio
+async def test_pull_transfers_only_missing_modules(client, async_session, remote):
+    """Test that a pull copies exactly the modules the local instance lacks."""
+    for vendor in (b"Shared", b"Remote 1", b"Remote 2"):
+        payload = {"name": vendor.decode(), "eeprom_data_base64": make_eeprom(vendor)}
+        await remote.post("/modules", json=payload)
+    for vendor in (b"Shared", b"Local"):
+        payload = {"name": vendor.decode(), "eeprom_data_base64": make_eeprom(vendor)}
+        await client.post("/api/v1/modules", json=payload)
+
+    service = ReplicationService(async_session)
+    result = await service.pull(remote, prefix_length=1, batch_size=1)
+
+    assert result.status == "synced"
+    assert result.missing == 2
+    assert result.inserted == 2
+
+    local = {m["vendor"] for m in (await client.get("/api/v1/modules")).json()}
+    assert local == {"Shared", "Local", "Remote 1", "Remote 2"}
+
+    again = await service.pull(remote, prefix_length=1, batch_size=1)
+    assert again.missing == 0
+    assert again.bytes_transferred == 0
+
+
+@pytest.mark.asyncio
+async def test_pull_is_noop_when_roots_match(client, async_session, remote):
+    """Test that identical libraries are detected from the root digest alone."""
+    payload = {"name": "Same", "eeprom_data_base64": make_eeprom(b"Same")}
+    await remote.post("/modules", json=payload)
+    await client.post("/api/v1/modules", json=payload)
+
+    result = await ReplicationService(async_session).pull(remote, prefix_length=2, batch_size=10)
+    assert result.status == "in_sync"
+
+
+@pytest.mark.asyncio
+async def test_pull_transfers_revisions(client, async_session, remote):
+    """Test that libraries differing only in revisions converge, revisions included."""
+    for fill in (0, 1, 2):
+        payload = {"name": f"Recoded {fill}", "eeprom_data_base64": make_eeprom(b"V", b"S1", fill)}
+        await remote.post("/modules", json=payload)
+    payload = {"name": "Recoded 0", "eeprom_data_base64": make_eeprom(b"V", b"S1")}
+    module_id = (await client.post("/api/v1/modules", json=payload)).json()["id"]
+    other = {"name": "Other", "eeprom_data_base64": make_eeprom(b"W", b"S2")}
+    await remote.post("/modules", json=other)
+    await remote.post(
+        "/modules", json={"name": "Other 1", "eeprom_data_base64": make_eeprom(b"W", b"S2", 1)}
+    )
+
+    service = ReplicationService(async_session)
+    result = await service.pull(remote, prefix_length=1, batch_size=1)
+    assert result.status == "synced"
+    assert result.missing == 4
+    assert result.inserted == 4
+
+    revisions = (await client.get(f"/api/v1/modules/{module_id}/revisions")).json()
+    assert [(r["revision"], r["name"]) for r in revisions] == [(2, "Recoded 1"), (3, "Recoded 2")]
+    assert len((await client.get("/api/v1/modules")).json()) == 2
+
+    again = await service.pull(remote, prefix_length=1, batch_size=1)
+    assert again.status == "in_sync"
+
+
+def test_malformed_blob_lines_are_rejected():
+    """Test that blob lines missing fields or carrying bad data raise ValueError."""
+    assert parse_blob_line(b'{"name": "A", "eeprom": "AAE="}') == ("A", b"\x00\x01", None)
+    for line, message in [
+        (b"[]", "not an object"),
+        (b'{"name": "A"}', "string 'name' and 'eeprom'"),
+        (b'{"name": "A", "eeprom": "***"}', "Invalid base64"),
+        (b'{"name": "A", "eeprom": "AAE=", "revision": 1}', "Invalid revision"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            parse_blob_line(line)
+
+
+@pytest.mark.asyncio
+async def test_bucket_prefix_validation(client):
+    """Test that non-hex bucket prefixes are rejected."""
+    response = await client.get("/api/v1/sync/buckets/zz")
+    assert response.status_code == 400
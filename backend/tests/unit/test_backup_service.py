@@ -0,0 +1,386 @@
+"""Unit tests for database backups."""
+
+import asyncio
+import gzip
+import json
+import sqlite3
+from contextlib import closing
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import GatedAsyncSession
+from app.core.known_hashes import known_hashes
+from app.models import Base
+from app.repositories.change_repository import ChangeLogRepository
+from app.services.backup_service import (
+    DatabaseBackupService,
+    PostgresDumpBackupStrategy,
+    SQLiteFileBackupStrategy,
+)
+from app.services.change_feed import ChangeFeedService
+from app.services.module_service import ModuleService
+
+
+def make_eeprom(vendor: str) -> bytes:
+    """Build a fake EEPROM image with the given vendor name."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.encode().ljust(16)
+    return bytes(eeprom)
+
+
+def module_vendors(path) -> list[str]:
+    """Vendors of the modules stored in a SQLite file, in ID order."""
+    with closing(sqlite3.connect(path)) as conn:
+        rows = conn.execute("SELECT vendor FROM sfp_modules ORDER BY id").fetchall()
+    return [vendor for (vendor,) in rows]
+
+
+def unpack(backup, tmp_path):
+    """Decompress a backup into a plain SQLite file."""
+    path = tmp_path / "unpacked.db"
+    path.write_bytes(gzip.decompress(backup.read_bytes()))
+    return path
+
+
+@pytest_asyncio.fixture
+async def live_db(tmp_path):
+    """A WAL-mode library database and a session factory for it."""
+    path = tmp_path / "live.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        await conn.run_sync(Base.metadata.create_all)
+    yield path, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(tmp_path, live_db):
+    """A backup service pointed at the live database."""
+    path, session_factory = live_db
+    service = DatabaseBackupService(
+        max_backups=3, session_factory=session_factory, db_engine=session_factory.kw["bind"]
+    )
+    service.strategy = SQLiteFileBackupStrategy(path, pages_per_step=8, step_pause=0)
+    service.backup_dir = tmp_path / "backups"
+    service.backup_dir.mkdir()
+    yield service
+    service.strategy.close()
+
+
+async def add_modules(session_factory, *vendors: str) -> list[int]:
+    """Store one module per vendor and return their IDs."""
+    async with session_factory() as session:
+        results = await ModuleService(session).add_modules_batch(
+            [(vendor, make_eeprom(vendor)) for vendor in vendors]
+        )
+        await session.commit()
+    return [result.module_id for result in results]
+
+
+async def delete_module(session_factory, module_id: int) -> None:
+    """Delete one module."""
+    async with session_factory() as session:
+        await ModuleService(session).delete_module(module_id)
+        await session.commit()
+
+
+async def test_online_backup_includes_wal_contents(service, live_db, tmp_path):
+    """The backup is a consistent copy, including writes not yet checkpointed."""
+    with closing(sqlite3.connect(live_db[0])) as conn:
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        conn.executemany(
+            "INSERT INTO sfp_modules (name, vendor, eeprom_data, sha256, created_at)"
+            " VALUES (?, ?, ?, ?, '2024-01-01 00:00:00')",
+            [(f"M{i}", "WAL", bytes(512), f"{i:064x}") for i in range(200)],
+        )
+        conn.commit()
+
+        backup = await service.create_backup()
+    assert backup is not None
+    assert len(module_vendors(unpack(backup, tmp_path))) == 200
+    assert not list(service.backup_dir.glob("*.tmp"))
+
+
+async def test_restore_replaces_contents(service, live_db):
+    """Restoring swaps the backed-up database in and the same engine keeps working."""
+    path, session_factory = live_db
+    [module_id] = await add_modules(session_factory, "Vendor A")
+    backup = await service.create_backup()
+    await delete_module(session_factory, module_id)
+    assert module_vendors(path) == []
+
+    assert await service.restore_backup(backup.name)
+    assert module_vendors(path) == ["Vendor A"]
+    assert not list(path.parent.glob("*.restore.tmp"))
+    assert known_hashes.ready
+
+    await add_modules(session_factory, "Vendor B")
+    assert module_vendors(path) == ["Vendor A", "Vendor B"]
+
+
+async def test_restore_never_rewinds_the_change_feed(service, live_db):
+    """Changes made after a restore, and the restore's own effect, follow the old cursor."""
+    path, session_factory = live_db
+    a_id, b_id = await add_modules(session_factory, "Vendor A", "Vendor B")
+    backup = await service.create_backup()
+    await delete_module(session_factory, a_id)
+    (c_id,) = await add_modules(session_factory, "Vendor C")
+    async with session_factory() as session:
+        cursor = await ChangeLogRepository(session).latest_seq()
+
+    assert await service.restore_backup(backup.name)
+    (d_id,) = await add_modules(session_factory, "Vendor D")
+
+    async with session_factory() as session:
+        changes = await ChangeLogRepository(session).list_since(cursor, 100)
+    assert [(change.op, change.module_id) for change, _ in changes] == [
+        ("delete", c_id),
+        ("insert", a_id),
+        ("insert", d_id),
+    ]
+    assert d_id not in (a_id, b_id)
+
+
+async def test_restore_waits_for_open_sessions(service, live_db):
+    """The swap waits for open sessions, and sessions started meanwhile wait for it."""
+    path, session_factory = live_db
+    gated = async_sessionmaker(session_factory.kw["bind"], class_=GatedAsyncSession)
+    await add_modules(session_factory, "Vendor A")
+    backup = await service.create_backup()
+    await add_modules(session_factory, "Vendor B")
+
+    async with gated():
+        restore = asyncio.create_task(service.restore_backup(backup.name))
+        # Staging and the pre-restore backup run; the swap itself has to wait
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if list(path.parent.glob("*.restore.tmp")):
+                break
+        await asyncio.sleep(0.05)
+        assert not restore.done()
+        assert module_vendors(path) == ["Vendor A", "Vendor B"]
+
+    assert await restore
+    async with gated() as session:
+        assert await session.scalar(text("SELECT count(*) FROM sfp_modules")) == 1
+
+
+async def test_restore_gives_up_when_sessions_stay_open(service, live_db, monkeypatch):
+    """A restore that can't drain open sessions changes nothing and reopens access."""
+    path, session_factory = live_db
+    monkeypatch.setattr(service.settings, "database_restore_drain_timeout", 0.05)
+    gated = async_sessionmaker(session_factory.kw["bind"], class_=GatedAsyncSession)
+    await add_modules(session_factory, "Vendor A")
+    backup = await service.create_backup()
+    await add_modules(session_factory, "Vendor B")
+
+    async with gated():
+        assert not await service.restore_backup(backup.name)
+    assert module_vendors(path) == ["Vendor A", "Vendor B"]
+    assert not list(path.parent.glob("*.restore.tmp"))
+    async with gated() as session:
+        assert await session.scalar(text("SELECT count(*) FROM sfp_modules")) == 2
+
+
+async def test_restore_with_change_feed_open(service, live_db, monkeypatch):
+    """An open change-feed stream doesn't keep a restore waiting and sees its effect."""
+    path, session_factory = live_db
+    monkeypatch.setattr(service.settings, "database_restore_drain_timeout", 0.5)
+    gated = async_sessionmaker(session_factory.kw["bind"], class_=GatedAsyncSession)
+    (a_id,) = await add_modules(session_factory, "Vendor A")
+    backup = await service.create_backup()
+    (b_id,) = await add_modules(session_factory, "Vendor B")
+
+    frames = []
+
+    async def listen():
+        stream = ChangeFeedService.stream(
+            gated, 0, page_size=10, poll_interval=0.01, heartbeat_interval=60
+        )
+        async for frame in stream:
+            frames.append(frame)
+
+    listener = asyncio.create_task(listen())
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(frames) == 2:
+                break
+
+        assert await service.restore_backup(backup.name)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(frames) == 3:
+                break
+    finally:
+        listener.cancel()
+
+    assert module_vendors(path) == ["Vendor A"]
+    changes = [json.loads(frame.split("data: ", 1)[1]) for frame in frames]
+    assert [(change["op"], change["module_id"]) for change in changes] == [
+        ("insert", a_id),
+        ("insert", b_id),
+        ("delete", b_id),
+    ]
+
+
+async def test_backup_skipped_without_writes(service, live_db):
+    """Nothing is written while the database hasn't changed since the last backup."""
+    assert await service.create_backup() is not None
+    assert await service.create_backup() is None
+    assert await service.create_backup(force=True) is not None
+
+    await add_modules(live_db[1], "Vendor A")
+    assert await service.create_backup() is not None
+
+
+async def test_incremental_backups_restore_onto_full(service, live_db, monkeypatch):
+    """Increments hold only library changes and restore on top of their full backup."""
+    path, session_factory = live_db
+    monkeypatch.setattr(service.settings, "database_backup_mode", "incremental")
+    monkeypatch.setattr(service.settings, "database_backup_full_every", 3)
+
+    a_id, _ = await add_modules(session_factory, "Vendor A", "Vendor B")
+    full = await service.create_backup()
+    assert full.name.endswith(".db.gz")
+
+    await add_modules(session_factory, "Vendor C")
+    await delete_module(session_factory, a_id)
+    first = await service.create_backup()
+    assert first.name.startswith("sfp_library_increment_")
+
+    await add_modules(session_factory, "Vendor D")
+    second = await service.create_backup()
+    assert second.name.startswith("sfp_library_increment_")
+
+    # Every third backup is a full one again
+    await add_modules(session_factory, "Vendor E")
+    assert (await service.create_backup()).name.endswith(".db.gz")
+
+    assert await service.restore_backup(first.name)
+    assert module_vendors(path) == ["Vendor B", "Vendor C"]
+    assert await service.restore_backup(second.name)
+    assert module_vendors(path) == ["Vendor B", "Vendor C", "Vendor D"]
+
+    kinds = [backup["kind"] for backup in await service.list_backups()]
+    assert kinds.count("increment") == 2
+
+
+async def test_backup_after_restore_is_full(service, live_db, monkeypatch):
+    """Increments never build on a backup the restored library didn't come from."""
+    path, session_factory = live_db
+    monkeypatch.setattr(service.settings, "database_backup_mode", "incremental")
+    monkeypatch.setattr(service.settings, "database_backup_full_every", 5)
+
+    await add_modules(session_factory, "Vendor A")
+    full = await service.create_backup()
+    await add_modules(session_factory, "Vendor B", "Vendor C")
+    assert (await service.create_backup()).name.startswith("sfp_library_increment_")
+
+    assert await service.restore_backup(full.name)
+    await add_modules(session_factory, "Vendor D")
+    after = await service.create_backup()
+    assert after.name.startswith("sfp_library_backup_2")
+    assert module_vendors(unpack(after, path.parent)) == ["Vendor A", "Vendor D"]
+
+    await add_modules(session_factory, "Vendor E")
+    increment = await service.create_backup()
+    assert increment.name.startswith("sfp_library_increment_")
+    assert await service.restore_backup(increment.name)
+    assert module_vendors(path) == ["Vendor A", "Vendor D", "Vendor E"]
+
+
+async def test_increment_with_image_added_again(service, live_db, monkeypatch):
+    """An image deleted and stored again under a new ID restores from an increment."""
+    path, session_factory = live_db
+    monkeypatch.setattr(service.settings, "database_backup_mode", "incremental")
+
+    a_id, _ = await add_modules(session_factory, "Vendor A", "Vendor B")
+    await service.create_backup()
+    await delete_module(session_factory, a_id)
+    (again_id,) = await add_modules(session_factory, "Vendor A")
+    assert again_id != a_id
+    increment = await service.create_backup()
+    assert increment.name.startswith("sfp_library_increment_")
+
+    assert await service.restore_backup(increment.name)
+    assert module_vendors(path) == ["Vendor B", "Vendor A"]
+
+
+async def test_manifest_describes_backup(service, live_db):
+    """Each backup gets a manifest, and listing reads only manifests."""
+    await add_modules(live_db[1], "Vendor A", "Vendor B")
+    backup = await service.create_backup()
+
+    manifest = json.loads(backup.with_name(backup.name + ".json").read_bytes())
+    assert manifest["name"] == backup.name
+    assert manifest["kind"] == "full"
+    assert manifest["size_bytes"] == backup.stat().st_size
+    assert manifest["module_count"] == 2
+    assert manifest["compression"] == "gzip"
+    assert len(manifest["schema_version"]) == 16
+    assert await service.list_backups() == [manifest]
+
+
+async def test_failed_integrity_check_keeps_old_backups(service, live_db, monkeypatch):
+    """A copy failing integrity_check is discarded before rotation runs."""
+    service.max_backups = 1
+    first = await service.create_backup()
+
+    def corrupt(path):
+        raise ValueError("integrity_check failed: page 3 is never used")
+
+    monkeypatch.setattr("app.services.backup_service.inspect_sqlite", corrupt)
+    assert await service.create_backup(force=True) is None
+    assert sorted(p.name for p in service.backup_dir.iterdir()) == [
+        first.name,
+        first.name + ".json",
+    ]
+
+
+async def test_damaged_backups_are_detected(service, live_db):
+    """Rotation drops damaged backups first and restore refuses them."""
+    service.max_backups = 2
+    path, session_factory = live_db
+    [module_id] = await add_modules(session_factory, "Vendor A")
+    damaged = await service.create_backup()
+    data = bytearray(damaged.read_bytes())
+    data[-20] ^= 0xFF
+    damaged.write_bytes(bytes(data))
+
+    await delete_module(session_factory, module_id)
+    assert not await service.restore_backup(damaged.name)
+
+    # Once two intact backups exist the damaged one is rotated out first
+    await service.create_backup(force=True)
+    await service.create_backup(force=True)
+    assert not damaged.exists()
+    assert len(await service.list_backups()) == 2
+
+
+async def test_postgres_password_stays_off_command_line(monkeypatch, tmp_path):
+    """pg_dump gets the password through PGPASSWORD, not in its arguments."""
+    calls = []
+
+    class Process:
+        returncode = 0
+
+        async def communicate(self):
+            return b"", b""
+
+    async def fake_exec(*args, **kwargs):
+        calls.append((args, kwargs["env"]))
+        return Process()
+
+    monkeypatch.setattr("asyncio.create_subprocess_exec", fake_exec)
+    strategy = PostgresDumpBackupStrategy("postgresql+asyncpg://sfp:s3cr%40t@db:5432/library")
+    await strategy.backup(tmp_path / "library.dump")
+
+    args, env = calls[0]
+    assert args[-1] == "postgresql://sfp@db:5432/library"
+    assert not any("s3cr" in arg for args, _ in calls for arg in args)
+    assert env["PGPASSWORD"] == "s3cr@t"
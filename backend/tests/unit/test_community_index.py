@@ -0,0 +1,117 @@
+"""Unit tests for the sharded static community index."""
+
+import hashlib
+import json
+
+from app.cli.build_index import build_index
+from app.cli.import_dumps import run_import
+from app.services.community_index import MANIFEST_NAME, vendor_slug, write_index
+from app.services.community_sync import parse_index
+
+
+def make_entry(n: int, vendor: str) -> dict:
+    """Build an index entry for a fake module."""
+    sha256 = hashlib.sha256(f"module {n}".encode()).hexdigest()
+    return {
+        "sha256": sha256,
+        "name": f"Module {n}",
+        "vendor": vendor,
+        "model": None,
+        "serial": None,
+        "size": 256,
+    }
+
+
+def load_manifest(out_dir) -> dict:
+    """Read the manifest of a built index."""
+    return json.loads((out_dir / MANIFEST_NAME).read_bytes())
+
+
+def test_rebuild_rewrites_only_changed_shards(tmp_path):
+    """Unchanged shards keep their files; a changed entry rewrites its two shards."""
+    entries = [make_entry(n, "FS" if n % 2 else "Cisco Systems") for n in range(20)]
+    first = write_index(tmp_path, entries, prefix_length=1)
+    manifest = load_manifest(tmp_path)
+    shard_count = sum(len(shards) for shards in manifest["shards"].values())
+    assert first.shards_written == shard_count
+    assert first.manifest_written
+    assert set(manifest["shards"]["vendor"]) == {"fs", "cisco-systems"}
+
+    again = write_index(tmp_path, entries, prefix_length=1)
+    assert (again.shards_written, again.shards_unchanged) == (0, shard_count)
+    assert not again.manifest_written
+
+    entries[3] = {**entries[3], "name": "Renamed"}
+    changed = write_index(tmp_path, entries, prefix_length=1)
+    assert changed.shards_written == 2
+    assert changed.manifest_written
+
+    # Shards are readable as community index documents; unpublished images aren't linked
+    vendor_shard = tmp_path / load_manifest(tmp_path)["shards"]["vendor"]["fs"]["path"]
+    url = f"https://example.com/index/{vendor_shard.relative_to(tmp_path)}"
+    assert parse_index(json.loads(vendor_shard.read_bytes()), url) == {}
+
+    published = write_index(tmp_path, entries, prefix_length=1, blobs={entries[3]["sha256"]: b"x"})
+    assert published.shards_written == 2
+    rows = parse_index(json.loads(vendor_shard.read_bytes()), url)
+    assert list(rows) == [entries[3]["sha256"]]
+    assert rows[entries[3]["sha256"]]["name"] == "Renamed"
+    assert rows[entries[3]["sha256"]]["blob_url"].startswith("https://example.com/index/blobs/")
+
+
+def test_removed_vendor_shard_is_deleted(tmp_path):
+    """Shards left without entries are removed from disk and the manifest."""
+    entries = [make_entry(0, "FS"), make_entry(1, "Acme")]
+    write_index(tmp_path, entries, prefix_length=2)
+    assert (tmp_path / "shards" / "vendor" / "acme.json").exists()
+
+    stats = write_index(tmp_path, entries[:1], prefix_length=2)
+    assert stats.shards_removed == 2  # Acme's vendor shard and its sha256 prefix shard
+    assert not (tmp_path / "shards" / "vendor" / "acme.json").exists()
+    assert "acme" not in load_manifest(tmp_path)["shards"]["vendor"]
+    assert load_manifest(tmp_path)["module_count"] == 1
+
+
+def test_vendor_slug():
+    """Vendor names map to file-name-safe keys."""
+    assert vendor_slug("Cisco Systems, Inc.") == "cisco-systems-inc"
+    assert vendor_slug("../etc") == "etc"
+    assert vendor_slug(None) == "unknown"
+
+
+async def test_build_from_library(tmp_path):
+    """The CLI builds an index (with blobs) from a library database."""
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    images = []
+    for vendor in (b"Vendor A", b"Vendor B"):
+        eeprom = bytearray(256)
+        eeprom[20:36] = vendor.ljust(16)
+        images.append(bytes(eeprom))
+        (dumps / f"{vendor.decode()}.bin").write_bytes(images[-1])
+
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'library.db'}"
+    await run_import(dumps, database_url, workers=1, batch_size=10)
+
+    out_dir = tmp_path / "index"
+    stats = await build_index(
+        out_dir, "library", 2, True, database_url, tmp_path / "inbox", batch_size=1
+    )
+    assert (stats.modules, stats.blobs_written) == (2, 2)
+    for image in images:
+        sha256 = hashlib.sha256(image).hexdigest()
+        assert (out_dir / "blobs" / f"{sha256}.bin").read_bytes() == image
+
+    rerun = await build_index(
+        out_dir, "library", 2, True, database_url, tmp_path / "inbox", batch_size=1
+    )
+    assert (rerun.shards_written, rerun.blobs_written, rerun.manifest_written) == (0, 0, False)
+
+    # Without --blobs, images are neither read nor unlinked once published
+    metadata_only = await build_index(
+        out_dir, "library", 2, False, database_url, tmp_path / "inbox", batch_size=1
+    )
+    assert (metadata_only.shards_written, metadata_only.blobs_written) == (0, 0)
+    shard = json.loads(next((out_dir / "shards" / "sha256").iterdir()).read_bytes())
+    assert shard["modules"][0]["size"] == 256
+    assert shard["modules"][0]["blob"].startswith("../../blobs/")
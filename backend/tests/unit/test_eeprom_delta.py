@@ -0,0 +1,53 @@
+"""Unit tests for EEPROM delta encoding."""
+
+import os
+
+import pytest
+
+from app.services.eeprom_delta import apply_delta, encode_delta
+
+
+def _image() -> bytes:
+    image = bytearray(256)
+    image[20:36] = b"Test Vendor     "
+    image[68:84] = b"ABC123          "
+    return bytes(image)
+
+
+def test_identical_images_encode_to_length_only():
+    """An unchanged image needs no runs."""
+    base = _image()
+    delta = encode_delta(base, base)
+    assert len(delta) == 2
+    assert apply_delta(base, delta) == base
+
+
+def test_small_edit_is_compact():
+    """Recoding a few bytes produces a delta far smaller than the image."""
+    base = _image()
+    target = bytearray(base)
+    target[40:56] = b"Recoded Model   "
+    target[63] = 0x5A
+    delta = encode_delta(base, bytes(target))
+
+    assert len(delta) < 32
+    assert apply_delta(base, delta) == bytes(target)
+
+
+@pytest.mark.parametrize("target_size", [128, 256, 512])
+def test_round_trip_with_different_lengths(target_size):
+    """Targets shorter or longer than the base image rebuild exactly."""
+    base = os.urandom(256)
+    target = os.urandom(target_size)
+    assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_delta_against_wrong_base_is_rejected():
+    """A truncated base image can't silently produce a short result."""
+    base = _image()
+    target = bytearray(base)
+    target[0] = 1
+    delta = encode_delta(base, bytes(target))
+
+    with pytest.raises(ValueError, match="does not match base image"):
+        apply_delta(base[:100], delta)
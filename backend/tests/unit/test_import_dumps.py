@@ -0,0 +1,84 @@
+"""Unit tests for the offline dump importer."""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.cli.import_dumps import load_dump, parse_nrf_export, run_import
+from app.models.module import SFPModule
+from app.models.module_revision import ModuleRevision
+
+
+def make_eeprom(vendor: bytes, serial: bytes = b"", model: bytes = b"") -> bytes:
+    """Build a fake EEPROM image with the given vendor name."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    eeprom[40:56] = model.ljust(16)
+    eeprom[68:84] = serial.ljust(16)
+    return bytes(eeprom)
+
+
+def test_parse_nrf_export():
+    """Test that notification values are concatenated in log order."""
+    log = (
+        "I\t10:00:00.000\tNotification received from 0000ffe1, value: (0x) 03-04-07\n"
+        "D\t10:00:00.100\tsomething unrelated\n"
+        "I\t10:00:00.200\tNotification received from 0000ffe1, value: (0x) 10-FF\n"
+    )
+    assert parse_nrf_export(log) == bytes([0x03, 0x04, 0x07, 0x10, 0xFF])
+
+
+def test_load_dump_reports_empty_export(tmp_path):
+    """Test that exports without values are reported instead of imported."""
+    path = tmp_path / "empty.txt"
+    path.write_text("no values here\n")
+
+    dump = load_dump(str(path))
+    assert dump.error == "No EEPROM data found"
+
+
+async def test_run_import_deduplicates(tmp_path):
+    """Test a full import run with duplicates across files and runs."""
+    dumps = tmp_path / "dumps"
+    (dumps / "site-a").mkdir(parents=True)
+    (dumps / "site-a" / "one.bin").write_bytes(make_eeprom(b"Vendor A"))
+    (dumps / "site-a" / "copy.bin").write_bytes(make_eeprom(b"Vendor A"))
+    (dumps / "two.bin").write_bytes(make_eeprom(b"Vendor B"))
+    (dumps / "notes.md").write_text("ignored")
+
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'library.db'}"
+
+    stats = await run_import(dumps, database_url, workers=2, batch_size=2)
+    assert (stats.files, stats.inserted, stats.duplicates, stats.errors) == (3, 2, 1, 0)
+
+    rerun = await run_import(dumps, database_url, workers=1, batch_size=10)
+    assert (rerun.inserted, rerun.duplicates) == (0, 3)
+
+    engine = create_async_engine(database_url)
+    async with engine.connect() as conn:
+        vendors = (await conn.execute(select(SFPModule.vendor))).scalars().all()
+    await engine.dispose()
+    assert sorted(vendors) == ["Vendor A", "Vendor B"]
+
+
+async def test_run_import_stores_recoded_dumps_as_revisions(tmp_path):
+    """Test that dumps of one module with different bytes become revisions."""
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    (dumps / "a.bin").write_bytes(make_eeprom(b"Vendor A", b"SER1", b"Model 1"))
+    (dumps / "b.bin").write_bytes(make_eeprom(b"Vendor A", b"SER1", b"Model 2"))
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'library.db'}"
+
+    stats = await run_import(dumps, database_url, workers=1, batch_size=10)
+    assert (stats.inserted, stats.duplicates) == (2, 0)
+
+    (dumps / "c.bin").write_bytes(make_eeprom(b"Vendor A", b"SER1", b"Model 3"))
+    rerun = await run_import(dumps, database_url, workers=1, batch_size=10)
+    assert (rerun.inserted, rerun.duplicates) == (1, 2)
+
+    engine = create_async_engine(database_url)
+    async with engine.connect() as conn:
+        models = (await conn.execute(select(SFPModule.model))).scalars().all()
+        revisions = (await conn.execute(select(ModuleRevision.revision, ModuleRevision.name))).all()
+    await engine.dispose()
+    assert models == ["Model 1"]
+    assert sorted(revisions) == [(2, "b"), (3, "c")]
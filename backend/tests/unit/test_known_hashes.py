@@ -0,0 +1,58 @@
+"""Unit tests for the known-hashes Bloom filter."""
+
+import hashlib
+import struct
+
+from app.core.known_hashes import MAGIC, CountingBloomFilter
+
+
+def sha(value: int) -> str:
+    """Deterministic test checksum."""
+    return hashlib.sha256(str(value).encode()).hexdigest()
+
+
+def bit_is_set(data: bytes, sha256: str) -> bool:
+    """Check a checksum against the serialized filter the way clients do."""
+    magic, _version, k, m, _count = struct.unpack(">4sBBxxII", data[:16])
+    assert magic == MAGIC
+    bits = data[16:]
+    digest = bytes.fromhex(sha256)
+    for i in range(k):
+        index = int.from_bytes(digest[4 * i : 4 * i + 4], "big") % m
+        if not bits[index >> 3] & (1 << (index & 7)):
+            return False
+    return True
+
+
+def test_members_are_always_found():
+    """Test that there are no false negatives, before or after serialization."""
+    bloom = CountingBloomFilter(capacity=1000, error_rate=0.01)
+    members = [sha(i) for i in range(1000)]
+    for member in members:
+        bloom.add(member)
+
+    data = bloom.to_bytes()
+    assert all(bloom.might_contain(member) for member in members)
+    assert all(bit_is_set(data, member) for member in members)
+
+
+def test_false_positive_rate_near_target():
+    """Test that unknown checksums are mostly rejected."""
+    bloom = CountingBloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(sha(i))
+
+    false_positives = sum(bloom.might_contain(sha(i)) for i in range(1000, 11000))
+    assert false_positives < 300  # 3% with plenty of slack over the 1% target
+
+
+def test_remove_forgets_entry():
+    """Test that deleting an entry makes it absent again."""
+    bloom = CountingBloomFilter(capacity=100, error_rate=0.01)
+    bloom.add(sha(1))
+    bloom.add(sha(2))
+    bloom.remove(sha(1))
+
+    assert not bloom.might_contain(sha(1))
+    assert bloom.might_contain(sha(2))
+    assert bloom.count == 1
@@ -0,0 +1,147 @@
+"""Unit tests for packed library archives."""
+
+import hashlib
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.cli.import_dumps import run_import
+from app.cli.library_pack import export_pack, import_pack, main
+from app.repositories.module_repository import ModuleRepository
+from app.services.library_pack import PackReader, PackWriter
+from app.services.module_service import ModuleService
+
+
+def make_eeprom(vendor: bytes, serial: bytes = b"", fill: int = 0) -> bytes:
+    """Build a fake EEPROM image with the given vendor name and serial."""
+    eeprom = bytearray(256)
+    eeprom[20:36] = vendor.ljust(16)
+    eeprom[68:84] = serial.ljust(16)
+    eeprom[128] = fill
+    return bytes(eeprom)
+
+
+def write_pack(path, images):
+    """Write `images` to a pack and return their sha256s."""
+    sha256s = []
+    with PackWriter(path) as writer:
+        for i, image in enumerate(images):
+            sha256 = hashlib.sha256(image).hexdigest()
+            writer.add(sha256, image, {"name": f"Module {i}"})
+            sha256s.append(sha256)
+    return sha256s
+
+
+def test_round_trip_and_lookup(tmp_path):
+    """Entries are found by binary search and read back unchanged."""
+    images = [make_eeprom(f"Vendor {i}".encode()) for i in range(50)]
+    sha256s = write_pack(tmp_path / "lib.sfpk", images)
+
+    with PackReader(tmp_path / "lib.sfpk") as reader:
+        assert len(reader) == 50
+        for i, sha256 in enumerate(sha256s):
+            entry = reader.find(sha256)
+            assert entry is not None
+            assert reader.image(entry) == images[i]
+            assert reader.metadata(entry) == {"name": f"Module {i}"}
+        assert reader.get("00" * 32) is None
+        assert [sha for sha, _, _ in reader] == sorted(sha256s)
+        assert reader.verify() == []
+
+
+def test_verify_detects_corruption(tmp_path):
+    """A flipped byte in the data section fails verification."""
+    path = tmp_path / "lib.sfpk"
+    write_pack(path, [make_eeprom(b"Vendor A"), make_eeprom(b"Vendor B")])
+
+    data = bytearray(path.read_bytes())
+    data[-10] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with PackReader(path) as reader:
+        problems = reader.verify()
+    assert len(problems) == 1
+    assert "sha256 mismatch" in problems[0]
+
+
+def test_rejects_non_pack(tmp_path):
+    """Files that aren't packs are rejected on open."""
+    path = tmp_path / "notes.txt"
+    path.write_text("hello")
+    with pytest.raises(ValueError, match="Not an SFPK pack"):
+        PackReader(path)
+
+
+def test_rejects_truncated_pack(tmp_path):
+    """A pack whose index runs past the end of the file is rejected on open."""
+    path = tmp_path / "lib.sfpk"
+    write_pack(path, [make_eeprom(f"Vendor {i}".encode()) for i in range(4)])
+    data = bytearray(path.read_bytes())
+    data[8:12] = (1000).to_bytes(4, "big")  # Entry count
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="truncated"):
+        PackReader(path)
+
+    path.write_bytes(bytes(data[:100]))
+    with pytest.raises(ValueError, match="truncated"):
+        PackReader(path)
+
+
+async def test_export_and_import(tmp_path):
+    """A library exported to a pack imports into another database."""
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    for vendor in (b"Vendor A", b"Vendor B", b"Vendor C"):
+        (dumps / f"{vendor.decode()}.bin").write_bytes(make_eeprom(vendor))
+
+    source_url = f"sqlite+aiosqlite:///{tmp_path / 'source.db'}"
+    await run_import(dumps, source_url, workers=1, batch_size=10)
+
+    pack = tmp_path / "lib.sfpk"
+    assert await export_pack(source_url, pack, batch_size=2) == 3
+    assert main(["verify", str(pack)]) == 0
+
+    target_url = f"sqlite+aiosqlite:///{tmp_path / 'target.db'}"
+    stats = await import_pack(pack, target_url, batch_size=2)
+    assert (stats.entries, stats.inserted, stats.duplicates, stats.rejected) == (3, 3, 0, 0)
+
+    rerun = await import_pack(pack, target_url, batch_size=2)
+    assert (rerun.inserted, rerun.duplicates) == (0, 3)
+
+
+async def test_export_and_import_revisions(tmp_path):
+    """Module revisions survive a round trip through a pack."""
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    (dumps / "base.bin").write_bytes(make_eeprom(b"Vendor R", b"SN1"))
+    source_url = f"sqlite+aiosqlite:///{tmp_path / 'source.db'}"
+    await run_import(dumps, source_url, workers=1, batch_size=10)
+
+    engine = create_async_engine(source_url)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        service = ModuleService(session)
+        for fill in (1, 2):
+            image = make_eeprom(b"Vendor R", b"SN1", fill)
+            saved = await service.save_module(f"Recoded {fill}", image)
+            assert saved.status == "revision"
+        await session.commit()
+    await engine.dispose()
+
+    pack = tmp_path / "lib.sfpk"
+    assert await export_pack(source_url, pack, batch_size=10) == 3
+    with PackReader(pack) as reader:
+        entry = reader.find(hashlib.sha256(make_eeprom(b"Vendor R", b"SN1", 2)).hexdigest())
+        assert reader.metadata(entry)["revision"] == 3
+
+    target_url = f"sqlite+aiosqlite:///{tmp_path / 'target.db'}"
+    stats = await import_pack(pack, target_url, batch_size=1)
+    assert (stats.entries, stats.inserted, stats.duplicates) == (3, 3, 0)
+
+    engine = create_async_engine(target_url)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        repository = ModuleRepository(session)
+        (module,) = await repository.get_all()
+        revisions = await repository.revisions.list_for_module(module.id)
+        assert [(r.revision, r.name) for r in revisions] == [(2, "Recoded 1"), (3, "Recoded 2")]
+    await engine.dispose()
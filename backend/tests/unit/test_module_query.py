@@ -0,0 +1,90 @@
+"""Unit tests for the module search query language."""
+
+import pytest
+from sqlalchemy.dialects import sqlite
+
+from app.repositories.fields_repository import FieldsRepository
+from app.services.module_query import Filter, QueryError, compile_query, parse_query
+from app.services.sfp_parser import decode_module_fields
+
+
+def test_parse_query():
+    """Filters, aliases and quoted values are parsed."""
+    assert parse_query('wavelength:1310 reach>10 type:SFP+ pn:"SFP 10G" vendor:FS*') == (
+        Filter("wavelength", ":", "1310"),
+        Filter("reach_km", ">", "10"),
+        Filter("type", ":", "SFP+"),
+        Filter("model", ":", "SFP 10G"),
+        Filter("vendor", ":", "FS*"),
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "color:red", "vendor>5", "wavelength:abc", "just words"],
+)
+def test_invalid_queries(query):
+    """Malformed queries and unsupported filters are rejected."""
+    with pytest.raises(QueryError):
+        compile_query(query)
+
+
+def test_values_are_parameterized():
+    """Query values are bound as parameters, never spliced into SQL."""
+    stmt = FieldsRepository.search_statement(compile_query("vendor:x'--"))
+    compiled = stmt.compile(dialect=sqlite.dialect())
+    assert "x'--" not in str(compiled)
+    assert "x'--" in compiled.params.values()
+
+
+def test_decode_module_fields():
+    """SFF-8472 fields are decoded and case-folded."""
+    eeprom = bytearray(256)
+    eeprom[0] = 0x03
+    eeprom[2] = 0x07
+    eeprom[12] = 103
+    eeprom[14] = 10
+    eeprom[20:36] = b"FS              "
+    eeprom[60:62] = (1310).to_bytes(2, "big")
+
+    fields = decode_module_fields(bytes(eeprom))
+    assert fields["type"] == "sfp+"
+    assert fields["connector"] == "lc"
+    assert fields["vendor"] == "fs"
+    assert fields["wavelength_nm"] == 1310
+    assert fields["reach_km"] == 10.0
+    assert fields["serial"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query",
+    [
+        "type:sfp+",
+        "connector:lc",
+        "vendor:fs",
+        "vendor:FS*",
+        "model:sfp-10g*",
+        "serial:abc123",
+        "wavelength:1310",
+        "reach_km>10",
+        "bitrate>=10000",
+        "wavelength:1310 reach_km>10 type:SFP+ vendor:FS*",
+    ],
+)
+async def test_filters_use_indexes(async_engine, query):
+    """No supported filter makes SQLite fall back to a full table scan."""
+    if async_engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN is SQLite-specific")
+
+    compiled = FieldsRepository.search_statement(compile_query(query)).compile(
+        dialect=async_engine.dialect
+    )
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    async with async_engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        plan = [row[-1] for row in result.all()]
+
+    assert not [step for step in plan if step.startswith("SCAN")], plan
+    assert any("module_fields USING" in step and "INDEX" in step for step in plan), plan
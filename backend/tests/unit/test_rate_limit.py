@@ -0,0 +1,174 @@
+"""Unit tests for write admission control."""
+
+import asyncio
+import ipaddress
+
+from app.core.rate_limit import (
+    AdmissionController,
+    RateLimitMiddleware,
+    TokenBucket,
+    client_key,
+    endpoint_key,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_controller(clock: FakeClock, **overrides) -> AdmissionController:
+    """Controller with 1 request/s, bursts of 2 and 2 concurrent writes."""
+    controller = AdmissionController(clock)
+    controller.configure(
+        enabled=True, rate=1.0, burst=2, max_concurrent_writes=2, overrides=overrides
+    )
+    return controller
+
+
+def test_token_bucket_refills_over_time():
+    """Tokens run out after a burst and come back at the configured rate."""
+    bucket = TokenBucket(rate=2.0, burst=2, tokens=2, updated=0.0)
+
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == 0.5
+    assert bucket.take(0.5) == 0
+    assert not bucket.is_full(0.5)
+    assert bucket.is_full(1.5)
+
+
+def test_endpoint_key_folds_ids():
+    """Numeric path segments share one bucket."""
+    assert endpoint_key("DELETE", "/api/v1/modules/42", "/api/v1") == "DELETE /modules/{id}"
+    assert endpoint_key("POST", "/api/v1/jobs/7/cancel", "/api/v1") == "POST /jobs/{id}/cancel"
+    assert endpoint_key("POST", "/api/v1/submissions/", "/api/v1") == "POST /submissions"
+
+
+def test_buckets_are_per_client_and_endpoint():
+    """One client exhausting an endpoint doesn't limit others."""
+    clock = FakeClock()
+    controller = make_controller(clock)
+
+    for _ in range(2):
+        assert controller.admit("a", "POST /modules") is None
+        controller.release()
+    assert controller.admit("a", "POST /modules") == ("rate", 1.0)
+    assert controller.admit("b", "POST /modules") is None
+    controller.release()
+    assert controller.admit("a", "POST /submissions") is None
+    controller.release()
+
+    clock.now = 1.0
+    assert controller.admit("a", "POST /modules") is None
+    controller.release()
+
+    stats = controller.stats()
+    assert stats["rejected_rate"] == 1
+    assert stats["rejected_by_endpoint"] == {"POST /modules": {"rate": 1}}
+
+
+def test_concurrency_cap_and_overrides():
+    """Writes beyond the in-flight cap are rejected without using up the client's rate."""
+    controller = make_controller(FakeClock(), **{"POST /modules/eeprom": 0})
+
+    assert controller.admit("a", "POST /modules") is None
+    assert controller.admit("b", "POST /modules") is None
+    assert controller.admit("c", "POST /modules") == ("concurrency", 1.0)
+    controller.release()
+    assert controller.admit("c", "POST /modules") is None
+
+    assert controller.stats()["rejected_concurrency"] == 1
+    assert not controller.limits("POST /modules/eeprom")
+    assert controller.limits("POST /modules")
+
+
+def test_client_key_trusts_header_only_from_proxies():
+    """Forwarded addresses count only when the peer is a trusted proxy."""
+    proxies = [ipaddress.ip_network("10.0.0.0/8")]
+    header = b"x-forwarded-for"
+
+    def scope(peer, forwarded=None):
+        headers = [(header, forwarded.encode())] if forwarded else []
+        return {"client": (peer, 1234), "headers": headers}
+
+    assert client_key(scope("192.0.2.7", "198.51.100.1"), proxies, header) == "192.0.2.7"
+    assert client_key(scope("10.0.0.2", "198.51.100.1"), proxies, header) == "198.51.100.1"
+    # Spoofed entries before the first trusted hop are skipped
+    forwarded = "203.0.113.9, 198.51.100.1, 10.1.1.1"
+    assert client_key(scope("10.0.0.2", forwarded), proxies, header) == "198.51.100.1"
+    assert client_key(scope("10.0.0.2"), proxies, header) == "10.0.0.2"
+
+
+async def test_slot_released_when_response_starts(monkeypatch):
+    """A slow response body doesn't hold a write slot."""
+    controller = make_controller(FakeClock())
+    monkeypatch.setattr("app.core.rate_limit.admission_control", controller)
+    in_flight = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        in_flight.append(controller.in_flight)
+        await send({"type": "http.response.body", "body": b"done"})
+
+    async def send(message):
+        pass
+
+    middleware = RateLimitMiddleware(app, prefix="/api")
+    scope = {"type": "http", "method": "POST", "path": "/api/x", "client": ("a", 1), "headers": []}
+    await middleware(scope, None, send)
+    assert in_flight == [0]
+    assert controller.in_flight == 0
+
+
+async def test_streaming_uploads_hold_their_slot(monkeypatch):
+    """Uploads that stream results while still reading their body stay counted."""
+    controller = make_controller(FakeClock())
+    monkeypatch.setattr("app.core.rate_limit.admission_control", controller)
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def bulk_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        while (await receive()).get("more_body"):
+            started.set()
+            await finish.wait()
+        await send({"type": "http.response.body", "body": b"done"})
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}\n", "more_body": not finish.is_set()}
+
+    responses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            responses.append(message["status"])
+
+    middleware = RateLimitMiddleware(bulk_app, prefix="/api")
+
+    def scope(client):
+        headers = [(b"transfer-encoding", b"chunked")]
+        return {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/x",
+            "client": (client, 1),
+            "headers": headers,
+        }
+
+    uploads = [asyncio.create_task(middleware(scope(c), receive, send)) for c in "ab"]
+    await started.wait()
+    await asyncio.sleep(0)
+    assert controller.in_flight == 2
+
+    await middleware(scope("c"), receive, send)
+    assert responses[-1] == 429
+
+    finish.set()
+    await asyncio.gather(*uploads)
+    assert controller.in_flight == 0
@@ -1,6 +1,6 @@
 """Unit tests for SFP parser."""
 
-from app.services.sfp_parser import parse_sfp_data
+from app.services.sfp_parser import parse_sfp_data, validate_eeprom
 
 
 def test_parse_valid_eeprom():
@@ -53,3 +53,47 @@ def test_parse_non_ascii_data():
     assert "vendor" in result
     assert "model" in result
     assert "serial" in result
+
+
+def make_valid_eeprom() -> bytearray:
+    """Build an SFP+ A0h image with correct checksums."""
+    eeprom = bytearray(256)
+    eeprom[0] = 0x03
+    eeprom[20:36] = b"Test Vendor     "
+    eeprom[40:56] = b"Test Model      "
+    eeprom[56:60] = b"A   "
+    eeprom[68:84] = b"12345678        "
+    eeprom[84:92] = b"240131  "
+    eeprom[63] = sum(eeprom[0:63]) & 0xFF
+    eeprom[95] = sum(eeprom[64:95]) & 0xFF
+    return eeprom
+
+
+def test_validate_eeprom_passes_valid_image():
+    """Test that a well-formed image passes every check."""
+    results = validate_eeprom(bytes(make_valid_eeprom()))
+
+    assert {r["status"] for r in results} == {"pass"}
+    assert {r["check"] for r in results} >= {"cc_base", "cc_ext", "ascii_vendor", "date_code"}
+
+
+def test_validate_eeprom_flags_problems():
+    """Test checksum failures and implausible ASCII fields."""
+    eeprom = make_valid_eeprom()
+    eeprom[40] = 0x01  # Non-printable part number byte, also breaks CC_BASE
+    eeprom[68:84] = bytes(16)  # Blank serial (CC_EXT now wrong too)
+
+    status = {r["check"]: r["status"] for r in validate_eeprom(bytes(eeprom))}
+
+    assert status["cc_base"] == "fail"
+    assert status["cc_ext"] == "fail"
+    assert status["ascii_part_number"] == "warn"
+    assert status["ascii_serial"] == "warn"
+    assert status["ascii_vendor"] == "pass"
+
+
+def test_validate_eeprom_short_image():
+    """Test that images without a full serial ID block fail."""
+    assert validate_eeprom(b"Too short") == [
+        {"check": "size", "status": "fail", "detail": "9 bytes (need at least 96)"}
+    ]
@@ -455,10 +455,15 @@ export async function saveCurrentModule(metadata?: Record<string, any>) {
     });
 
     // Return in same format as old API for backward compatibility
+    let status = 'success';
+    if (result.isDuplicate) status = 'duplicate';
+    else if ((result.revision ?? 1) > 1) status = 'revision';
+
     return {
-      status: result.isDuplicate ? 'duplicate' : 'success',
+      status,
       message: result.message,
       id: result.module.id,
+      revision: result.revision,
     };
   } catch (error) {
     if (error instanceof APIError) throw error;
@@ -95,7 +95,8 @@ export class StandaloneRepository implements ModuleRepository {
 
       const result = await response.json();
 
-      // Backend returns: { status: "success"|"duplicate", message: "...", id: number }
+      // Backend returns: { status: "success"|"duplicate"|"revision", message: "...", id: number, revision: number }
+      // "revision" means the image was stored as a new revision of the existing module `id`
       const isDuplicate = result.status === 'duplicate';
 
       // Fetch full module data to return complete Module object
@@ -104,6 +105,7 @@ export class StandaloneRepository implements ModuleRepository {
       return {
         module: savedModule,
         isDuplicate,
+        revision: result.revision ?? undefined,
         message: result.message || 'Module saved successfully',
       };
     } catch (error) {
@@ -79,6 +79,13 @@ export interface CreateModuleResult {
   /** Whether this is a duplicate (same SHA-256 as existing module) */
   isDuplicate: boolean;
 
+  /**
+   * Revision of `module` the image is stored as, when the backend tracks revisions.
+   * 1 is the module's own image; higher numbers are later images of the same
+   * physical module (same vendor and serial), e.g. after recoding.
+   */
+  revision?: number;
+
   /** Message describing the result */
   message: string;
 }